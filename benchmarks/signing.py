@@ -0,0 +1,150 @@
+"""
+Signing microbenchmark: per-signature time, throughput and event-loop lag for inline signing
+versus the SigningExecutor thread and process pools (single calls and the batch API).
+
+Transactions are fully populated, so no RPC is needed.
+
+Usage:
+    python -m benchmarks.signing [--count 500] [--workers 4] [--json files/logs/signing.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+from eth_account import Account
+
+from libs.eth_async.signing import SigningExecutor, sign_transaction
+
+
+def make_txs(count: int, address: str) -> list[dict]:
+    return [
+        {
+            "chainId": 11155111,
+            "nonce": nonce,
+            "from": address,
+            "to": "0xaBe4A90B23738EE0d56425825cF20C63C578e75a",
+            "value": 10**15,
+            "data": "0x" + "ab" * 68,
+            "gas": 120_000,
+            "maxFeePerGas": 3 * 10**9,
+            "maxPriorityFeePerGas": 10**9,
+            "type": 2,
+        }
+        for nonce in range(count)
+    ]
+
+
+class LagProbe:
+    """
+    Measures how late a 1 ms heartbeat is woken up while the benchmark runs.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - expected))
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+    def max_ms(self) -> float:
+        return max(self.lags, default=0.0) * 1000
+
+
+async def run_case(name: str, txs: list[dict], key, sign) -> dict:
+    per_call: list[float] = []
+    with LagProbe() as probe:
+        await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        await sign(txs, key, per_call)
+        elapsed = time.perf_counter() - started
+
+    result = {
+        "case": name,
+        "signatures": len(txs),
+        "total_s": elapsed,
+        "per_signature_us": elapsed / len(txs) * 1e6,
+        "throughput_per_s": len(txs) / elapsed,
+        "max_loop_lag_ms": probe.max_ms(),
+    }
+    if per_call:
+        result["call_latency_p50_us"] = statistics.median(per_call) * 1e6
+    return result
+
+
+async def main(count: int, workers: int, concurrency: int) -> list[dict]:
+    account = Account.create()
+    txs = make_txs(count, account.address)
+    results = []
+
+    async def inline(txs, key, per_call):
+        for tx in txs:
+            started = time.perf_counter()
+            sign_transaction(tx, key)
+            per_call.append(time.perf_counter() - started)
+            await asyncio.sleep(0)
+
+    results.append(await run_case("inline", txs, account.key, inline))
+
+    for kind in ("thread", "process"):
+        executor = SigningExecutor(kind=kind, workers=workers)
+        await executor.sign_transactions(txs[:workers], account.key)  # start the workers
+
+        async def single(txs, key, per_call, executor=executor):
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one(tx):
+                async with semaphore:
+                    started = time.perf_counter()
+                    await executor.sign_transaction(tx, key)
+                    per_call.append(time.perf_counter() - started)
+
+            await asyncio.gather(*(one(tx) for tx in txs))
+
+        async def batch(txs, key, per_call, executor=executor):
+            await executor.sign_transactions(txs, key)
+
+        results.append(await run_case(f"{kind} x{workers} single", txs, account.key, single))
+        results.append(await run_case(f"{kind} x{workers} batch", txs, account.key, batch))
+        executor.shutdown()
+
+    return results
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description="Signing throughput and loop latency")
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=32, help="in-flight single-sign calls")
+    parser.add_argument("--json", dest="json_path", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args.count, args.workers, args.concurrency))
+
+    print(f"{'case':<22} {'us/sig':>9} {'sig/s':>9} {'max lag ms':>11}")
+    for r in results:
+        print(f"{r['case']:<22} {r['per_signature_us']:>9.1f} {r['throughput_per_s']:>9.0f} {r['max_loop_lag_ms']:>11.2f}")
+
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {args.json_path}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,117 @@
+"""
+Startup benchmark: how long it takes from interpreter start until the menu can be shown.
+
+Every run starts a fresh interpreter with `-X importtime`, imports main and performs the same
+init calls main() makes before choose_action(). The import tree reported on stderr is parsed to
+list the slowest modules, so regressions caused by a new top-level import are easy to spot.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--top 25] [--json files/logs/startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mirrors main() up to the first prompt; prints the elapsed time as the last stdout line.
+TIME_TO_MENU = """
+import time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.create_files()
+main.init_db()
+ready = time.perf_counter()
+print(imported - started, ready - started)
+"""
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """
+    Parses `-X importtime` lines: 'import time: self [us] | cumulative | imported package'.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            modules.append(
+                {
+                    "module": name.strip(),
+                    "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                }
+            )
+        except ValueError:
+            continue
+
+    return modules
+
+
+def run_once() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TIME_TO_MENU],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{proc.stderr[-2000:]}")
+
+    import_s, ready_s = map(float, proc.stdout.strip().splitlines()[-1].split())
+    return {"import_main": import_s, "time_to_menu": ready_s, "modules": parse_importtime(proc.stderr)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure time-to-menu with -X importtime")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="number of slowest top-level imports to show")
+    parser.add_argument("--json", dest="json_path", help="write the results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    last = runs[-1]
+
+    # imports made by main and its direct dependencies in the last (warm cache) run, ordered by cumulative time
+    top = sorted((m for m in last["modules"] if m["depth"] <= 2), key=lambda m: m["cumulative_ms"], reverse=True)[: args.top]
+
+    result = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "import_main_ms": {
+            "median": statistics.median(r["import_main"] for r in runs) * 1000,
+            "min": min(r["import_main"] for r in runs) * 1000,
+        },
+        "time_to_menu_ms": {
+            "median": statistics.median(r["time_to_menu"] for r in runs) * 1000,
+            "min": min(r["time_to_menu"] for r in runs) * 1000,
+        },
+        "modules_imported": len(last["modules"]),
+        "slowest_imports": top,
+    }
+
+    print(f"Python {result['python']}, {args.runs} runs, {result['modules_imported']} modules imported")
+    print(f"import main   : median {result['import_main_ms']['median']:.1f} ms, min {result['import_main_ms']['min']:.1f} ms")
+    print(f"time to menu  : median {result['time_to_menu_ms']['median']:.1f} ms, min {result['time_to_menu_ms']['min']:.1f} ms")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for m in top:
+        print(f"{m['cumulative_ms']:>14.1f} {m['self_ms']:>9.1f}  {m['module']}")
+
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,14 @@ if getattr(sys, "frozen", False):
 else:
     ROOT_DIR = Path(__file__).parent.parent.absolute()
 
-FILES_DIR = os.path.join(ROOT_DIR, "files")
+# FILES_DIR can be overridden to run against another set of files (e.g. the synthetic databases of benchmarks.db)
+FILES_DIR = os.getenv("FILES_DIR") or os.path.join(ROOT_DIR, "files")
 WALLETS_DB = os.path.join(FILES_DIR, "wallets.db")
+SELECTORS_DB = os.path.join(FILES_DIR, "selectors.db")
+BACKUPS_DIR = os.path.join(FILES_DIR, "backups")
+# wallets.db has two writers (the sync and the aiosqlite engines). In WAL mode with single-statement async
+# writes a lock is held for milliseconds, so a short wait is enough and a stuck writer surfaces quickly
+DB_BUSY_TIMEOUT = 5
 SETTINGS_FILE = os.path.join(FILES_DIR, "settings.yaml")
 RESERVE_PROXY_FILE = os.path.join(FILES_DIR, "reserve_proxy.txt")
 RESERVE_TWITTER_FILE = os.path.join(FILES_DIR, "reserve_twitter.txt")
@@ -29,3 +35,5 @@ LOCK = asyncio.Lock()
 
 LOGS_DIR = os.path.join(FILES_DIR, "logs")
 LOG_FILE = os.path.join(LOGS_DIR, "log.log")
+LOG_JSON_FILE = os.path.join(LOGS_DIR, "log.jsonl")
+RPC_METRICS_FILE = os.path.join(LOGS_DIR, "rpc_metrics.json")
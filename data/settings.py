@@ -1,50 +1,193 @@
-import sys
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
 
 import yaml
 from loguru import logger
 
-from data.config import LOG_FILE, SETTINGS_FILE
+from data.config import SETTINGS_FILE
 from libs.eth_async.classes import Singleton
+from utils.logs import configure_logger, reconfigure_on_change
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Immutable, typed view of files/settings.yaml at one point in time."""
+
+    check_git_updates: bool = True
+    private_key_encryption: bool = True
+    threads: int = 4
+    range_wallets_to_run: tuple = ()
+    exact_wallets_to_run: tuple = ()
+    shuffle_wallets: bool = True
+    show_wallet_address_log: bool = True
+    log_level: str = "INFO"
+    log_enqueue: bool = True
+    log_json: bool = False
+    log_rate_limit: float = 0
+    diagnostics: bool = False
+    diagnostics_stall_threshold: float = 0.1
+    rpc_metrics_port: int = 0
+    rpc_metrics_json_interval: int = 0
+    signing_executor: str = ""
+    signing_workers: int = 0
+    gas_estimate_cache: bool = False
+    gas_estimate_multiplier: float = 1.2
+    db_maintenance_interval: int = 0
+    db_snapshot_keep: int = 10
+    tg_bot_id: str = ""
+    tg_user_id: str = ""
+    tg_batch_window: float = 2.0
+    random_pause_start_wallet_min: int | None = None
+    random_pause_start_wallet_max: int | None = None
+    random_pause_between_wallets_min: int | None = None
+    random_pause_between_wallets_max: int | None = None
+    random_pause_between_actions_min: int | None = None
+    random_pause_between_actions_max: int | None = None
+    random_pause_wallet_after_completion_min: int | None = None
+    random_pause_wallet_after_completion_max: int | None = None
+
+    retry: int = 3
+    resources_max_failures: int = 3
+    auto_replace_proxy: bool = True
+    auto_replace_twitter: bool = True
+    clicks_min: int | None = None
+    clicks_max: int | None = None
+    games_min: int | None = None
+    games_max: int | None = None
+
+    mtime: float = field(default=0.0, compare=False)
+
+    @classmethod
+    def from_dict(cls, json_data: dict, mtime: float = 0.0) -> "SettingsSnapshot":
+        return cls(
+            check_git_updates=json_data.get("check_git_updates", True),
+            private_key_encryption=json_data.get("private_key_encryption", True),
+            threads=json_data.get("threads", 4),
+            range_wallets_to_run=tuple(json_data.get("range_wallets_to_run", [])),
+            exact_wallets_to_run=tuple(json_data.get("exact_wallets_to_run", [])),
+            shuffle_wallets=json_data.get("shuffle_wallets", True),
+            show_wallet_address_log=json_data.get("show_wallet_address_log", True),
+            log_level=json_data.get("log_level", "INFO"),
+            log_enqueue=json_data.get("log_enqueue", True),
+            log_json=json_data.get("log_json", False),
+            log_rate_limit=json_data.get("log_rate_limit", 0),
+            diagnostics=json_data.get("diagnostics", False),
+            diagnostics_stall_threshold=json_data.get("diagnostics_stall_threshold", 0.1),
+            rpc_metrics_port=json_data.get("rpc_metrics_port", 0),
+            rpc_metrics_json_interval=json_data.get("rpc_metrics_json_interval", 0),
+            signing_executor=json_data.get("signing_executor") or "",
+            signing_workers=json_data.get("signing_workers", 0),
+            gas_estimate_cache=json_data.get("gas_estimate_cache", False),
+            gas_estimate_multiplier=json_data.get("gas_estimate_multiplier", 1.2),
+            db_maintenance_interval=json_data.get("db_maintenance_interval", 0),
+            db_snapshot_keep=json_data.get("db_snapshot_keep", 10),
+            tg_bot_id=str(json_data.get("tg_bot_id") or ""),
+            tg_user_id=str(json_data.get("tg_user_id") or ""),
+            tg_batch_window=json_data.get("tg_batch_window", 2.0),
+            random_pause_start_wallet_min=json_data.get("random_pause_start_wallet", {}).get("min"),
+            random_pause_start_wallet_max=json_data.get("random_pause_start_wallet", {}).get("max"),
+            random_pause_between_wallets_min=json_data.get("random_pause_between_wallets", {}).get("min"),
+            random_pause_between_wallets_max=json_data.get("random_pause_between_wallets", {}).get("max"),
+            random_pause_between_actions_min=json_data.get("random_pause_between_actions", {}).get("min"),
+            random_pause_between_actions_max=json_data.get("random_pause_between_actions", {}).get("max"),
+            random_pause_wallet_after_completion_min=json_data.get("random_pause_wallet_after_completion", {}).get("min"),
+            random_pause_wallet_after_completion_max=json_data.get("random_pause_wallet_after_completion", {}).get("max"),
+            retry=json_data.get("retry", 3),
+            resources_max_failures=json_data.get("resources_max_failures", 3),
+            auto_replace_proxy=json_data.get("auto_replace_proxy ", True),
+            auto_replace_twitter=json_data.get("auto_replace_twitter ", True),
+            clicks_min=json_data.get("clicks", {}).get("min"),
+            clicks_max=json_data.get("clicks", {}).get("max"),
+            games_min=json_data.get("games", {}).get("min"),
+            games_max=json_data.get("games", {}).get("max"),
+            mtime=mtime,
+        )
+
+
+SettingsListener = Callable[[SettingsSnapshot | None, SettingsSnapshot], None]
 
 
 class Settings(Singleton):
+    """
+    Process-wide settings accessor.
+
+    `Settings()` is cheap: the YAML file is parsed once and re-parsed only when its mtime changes.
+    Attribute access is served from the current `SettingsSnapshot`, which is swapped atomically on reload,
+    so a reader holding `Settings().snapshot` never sees a half-updated config.
+    """
+
+    _lock = threading.Lock()
+    _snapshot: SettingsSnapshot | None = None
+    _listeners: list[SettingsListener] = []
+
     def __init__(self):
-        with open(SETTINGS_FILE, "r") as file:
-            json_data = yaml.safe_load(file) or {}
-
-        self.check_git_updates = json_data.get("check_git_updates", True)
-        self.private_key_encryption = json_data.get("private_key_encryption", True)
-        self.threads = json_data.get("threads", 4)
-        self.range_wallets_to_run = json_data.get("range_wallets_to_run", [])
-        self.exact_wallets_to_run = json_data.get("exact_wallets_to_run", [])
-        self.shuffle_wallets = json_data.get("shuffle_wallets", True)
-        self.show_wallet_address_log = json_data.get("show_wallet_address_log", True)
-        self.log_level = json_data.get("log_level", "INFO")
-        self.random_pause_start_wallet_min = json_data.get("random_pause_start_wallet", {}).get("min")
-        self.random_pause_start_wallet_max = json_data.get("random_pause_start_wallet", {}).get("max")
-        self.random_pause_between_wallets_min = json_data.get("random_pause_between_wallets", {}).get("min")
-        self.random_pause_between_wallets_max = json_data.get("random_pause_between_wallets", {}).get("max")
-        self.random_pause_between_actions_min = json_data.get("random_pause_between_actions", {}).get("min")
-        self.random_pause_between_actions_max = json_data.get("random_pause_between_actions", {}).get("max")
-        self.random_pause_wallet_after_completion_min = json_data.get("random_pause_wallet_after_completion", {}).get("min")
-        self.random_pause_wallet_after_completion_max = json_data.get("random_pause_wallet_after_completion", {}).get("max")
-
-        self.retry = json_data.get("retry", 3)
-        self.resources_max_failures = json_data.get("resources_max_failures", 3)
-        self.auto_replace_proxy = json_data.get("auto_replace_proxy ", True)
-        self.auto_replace_twitter = json_data.get("auto_replace_twitter ", True)
-        self.clicks_min = json_data.get("clicks", {}).get("min")
-        self.clicks_max = json_data.get("clicks", {}).get("max")
-        self.games_min = json_data.get("games", {}).get("min")
-        self.games_max = json_data.get("games", {}).get("max")
+        self.reload()
+
+    def __getattr__(self, item):
+        return getattr(self.snapshot, item)
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        return Settings._snapshot
+
+    def reload(self, force: bool = False) -> SettingsSnapshot:
+        """
+        Re-parses the settings file if it was modified since the last load.
+
+        :param bool force: re-parse even if the mtime did not change
+        :return SettingsSnapshot: the current snapshot
+        """
+        try:
+            mtime = os.stat(SETTINGS_FILE).st_mtime
+        except FileNotFoundError:
+            mtime = 0.0
+
+        current = Settings._snapshot
+        if current is not None and current.mtime == mtime and not force:
+            return current
+
+        with Settings._lock:
+            current = Settings._snapshot
+            if current is not None and current.mtime == mtime and not force:
+                return current
+
+            json_data = {}
+            if mtime:
+                with open(SETTINGS_FILE, "r") as file:
+                    json_data = yaml.safe_load(file) or {}
+
+            new = SettingsSnapshot.from_dict(json_data, mtime=mtime)
+            Settings._snapshot = new
+
+        if current is not None:
+            logger.debug("Settings reloaded from disk")
+
+        for listener in list(Settings._listeners):
+            try:
+                listener(current, new)
+            except Exception as e:
+                logger.error(f"Settings reload listener {listener} failed: {e}")
+
+        return new
+
+    @classmethod
+    def subscribe(cls, listener: SettingsListener) -> None:
+        """
+        Registers a callback invoked as listener(old_snapshot, new_snapshot) after every reload.
+        """
+        if listener not in cls._listeners:
+            cls._listeners.append(listener)
+
+    @classmethod
+    def unsubscribe(cls, listener: SettingsListener) -> None:
+        if listener in cls._listeners:
+            cls._listeners.remove(listener)
 
 
 # Configure the logger based on the settings
 settings = Settings()
 
-if settings.log_level not in ["DEBUG", "INFO", "WARNING", "ERROR"]:
-    raise ValueError(f"Invalid log level: {settings.log_level}. Must be one of: DEBUG, INFO, WARNING, ERROR")
-logger.remove()  # Remove the default logger
-logger.add(sys.stderr, level=settings.log_level)
-
-logger.add(LOG_FILE, retention="10 days", level=settings.log_level)
+configure_logger(settings.snapshot)
+Settings.subscribe(reconfigure_on_change)
@@ -14,7 +14,8 @@ from utils.twitter.twitter_client import TwitterStatuses
 
 
 async def random_sleep_before_start(wallet):
-    random_sleep = random.randint(Settings().random_pause_start_wallet_min, Settings().random_pause_start_wallet_max)
+    settings = Settings()
+    random_sleep = random.randint(settings.random_pause_start_wallet_min, settings.random_pause_start_wallet_max)
     now = datetime.now()
 
     logger.info(f"{wallet} Start at {now + timedelta(seconds=random_sleep)} sleep {random_sleep} seconds before start actions")
@@ -23,9 +24,10 @@ async def random_sleep_before_start(wallet):
 
 async def execute(wallets: List[Wallet], task_func, random_pause_wallet_after_completion: int = 0):
     while True:
-        semaphore = asyncio.Semaphore(min(len(wallets), Settings().threads))
+        settings = Settings().snapshot
+        semaphore = asyncio.Semaphore(min(len(wallets), settings.threads))
 
-        if Settings().shuffle_wallets:
+        if settings.shuffle_wallets:
             random.shuffle(wallets)
 
         async def sem_task(wallet: Wallet):
@@ -46,8 +48,9 @@ async def execute(wallets: List[Wallet], task_func, random_pause_wallet_after_co
             break
 
         # update dynamically the pause time
+        settings = Settings().snapshot
         random_pause_wallet_after_completion = random.randint(
-            Settings().random_pause_wallet_after_completion_min, Settings().random_pause_wallet_after_completion_max
+            settings.random_pause_wallet_after_completion_min, settings.random_pause_wallet_after_completion_max
         )
 
         next_run = datetime.now() + timedelta(seconds=random_pause_wallet_after_completion)
@@ -62,19 +65,21 @@ async def activity(action: int):
 
     wallets = db.all(Wallet)
 
-    range_wallets = Settings().range_wallets_to_run
-    if range_wallets != [0, 0]:
+    settings = Settings().snapshot
+
+    range_wallets = settings.range_wallets_to_run
+    if range_wallets != (0, 0):
         start, end = range_wallets
         wallets = [wallet for i, wallet in enumerate(wallets, start=1) if start <= i <= end]
     else:
-        if Settings().exact_wallets_to_run:
-            wallets = [wallet for i, wallet in enumerate(wallets, start=1) if i in Settings().exact_wallets_to_run]
+        if settings.exact_wallets_to_run:
+            wallets = [wallet for i, wallet in enumerate(wallets, start=1) if i in settings.exact_wallets_to_run]
 
     if action == 1:
         await execute(
             wallets,
             run_all_tasks,
-            random.randint(Settings().random_pause_wallet_after_completion_min, Settings().random_pause_wallet_after_completion_max),
+            random.randint(settings.random_pause_wallet_after_completion_min, settings.random_pause_wallet_after_completion_max),
         )
 
     if action == 2:
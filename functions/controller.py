@@ -13,8 +13,8 @@ from modules.tasks.authorization import AuthClient
 from modules.tasks.wallet import WalletClient
 from modules.tasks.game_survivor import GameSurvivor
 from modules.tasks.omni_set import OmniClient
+from utils.db_api.async_wallet_api import update_wallet
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import db
 from utils.logs_decorator import controller_log
 from utils.twitter.twitter_client import TwitterClient
 from modules.hs_form import HSForm
@@ -89,14 +89,15 @@ class Controller:
 
     async def handle_clicker(self):
 
-        games_to_play = random.randint(Settings().games_min, Settings().games_max)
+        settings = Settings().snapshot
+        games_to_play = random.randint(settings.games_min, settings.games_max)
         
         if games_to_play == 0:
             logger.info(f"{self.wallet} | {self.__controller__} | Clicker Handle | No games to play as per settings")
             return True
         
         # generate random clicks
-        clicks_list = [random.randint(Settings().clicks_min, Settings().clicks_max) for _ in range(games_to_play)]
+        clicks_list = [random.randint(settings.clicks_min, settings.clicks_max) for _ in range(games_to_play)]
 
         # guarantee at least one > 105
         if all(c <= 105 for c in clicks_list):
@@ -110,8 +111,8 @@ class Controller:
                 box = random.choice(BOX_SIZE_MAP)
                 clicks_result = await self.clicker_controller(box=box, clicks=clicks)
                 logger.success(clicks_result)
-                random_sleep = random.randint(Settings().random_pause_between_actions_min,
-                                              Settings().random_pause_between_actions_max)
+                random_sleep = random.randint(settings.random_pause_between_actions_min,
+                                              settings.random_pause_between_actions_max)
                 await asyncio.sleep(random_sleep)
 
             except Exception as e:
@@ -174,8 +175,7 @@ class Controller:
         await self.auth_client.login()
 
         if not self.wallet.private_key:
-            self.wallet.private_key = self.onchain.fastset_client.account.private_key_hex()
-            db.commit()
+            await update_wallet(self.wallet.id, private_key=self.onchain.fastset_client.account.private_key_hex())
 
         try:
             balance = await self.onchain.fastset_client.wallet.get_balance()
@@ -1,6 +1,7 @@
 import asyncio
 import random
 import time
+from functools import partial
 
 from eth_account.messages import _hash_eip191_message, encode_defunct, encode_typed_data
 from hexbytes import HexBytes
@@ -12,10 +13,50 @@ from web3.types import TxParams
 from data.models import Contracts
 from libs.eth_async.client import Client
 from libs.eth_async.data.models import Networks, TokenAmount, TxArgs
+from libs.eth_async.signing import get_signing_executor
 from utils.browser import Browser
 from utils.db_api.models import Wallet
 
 
+PRICE_TTL = 30
+PRICE_MAX_STALE = 300
+
+# process-wide: pair -> (price, fetched at) and pair -> in-flight request
+_price_cache: dict[str, tuple[float, float]] = {}
+_price_requests: dict[str, asyncio.Task] = {}
+# the shared fetch serves every wallet, so it goes direct instead of through the proxy of whichever wallet asked first
+_price_browser: Browser | None = None
+
+
+def _price_request_done(pair: str, task: asyncio.Task) -> None:
+    _price_requests.pop(pair, None)
+    if not task.cancelled():
+        # errors of background refreshes nobody awaited are not reported
+        task.exception()
+
+
+async def _fetch_token_price(pair: str) -> float | None:
+    global _price_browser
+
+    if _price_browser is None:
+        _price_browser = Browser()
+
+    for attempt in range(5):
+        try:
+            r = await _price_browser.get(url=f"https://api.binance.com/api/v3/depth?limit=1&symbol={pair}")
+            if r.status_code != 200:
+                return None
+            result_dict = r.json()
+            if "asks" not in result_dict:
+                return None
+            price = float(result_dict["asks"][0][0])
+            _price_cache[pair] = (price, time.monotonic())
+            return price
+        except Exception:
+            await asyncio.sleep(min(2**attempt, 5))
+    raise ValueError(f"Can not get {pair} price from Binance")
+
+
 class Base:
     __module__ = "Web3 Base"
 
@@ -25,6 +66,10 @@ class Base:
         self.browser: Browser = Browser(wallet=self.wallet)
 
     async def get_token_price(self, token_symbol="ETH", second_token: str = "USDT") -> float | None:
+        """
+        Prices are cached for PRICE_TTL seconds for the whole process and concurrent calls for the same pair share
+        one request. An expired price younger than PRICE_MAX_STALE is returned at once while it is refreshed in the background.
+        """
         token_symbol, second_token = token_symbol.upper(), second_token.upper()
 
         if token_symbol.upper() in ("USDC", "USDC.E", "USDT", "DAI", "CEBUSD", "BUSD"):
@@ -34,19 +79,22 @@ class Base:
         if token_symbol == "USDC.E":
             token_symbol = "USDC"
 
-        for _ in range(5):
-            try:
-                async with self.browser:
-                    r = await self.browser.get(url=f"https://api.binance.com/api/v3/depth?limit=1&symbol={token_symbol}{second_token}")
-                    if r.status_code != 200:
-                        return None
-                    result_dict = r.json()
-                    if "asks" not in result_dict:
-                        return None
-                    return float(result_dict["asks"][0][0])
-            except Exception:
-                await asyncio.sleep(5)
-        raise ValueError(f"Can not get {token_symbol + second_token} price from Binance")
+        pair = token_symbol + second_token
+        cached = _price_cache.get(pair)
+        age = time.monotonic() - cached[1] if cached else None
+        if cached and age < PRICE_TTL:
+            return cached[0]
+
+        request = _price_requests.get(pair)
+        if request is None:
+            request = asyncio.create_task(_fetch_token_price(pair))
+            _price_requests[pair] = request
+            request.add_done_callback(partial(_price_request_done, pair))
+
+        if cached and age < PRICE_MAX_STALE:
+            return cached[0]
+
+        return await asyncio.shield(request)
 
     async def approve_interface(self, token_address, spender, amount: TokenAmount | None = None) -> bool:
         balance = await self.client.wallet.balance(token=token_address)
@@ -95,7 +143,11 @@ class Base:
             if hash:
                 message = encode_defunct(hexstr=_hash_eip191_message(message).hex())
 
-        signed_message = self.client.account.sign_message(message)
+        executor = get_signing_executor()
+        if executor:
+            signed_message = await executor.sign_message(message, self.client.account.key)
+        else:
+            signed_message = self.client.account.sign_message(message)
 
         signature = signed_message.signature.hex()
 
@@ -1,7 +1,9 @@
-from fake_useragent import UserAgent
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 from libs.eth_async.exceptions import APIException
-from libs.eth_async.utils.web_requests import aiohttp_params, async_get
+from libs.eth_async.utils.web_requests import aiohttp_params, async_get, chrome_user_agent
 
 
 class Tag:
@@ -284,6 +286,82 @@ class Transaction(Module):
         return await async_get(self.url, params=aiohttp_params(params), headers=self.headers)
 
 
+class Address(Module):
+    """
+    Class with functions related to the Blockscout v2 'addresses' endpoints (the API url ends with '/api/v2').
+
+    Listings are paginated: pass the 'next_page_params' of a response to get the next page (see 'iter_pages').
+    """
+
+    module: str = "addresses"
+
+    async def transactions(self, address: str, next_page_params: dict[str, ...] | None = None) -> dict[str, ...]:
+        return await async_get(
+            f"{self.url}/{self.module}/{address}/transactions", params=aiohttp_params(next_page_params or {}), headers=self.headers
+        )
+
+    async def nft(self, address: str, next_page_params: dict[str, ...] | None = None) -> dict[str, ...]:
+        return await async_get(f"{self.url}/{self.module}/{address}/nft", params=aiohttp_params(next_page_params or {}), headers=self.headers)
+
+    async def nft_collections(self, address: str, next_page_params: dict[str, ...] | None = None) -> dict[str, ...]:
+        return await async_get(
+            f"{self.url}/{self.module}/{address}/nft/collections", params=aiohttp_params(next_page_params or {}), headers=self.headers
+        )
+
+
+class Tokens(Module):
+    """
+    Class with functions related to the Blockscout v2 'tokens' endpoints.
+    """
+
+    module: str = "tokens"
+
+    async def nft_instances(self, address: str, next_page_params: dict[str, ...] | None = None) -> dict[str, ...]:
+        return await async_get(
+            f"{self.url}/{self.module}/{address}/instances", params=aiohttp_params(next_page_params or {}), headers=self.headers
+        )
+
+
+async def iter_pages(
+    fetch: Callable[[dict[str, ...] | None], Awaitable[dict[str, ...]]], max_pages: int | None = None
+) -> AsyncIterator[list[dict[str, ...]]]:
+    """
+    Yield the 'items' of every page of a Blockscout v2 listing.
+
+    The next page is requested as soon as the current one arrives, so it downloads while the caller processes
+    the current page. The cursor of a page is only known from the previous response, so exactly one page is
+    fetched ahead and at most two pages are held in memory. Closing the generator (e.g. leaving an
+    `async with aclosing(...)` block after enough results) cancels the pending request.
+
+    Args:
+        fetch (Callable): a coroutine function taking 'next_page_params' (None for the first page).
+        max_pages (Optional[int]): the maximum number of pages to request. (all)
+
+    Returns:
+        AsyncIterator[List[Dict[str, Any]]]: the items of each page.
+
+    """
+    task = asyncio.create_task(fetch(None))
+    pages = 0
+    try:
+        while task is not None:
+            response = await task
+            pages += 1
+            next_page_params = response.get("next_page_params")
+            task = None
+            if next_page_params and (max_pages is None or pages < max_pages):
+                task = asyncio.create_task(fetch(next_page_params))
+
+            yield response.get("items") or []
+
+    finally:
+        if task is not None:
+            task.cancel()
+            # retrieve the outcome, otherwise a prefetch that already failed logs "Task exception was never retrieved"
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+
 class APIFunctions:
     """
     Class with functions related to Blockscan API.
@@ -295,6 +373,8 @@ class APIFunctions:
         account (Account): functions related to 'account' API module.
         contract (Contract): functions related to 'contract' API module.
         transaction (Transaction): functions related to 'transaction' API module.
+        address (Address): functions related to the Blockscout v2 'addresses' endpoints.
+        tokens (Tokens): functions related to the Blockscout v2 'tokens' endpoints.
         block (Block): functions related to 'block' API module.
         logs (Logs): functions related to 'logs' API module.
         token (Token): functions related to 'token' API module.
@@ -314,10 +394,12 @@ class APIFunctions:
         """
         self.key = key
         self.url = url
-        self.headers = {"content-type": "application/json", "user-agent": UserAgent().chrome}
+        self.headers = {"content-type": "application/json", "user-agent": chrome_user_agent()}
         self.account = Account(self.key, self.url, self.headers)
         self.contract = Contract(self.key, self.url, self.headers)
         self.transaction = Transaction(self.key, self.url, self.headers)
+        self.address = Address(self.key, self.url, self.headers)
+        self.tokens = Tokens(self.key, self.url, self.headers)
         # self.block = Block(self.key, self.url, self.headers)
         # self.logs = Logs(self.key, self.url, self.headers)
         # self.token = Token(self.key, self.url, self.headers)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from eth_abi import decode
+from loguru import logger
+
+from .contracts import function_abi
+from .selector_db import SelectorDB, get_selector_db, normalize_selector
+
+
+@dataclass
+class DecodedCall:
+    selector: str
+    text_signature: str
+    name: str
+    args: tuple
+
+    def named_args(self) -> dict[str, Any]:
+        """
+        The arguments by position (text signatures carry no parameter names): {'arg0': ..., 'arg1': ...}.
+        """
+        return {f"arg{i}": arg for i, arg in enumerate(self.args)}
+
+
+def _collapse(param: dict) -> str:
+    if "components" in param:
+        return "(" + ",".join(_collapse(c) for c in param["components"]) + ")" + param["type"][5:]
+    return param["type"]
+
+
+@lru_cache(maxsize=1024)
+def input_types(text_signature: str) -> tuple[str, ...]:
+    return tuple(_collapse(param) for param in function_abi(text_signature)["inputs"])
+
+
+def calldata_of(tx: dict | str | bytes) -> str | bytes:
+    """
+    Get the calldata of a transaction dict (explorer 'input' or web3 'data'), or the value itself.
+    """
+    if isinstance(tx, dict):
+        return tx.get("input") or tx.get("data") or b""
+    return tx
+
+
+def _to_bytes(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data[:2] in ("0x", "0X") else data)
+    return bytes(data)
+
+
+def decode_calldata(data: str | bytes, db: SelectorDB | None = None) -> DecodedCall | None:
+    """
+    Decode calldata with the signatures known to the local selector database. No network requests are made.
+
+    Several signatures may share a selector: the oldest one that decodes the arguments is used.
+
+    :param str | bytes data: the calldata (hex or bytes)
+    :param SelectorDB | None db: the selector database (the default one)
+    :return DecodedCall | None: the decoded call, None if the selector is unknown or no signature fits
+    """
+    raw = _to_bytes(data)
+    if len(raw) < 4:
+        return None
+
+    selector = normalize_selector(raw)
+    for text_signature in (db or get_selector_db()).get(selector):
+        try:
+            args = decode(input_types(text_signature), raw[4:])
+
+        except Exception:
+            # a colliding signature or a malformed one from 4byte.directory, try the next one
+            continue
+
+        return DecodedCall(selector=selector, text_signature=text_signature, name=text_signature.split("(", 1)[0], args=args)
+
+    return None
+
+
+def decode_calldata_batch(inputs: Iterable[dict | str | bytes], db: SelectorDB | None = None) -> list[DecodedCall | None]:
+    """
+    Decode many calldata values or transaction dicts, keeping their order.
+
+    Selectors and parsed signatures are cached, so each distinct selector hits the database once.
+    """
+    db = db or get_selector_db()
+    return [decode_calldata(calldata_of(item), db=db) for item in inputs]
+
+
+async def fetch_missing_selectors(inputs: Iterable[dict | str | bytes], db: SelectorDB | None = None, concurrency: int = 5) -> int:
+    """
+    Download the signatures of the selectors unknown to the local database from 4byte.directory.
+
+    :return int: the number of selectors that were looked up
+    """
+    db = db or get_selector_db()
+    selectors = set()
+    for item in inputs:
+        raw = _to_bytes(calldata_of(item))
+        if len(raw) >= 4 and not db.get(raw):
+            selectors.add(normalize_selector(raw))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(selector: str) -> None:
+        async with semaphore:
+            try:
+                await db.fetch(selector)
+
+            except Exception as err:
+                logger.warning(f"Failed to get the signatures of {selector} from 4byte.directory: {err}")
+
+    await asyncio.gather(*(fetch(selector) for selector in selectors))
+    return len(selectors)
@@ -1,9 +1,9 @@
 import random
 import re
+import time
 
-import requests
+from curl_cffi.requests import AsyncSession
 from eth_account.signers.local import LocalAccount
-from fake_useragent import UserAgent
 from web3 import Web3
 from web3.eth import AsyncEth
 
@@ -12,24 +12,32 @@ from utils.encryption import get_private_key
 from . import exceptions
 from .contracts import Contracts
 from .data.models import Network, Networks
+from .instrumentation import InstrumentedAsyncHTTPProvider
 from .transactions import Transactions
+from .utils.web_requests import chrome_user_agent
 from .wallet import Wallet
 
+PROXY_CHECK_TTL = 600
+
+# proxy -> (external IP, expires at)
+_proxy_checks: dict[str, tuple[str, float]] = {}
+
 
 class Client:
     network: Network
     account: LocalAccount
     w3: Web3
 
-    def __init__(
-        self, private_key: str | None = None, network: Network = Networks.Sepolia, proxy: str | None = None, check_proxy: bool = True
-    ) -> None:
+    def __init__(self, private_key: str | None = None, network: Network = Networks.Sepolia, proxy: str | None = None) -> None:
+        """
+        Build the client in memory only. Use `await Client.create(...)` to also check that the proxy works.
+        """
         self.network = network
         self.headers = {
             "accept": "*/*",
             "accept-language": "en-US,en;q=0.9",
             "content-type": "application/json",
-            "user-agent": UserAgent().chrome,
+            "user-agent": chrome_user_agent(),
         }
         self.proxy = proxy
 
@@ -37,14 +45,11 @@ class Client:
             if "http" not in self.proxy:
                 self.proxy = f"http://{self.proxy}"
 
-            if check_proxy:
-                your_ip = requests.get("http://eth0.me/", proxies={"http": self.proxy, "https": self.proxy}, timeout=10).text.rstrip()
-                if not your_ip:
-                    raise exceptions.InvalidProxy(f"Proxy doesn't work! Your IP is {your_ip}.")
-
         self.w3 = Web3(
-            provider=Web3.AsyncHTTPProvider(
-                endpoint_uri=self.network.rpc, request_kwargs={"proxy": self.proxy, "headers": self.headers, "timeout": 360}
+            provider=InstrumentedAsyncHTTPProvider(
+                endpoint_uri=self.network.rpc,
+                request_kwargs={"proxy": self.proxy, "headers": self.headers, "timeout": 360},
+                network_name=self.network.name,
             ),
             modules={"eth": (AsyncEth,)},
             middlewares=[],
@@ -62,6 +67,49 @@ class Client:
         self.contracts = Contracts(self)
         self.transactions = Transactions(self)
 
+    @classmethod
+    async def create(
+        cls, private_key: str | None = None, network: Network = Networks.Sepolia, proxy: str | None = None, check_proxy: bool = True
+    ) -> "Client":
+        """
+        Build a client and, if a proxy is set, check it without blocking the event loop.
+
+        :param str | None private_key: the private key (plain or encrypted), a new account is created if None
+        :param Network network: the network
+        :param str | None proxy: the proxy
+        :param bool check_proxy: check that the proxy works (the result is cached per proxy for PROXY_CHECK_TTL)
+        :return Client: the client
+        """
+        client = cls(private_key=private_key, network=network, proxy=proxy)
+        if client.proxy and check_proxy:
+            await client.check_proxy()
+
+        return client
+
+    async def check_proxy(self, ttl: float = PROXY_CHECK_TTL) -> str:
+        """
+        Check that the proxy works.
+
+        :param float ttl: how long a successful check is reused for the same proxy
+        :return str: the external IP seen through the proxy
+        """
+        cached = _proxy_checks.get(self.proxy)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        try:
+            async with AsyncSession(proxies={"http": self.proxy, "https": self.proxy}) as session:
+                response = await session.get("http://eth0.me/", timeout=10)
+                your_ip = response.text.rstrip()
+        except Exception as err:
+            raise exceptions.InvalidProxy(f"Proxy doesn't work! {err}")
+
+        if not your_ip:
+            raise exceptions.InvalidProxy(f"Proxy doesn't work! Your IP is {your_ip}.")
+
+        _proxy_checks[self.proxy] = (your_ip, time.monotonic() + ttl)
+        return your_ip
+
     async def switch_network(self, new_network: Network) -> None:
         """
 
@@ -72,7 +120,9 @@ class Client:
         self.network = new_network
 
         self.w3 = Web3(
-            provider=Web3.AsyncHTTPProvider(endpoint_uri=self.network.rpc, request_kwargs={"proxy": self.proxy, "headers": self.headers}),
+            provider=InstrumentedAsyncHTTPProvider(
+                endpoint_uri=self.network.rpc, request_kwargs={"proxy": self.proxy, "headers": self.headers}, network_name=self.network.name
+            ),
             modules={"eth": (AsyncEth,)},
             middlewares=[],
         )
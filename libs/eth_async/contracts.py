@@ -1,20 +1,66 @@
 from __future__ import annotations
 
+import copy
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from eth_typing import ChecksumAddress
+from loguru import logger
 from web3 import Web3
 from web3.contract import AsyncContract, Contract
 
 from .data import types
 from .data.models import DefaultABIs, RawContract
-from .utils.strings import text_between
-from .utils.web_requests import async_get
+from .selector_db import get_selector_db
 
 if TYPE_CHECKING:
     from .client import Client
 
 
+def split_types(types_: str) -> list[str]:
+    """
+    Split a comma-separated list of ABI types on the top level, e.g. 'address,(uint256,bytes)[]'.
+    """
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(types_):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(types_[start:i])
+            start = i + 1
+
+    if types_:
+        parts.append(types_[start:])
+    return parts
+
+
+def abi_param(type_: str) -> dict:
+    if not type_.startswith("("):
+        return {"type": type_}
+
+    end = type_.rindex(")")
+    return {"type": "tuple" + type_[end + 1 :], "components": [abi_param(t) for t in split_types(type_[1:end])]}
+
+
+@lru_cache(maxsize=1024)
+def function_abi(text_signature: str) -> dict:
+    """
+    Parse a text signature into an ABI function dictionary. Cached: the result must not be modified.
+
+    :param str text_signature: a text signature, e.g. swap((address,uint256)[],address).
+    :return dict: the function dictionary for the ABI.
+    """
+    name, sign = text_signature.replace(" ", "").split("(", 1)
+    return {
+        "type": "function",
+        "name": name,
+        "inputs": [abi_param(type_) for type_ in split_types(sign[:-1])],
+        "outputs": [{"type": "uint256"}],
+    }
+
+
 class Contracts:
     def __init__(self, client: Client) -> None:
         self.client = client
@@ -30,20 +76,26 @@ class Contracts:
         return self.client.w3.eth.contract(address=contract_address, abi=DefaultABIs.Token)
 
     @staticmethod
-    async def get_signature(hex_signature: str) -> list | None:
+    async def get_signature(hex_signature: str, fetch: bool = True) -> list | None:
         """
-        Find all matching signatures in the database of https://www.4byte.directory/.
+        Find all matching signatures in the local selector database. Unknown selectors are looked up in the database
+        of https://www.4byte.directory/ and stored locally.
 
         :param str hex_signature: a signature hash.
-        :return list | None: matches found.
+        :param bool fetch: query 4byte.directory if the selector is unknown locally. (True)
+        :return list | None: matches found, None if 4byte.directory could not be queried.
         """
-        try:
-            response = await async_get(f"https://www.4byte.directory/api/v1/signatures/?hex_signature={hex_signature}")
-            results = response["results"]
-            return [m["text_signature"] for m in sorted(results, key=lambda result: result["created_at"])]
+        db = get_selector_db()
+        matches = db.get(hex_signature)
+        if not matches and fetch:
+            try:
+                matches = await db.fetch(hex_signature)
+
+            except Exception as err:
+                logger.warning(f"Failed to get the signatures of {hex_signature} from 4byte.directory: {err}")
+                return
 
-        except:
-            return
+        return list(matches)
 
     @staticmethod
     async def parse_function(text_signature: str) -> dict:
@@ -53,32 +105,7 @@ class Contracts:
         :param str text_signature: a text signature, e.g. approve(address,uint256).
         :return dict: the function dictionary for the ABI.
         """
-
-        # swap(address,address,uint256,uint256,address,address)
-
-        name, sign = text_signature.split("(", 1)
-        sign = sign[:-1]
-        tuples = []
-        while "(" in sign:
-            tuple_ = text_between(text=sign[:-1], begin="(", end=")")
-            tuples.append(tuple_.split(",") or [])
-            sign = sign.replace(f"({tuple_})", "tuple")
-
-        inputs = sign.split(",")
-        if inputs == [""]:
-            inputs = []
-
-        function = {"type": "function", "name": name, "inputs": [], "outputs": [{"type": "uint256"}]}
-        i = 0
-        for type_ in inputs:
-            input_ = {"type": type_}
-            if type_ == "tuple":
-                input_["components"] = [{"type": comp_type} for comp_type in tuples[i]]
-                i += 1
-
-            function["inputs"].append(input_)
-
-        return function
+        return copy.deepcopy(function_abi(text_signature))
 
     @staticmethod
     async def get_contract_attributes(contract: types.Contract) -> tuple[ChecksumAddress, list | None]:
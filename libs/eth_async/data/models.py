@@ -198,12 +198,147 @@ class Network:
         return f"{self.name.capitalize()}"
 
 
+class ChainRegistry:
+    """
+    Networks indexed by chain id, name and coin symbol.
+
+    Networks are registered as keyword arguments and the Network object is built on first use, so
+    registering many chains costs nothing at import. Lookups and filters by chain id, name, coin symbol,
+    tx type or tag (e.g. 'l2', 'testnet') use the registered values and only build the networks returned.
+    """
+
+    def __init__(self) -> None:
+        self._specs: dict[str, tuple[dict, frozenset[str]]] = {}
+        self._networks: dict[str, Network] = {}
+        self._by_chain_id: dict[int, str] = {}
+        self._by_name: dict[str, str] = {}
+        self._by_symbol: dict[str, list[str]] = {}
+
+    def register(self, key: str, tags: tuple[str, ...] = (), **network_kwargs) -> None:
+        """
+        Register a network without building it.
+
+        Args:
+            key (str): the registry key (the Networks attribute name).
+            tags (Tuple[str, ...]): free-form tags for filtering, e.g. ('l2',).
+            **network_kwargs: the Network arguments, 'chain_id', 'coin_symbol' and 'decimals' are required so that
+                building it makes no network requests.
+
+        """
+        missing = [arg for arg in ("chain_id", "coin_symbol", "decimals") if not network_kwargs.get(arg)]
+        if missing:
+            raise ValueError(f"Network {key} can not be registered lazily without {', '.join(missing)}")
+
+        if key in self._specs:
+            self._unindex(key)
+
+        self._specs[key] = (network_kwargs, frozenset(tags))
+        self._networks.pop(key, None)
+        self._by_chain_id[network_kwargs["chain_id"]] = key
+        self._by_name[key.lower()] = key
+        self._by_name[network_kwargs["name"].lower()] = key
+        self._by_symbol.setdefault(network_kwargs["coin_symbol"].upper(), []).append(key)
+
+    def _unindex(self, key: str) -> None:
+        kwargs, _ = self._specs[key]
+        self._by_chain_id.pop(kwargs["chain_id"], None)
+        self._by_name.pop(key.lower(), None)
+        self._by_name.pop(kwargs["name"].lower(), None)
+        self._by_symbol[kwargs["coin_symbol"].upper()].remove(key)
+
+    def get(self, key: str) -> Network:
+        network = self._networks.get(key)
+        if network is None:
+            network = self._networks[key] = Network(**self._specs[key][0])
+
+        return network
+
+    def by_chain_id(self, chain_id: int) -> Network | None:
+        key = self._by_chain_id.get(int(chain_id))
+        return self.get(key) if key else None
+
+    def by_name(self, name: str) -> Network | None:
+        key = self._by_name.get(name.lower())
+        return self.get(key) if key else None
+
+    def by_symbol(self, coin_symbol: str) -> list[Network]:
+        return [self.get(key) for key in self._by_symbol.get(coin_symbol.upper(), [])]
+
+    def filter(
+        self,
+        coin_symbol: str | None = None,
+        tags: tuple[str, ...] = (),
+        tx_type: int | None = None,
+        exclude: tuple[Network, ...] = (),
+    ) -> list[Network]:
+        """
+        Get the networks matching all the given conditions, e.g. filter(coin_symbol='ETH', tags=('l2',)).
+
+        Args:
+            coin_symbol (Optional[str]): the native coin symbol.
+            tags (Tuple[str, ...]): tags the network must have.
+            tx_type (Optional[int]): the transaction type.
+            exclude (Tuple[Network, ...]): networks to skip.
+
+        Returns:
+            List[Network]: the networks in registration order.
+
+        """
+        keys = self._by_symbol.get(coin_symbol.upper(), []) if coin_symbol else self._specs
+        excluded = {network.chain_id for network in exclude}
+        networks = []
+        for key in keys:
+            kwargs, network_tags = self._specs[key]
+            if kwargs["chain_id"] in excluded or not network_tags.issuperset(tags):
+                continue
+            if tx_type is not None and kwargs.get("tx_type", 0) != tx_type:
+                continue
+
+            networks.append(self.get(key))
+
+        return networks
+
+    def __iter__(self):
+        return (self.get(key) for key in list(self._specs))
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._specs
+
+
+chains = ChainRegistry()
+
+
+class LazyNetwork:
+    """
+    A Networks class attribute registered in `chains` and built on first access.
+    """
+
+    def __init__(self, tags: tuple[str, ...] = (), **network_kwargs) -> None:
+        self.tags = tags
+        self.network_kwargs = network_kwargs
+        self.key = ""
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.key = name
+        chains.register(name, tags=self.tags, **self.network_kwargs)
+
+    def __get__(self, instance, owner) -> Network:
+        return chains.get(self.key)
+
+
 from data.rpc import RPC_MAP
 
 
 class Networks:
+    """
+    Known networks. Every attribute is a Network built on first access; look them up with `chains`.
+    """
+
     # Mainnets
-    Ethereum = Network(
+    Ethereum = LazyNetwork(
         name="ethereum",
         rpc=RPC_MAP["ethereum"],
         chain_id=1,
@@ -214,7 +349,8 @@ class Networks:
         api=API(key=config.ETHEREUM_API_KEY, url="https://api.etherscan.io/api", docs="https://docs.etherscan.io/"),
     )
 
-    Arbitrum = Network(
+    Arbitrum = LazyNetwork(
+        tags=("l2",),
         name="arbitrum",
         rpc=RPC_MAP["arbitrum"],
         chain_id=42161,
@@ -225,17 +361,20 @@ class Networks:
         api=API(key=config.ARBITRUM_API_KEY, url="https://api.arbiscan.io/api", docs="https://docs.arbiscan.io/"),
     )
 
-    Base = Network(
+    Base = LazyNetwork(
+        tags=("l2",),
         name="base",
         rpc=RPC_MAP["base"],
         chain_id=8453,
         tx_type=2,
         coin_symbol="ETH",
+        decimals=18,
         explorer="https://base.blockscout.com/",
         api=API(key=config.BASE_API_KEY, url="https://api.basescan.org/api", docs="https://docs.basescan.org/"),
     )
 
-    Optimism = Network(
+    Optimism = LazyNetwork(
+        tags=("l2",),
         name="optimism",
         rpc=RPC_MAP["optimism"],
         chain_id=10,
@@ -246,7 +385,8 @@ class Networks:
         api=API(key=config.OPTIMISM_API_KEY, url="https://api-optimistic.etherscan.io/api", docs="https://docs.optimism.etherscan.io/"),
     )
 
-    Ink = Network(
+    Ink = LazyNetwork(
+        tags=("l2",),
         name="ink",
         rpc=RPC_MAP["ink"],
         chain_id=57073,
@@ -260,7 +400,8 @@ class Networks:
         # ),
     )
 
-    Mode = Network(
+    Mode = LazyNetwork(
+        tags=("l2",),
         name="mode",
         rpc=RPC_MAP["mode"],
         chain_id=34443,
@@ -274,7 +415,7 @@ class Networks:
         # ),
     )
 
-    BSC = Network(
+    BSC = LazyNetwork(
         name="BSC",
         rpc=RPC_MAP["bsc"],
         chain_id=56,
@@ -285,7 +426,8 @@ class Networks:
         api=API(key=config.BSC_API_KEY, url="https://api.bscscan.com/api", docs="https://docs.bscscan.com/"),
     )
 
-    opBNB = Network(
+    opBNB = LazyNetwork(
+        tags=("l2",),
         name="op_bnb",
         rpc=RPC_MAP["op_bnb"],
         chain_id=204,
@@ -296,7 +438,7 @@ class Networks:
         api=API(key=config.BSC_API_KEY, url="https://api.bscscan.com/api", docs="https://docs.bscscan.com/"),
     )
 
-    Polygon = Network(
+    Polygon = LazyNetwork(
         name="polygon",
         rpc=RPC_MAP["polygon"],
         chain_id=137,
@@ -307,7 +449,8 @@ class Networks:
         api=API(key=config.POLYGON_API_KEY, url="https://api.polygonscan.com/api", docs="https://docs.polygonscan.com/"),
     )
 
-    Soneium = Network(
+    Soneium = LazyNetwork(
+        tags=("l2",),
         name="Soneium",
         rpc=RPC_MAP["soneium"],
         chain_id=1868,
@@ -320,7 +463,8 @@ class Networks:
         ),
     )
 
-    LISK = Network(
+    LISK = LazyNetwork(
+        tags=("l2",),
         name="LISK",
         rpc=RPC_MAP["lisk"],
         chain_id=1135,
@@ -331,7 +475,8 @@ class Networks:
         # api=API(key=config.HECO_API_KEY, url='https://api.hecoinfo.com/api', docs='https://hecoinfo.com/apis')
     )
 
-    Unichain = Network(
+    Unichain = LazyNetwork(
+        tags=("l2",),
         name="unichain",
         rpc=RPC_MAP["unichain"],
         chain_id=130,
@@ -342,7 +487,7 @@ class Networks:
         # api=API(key=config.HECO_API_KEY, url='https://api.hecoinfo.com/api', docs='https://hecoinfo.com/apis')
     )
 
-    Avalanche = Network(
+    Avalanche = LazyNetwork(
         name="avalanche",
         rpc="https://1rpc.io/avax/c",
         chain_id=43114,
@@ -353,7 +498,8 @@ class Networks:
         api=API(key=config.AVALANCHE_API_KEY, url="https://api.snowtrace.io/api", docs="https://docs.snowtrace.io/"),
     )
 
-    ArbitrumNova = Network(
+    ArbitrumNova = LazyNetwork(
+        tags=("l2",),
         name="arbitrum_nova",
         rpc="https://nova.arbitrum.io/rpc/",
         chain_id=42170,
@@ -364,7 +510,7 @@ class Networks:
         api=API(key=config.ARBITRUM_API_KEY, url="https://api-nova.arbiscan.io/api", docs="https://nova.arbiscan.io/apis/"),
     )
 
-    Moonbeam = Network(
+    Moonbeam = LazyNetwork(
         name="moonbeam",
         rpc="https://rpc.api.moonbeam.network/",
         chain_id=1284,
@@ -375,7 +521,7 @@ class Networks:
         api=API(key=config.MOONBEAM_API_KEY, url="https://api-moonbeam.moonscan.io/api", docs="https://moonscan.io/apis/"),
     )
 
-    Fantom = Network(
+    Fantom = LazyNetwork(
         name="fantom",
         rpc="https://1rpc.io/ftm",
         chain_id=250,
@@ -386,7 +532,7 @@ class Networks:
         api=API(key=config.FANTOM_API_KEY, url="https://api.ftmscan.com/api", docs="https://docs.ftmscan.com/"),
     )
 
-    Celo = Network(
+    Celo = LazyNetwork(
         name="celo",
         rpc="https://1rpc.io/celo",
         chain_id=42220,
@@ -397,7 +543,8 @@ class Networks:
         api=API(key=config.CELO_API_KEY, url="https://api.celoscan.io/api", docs="https://celoscan.io/apis/"),
     )
 
-    ZkSync = Network(
+    ZkSync = LazyNetwork(
+        tags=("l2",),
         name="zksync",
         rpc="https://mainnet.era.zksync.io",
         # rpc='https://rpc.ankr.com/zksync_era',
@@ -408,7 +555,7 @@ class Networks:
         explorer="https://explorer.zksync.io/",
     )
 
-    Gnosis = Network(
+    Gnosis = LazyNetwork(
         name="gnosis",
         rpc="https://0xrpc.io/gno",
         chain_id=100,
@@ -419,7 +566,7 @@ class Networks:
         api=API(key=config.GNOSIS_API_KEY, url="https://api.gnosisscan.io/api", docs="https://docs.gnosisscan.io/"),
     )
 
-    HECO = Network(
+    HECO = LazyNetwork(
         name="heco",
         rpc="https://heco.drpc.org",
         chain_id=128,
@@ -430,7 +577,7 @@ class Networks:
         api=API(key=config.HECO_API_KEY, url="https://api.hecoinfo.com/api", docs="https://hecoinfo.com/apis"),
     )
 
-    KAIA = Network(
+    KAIA = LazyNetwork(
         name="KAIA",
         rpc="https://public-en.node.kaia.io",
         chain_id=8217,
@@ -441,7 +588,8 @@ class Networks:
         # api=API(key=config.HECO_API_KEY, url='https://api.hecoinfo.com/api', docs='https://hecoinfo.com/apis')
     )
 
-    LINEA = Network(
+    LINEA = LazyNetwork(
+        tags=("l2",),
         name="LINEA",
         rpc=RPC_MAP["linea"],
         chain_id=59144,
@@ -451,7 +599,8 @@ class Networks:
         explorer="https://lineascan.build/",
     )
 
-    Sepolia = Network(
+    Sepolia = LazyNetwork(
+        tags=("testnet",),
         name="sepolia",
         rpc=RPC_MAP["sepolia"],
         chain_id=11155111,
@@ -464,8 +613,16 @@ class Networks:
         ),
     )
 
-    PharosTestnet = Network(
-        name="pharos testnet", rpc=RPC_MAP["pharos"], chain_id=688688, tx_type=2, coin_symbol="PHRS", decimals=18, explorer="", api=None
+    PharosTestnet = LazyNetwork(
+        tags=("testnet",),
+        name="pharos testnet",
+        rpc=RPC_MAP["pharos"],
+        chain_id=688688,
+        tx_type=2,
+        coin_symbol="PHRS",
+        decimals=18,
+        explorer="",
+        api=None,
     )
 
 
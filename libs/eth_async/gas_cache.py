@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from web3.types import TxParams
+
+from .selector_db import normalize_selector
+
+GasKey = tuple[int, str, str, str, bool]
+
+# calls whose gas depends on the storage they touch: the first approve or a transfer to a new holder writes
+# a zero slot and costs ~20k more than the next one, so they are always estimated live
+LIVE_SELECTORS = frozenset(
+    {
+        "0x095ea7b3",  # approve(address,uint256)
+        "0xa9059cbb",  # transfer(address,uint256)
+        "0x23b872dd",  # transferFrom(address,address,uint256)
+        "0x42842e0e",  # safeTransferFrom(address,address,uint256)
+        "0xb88d4fde",  # safeTransferFrom(address,address,uint256,bytes)
+        "0xf242432a",  # safeTransferFrom(address,address,uint256,uint256,bytes)
+        "0x2eb2c2d6",  # safeBatchTransferFrom(address,address,uint256[],uint256[],bytes)
+        "0xa22cb465",  # setApprovalForAll(address,bool)
+        "0xd505accf",  # permit(address,address,uint256,uint256,uint8,bytes32,bytes32)
+    }
+)
+
+
+def _selector(tx_params: TxParams) -> str:
+    data = tx_params.get("data") or b""
+    has_selector = len(data) >= 4 if isinstance(data, (bytes, bytearray)) else len(data.removeprefix("0x")) >= 8
+    return normalize_selector(data) if has_selector else ""
+
+
+def gas_key(tx_params: TxParams) -> GasKey:
+    """
+    The call template of a transaction: (chain id, sender, recipient, function selector, sends value).
+    """
+    return (
+        int(tx_params.get("chainId") or 0),
+        str(tx_params.get("from") or "").lower(),
+        str(tx_params.get("to") or "").lower(),
+        _selector(tx_params),
+        bool(int(tx_params.get("value") or 0)),
+    )
+
+
+class GasEstimateCache:
+    """
+    Gas estimates by call template.
+
+    Repeated transactions of the same shape from the same wallet (an ETH transfer, a bridge deposit) use nearly
+    the same gas, so the first live estimate is reused for the next ones multiplied by a safety `multiplier`.
+    The largest estimate seen is kept. Entries expire after `ttl` seconds and are dropped after a failed send,
+    so the next transaction is estimated live again.
+
+    A cached estimate skips the revert check eth_estimateGas does, and calls whose cost depends on contract
+    storage may need more than a previous estimate: the selectors in `live_selectors` are never cached.
+    """
+
+    def __init__(
+        self, multiplier: float = 1.2, ttl: float = 600, max_entries: int = 1024, live_selectors: frozenset[str] = LIVE_SELECTORS
+    ) -> None:
+        self.multiplier = multiplier
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.live_selectors = frozenset(normalize_selector(selector) for selector in live_selectors)
+        self._entries: OrderedDict[GasKey, tuple[int, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tx_params: TxParams) -> int | None:
+        """
+        Get the cached gas limit (with the multiplier applied) for the transaction, None on a miss
+        or if the transaction has to be estimated live.
+        """
+        if not self.cacheable(tx_params):
+            return None
+
+        key = gas_key(tx_params)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return int(entry[0] * self.multiplier)
+
+    def cacheable(self, tx_params: TxParams) -> bool:
+        return bool(tx_params.get("from")) and _selector(tx_params) not in self.live_selectors
+
+    def put(self, tx_params: TxParams, estimate: int) -> None:
+        if not self.cacheable(tx_params):
+            return
+
+        key = gas_key(tx_params)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+            estimate = max(estimate, entry[0])
+
+        self._entries[key] = (int(estimate), time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tx_params: TxParams) -> None:
+        self._entries.pop(gas_key(tx_params), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache: GasEstimateCache | None = None
+
+
+def get_gas_cache() -> GasEstimateCache | None:
+    return _cache
+
+
+def set_gas_cache(cache: GasEstimateCache | None) -> None:
+    """
+    Install the gas estimate cache used by Transactions.auto_add_params (None estimates every transaction live).
+    """
+    global _cache
+    _cache = cache
+
+
+def invalidate_gas_estimate(tx_params: TxParams) -> None:
+    """
+    Drop the cached estimate of a transaction that failed to send or reverted.
+    """
+    if _cache is not None:
+        _cache.invalidate(tx_params)
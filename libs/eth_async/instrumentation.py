@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+from web3 import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+@dataclass
+class RequestEvent:
+    """
+    One finished outgoing request.
+
+    Attributes:
+        source (str): 'rpc' for JSON-RPC calls, 'http' for plain HTTP helpers.
+        network (str): the network name or the request host.
+        method (str): the JSON-RPC method or the HTTP verb.
+        duration (float): the request duration in seconds.
+        error (str | None): the exception class name if the request failed.
+
+    """
+
+    source: str
+    network: str
+    method: str
+    duration: float
+    error: str | None = None
+
+
+class MetricSeries:
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, event: RequestEvent) -> None:
+        self.count += 1
+        self.total += event.duration
+        self.max = max(self.max, event.duration)
+        self.buckets[bisect_left(LATENCY_BUCKETS, event.duration)] += 1
+        if event.error:
+            self.errors += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": {str(le): n for le, n in zip(LATENCY_BUCKETS, self.buckets)},
+        }
+
+
+class MetricsCollector:
+    """
+    Counters, error counts and latency histograms per (source, network, method).
+    """
+
+    def __init__(self) -> None:
+        self.series: dict[tuple[str, str, str], MetricSeries] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = (event.source, event.network, event.method)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = MetricSeries()
+            series.observe(event)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.series.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            items = [(key, series.as_dict()) for key, series in self.series.items()]
+
+        return {
+            "time": time.time(),
+            "total": sum(data["count"] for _, data in items),
+            "series": [{"source": s, "network": n, "method": m, **data} for (s, n, m), data in sorted(items)],
+        }
+
+    def prometheus_text(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            items = [(key, series.as_dict(), list(series.buckets), series.total) for key, series in self.series.items()]
+
+        lines = [
+            "# HELP eth_async_requests_total Outgoing requests.",
+            "# TYPE eth_async_requests_total counter",
+        ]
+        for (source, network, method), data, _, _ in items:
+            lines.append(f'eth_async_requests_total{{source="{source}",network="{network}",method="{method}"}} {data["count"]}')
+
+        lines += ["# HELP eth_async_request_errors_total Failed outgoing requests.", "# TYPE eth_async_request_errors_total counter"]
+        for (source, network, method), data, _, _ in items:
+            lines.append(f'eth_async_request_errors_total{{source="{source}",network="{network}",method="{method}"}} {data["errors"]}')
+
+        lines += ["# HELP eth_async_request_seconds Request latency.", "# TYPE eth_async_request_seconds histogram"]
+        for (source, network, method), data, buckets, total in items:
+            labels = f'source="{source}",network="{network}",method="{method}"'
+            cumulative = 0
+            for le, n in zip(LATENCY_BUCKETS, buckets):
+                cumulative += n
+                le_label = "+Inf" if le == float("inf") else str(le)
+                lines.append(f'eth_async_request_seconds_bucket{{{labels},le="{le_label}"}} {cumulative}')
+            lines.append(f"eth_async_request_seconds_sum{{{labels}}} {total}")
+            lines.append(f"eth_async_request_seconds_count{{{labels}}} {data['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsCollector()
+_hooks: list[Callable[[RequestEvent], None]] = [METRICS]
+# name -> (JSON snapshot, Prometheus text) of metrics kept outside this module, e.g. the retry counters
+_sources: dict[str, tuple[Callable[[], dict], Callable[[], str] | None]] = {}
+
+
+def add_source(name: str, snapshot: Callable[[], dict], prometheus_text: Callable[[], str] | None = None) -> None:
+    """
+    Export another component's metrics next to METRICS: `snapshot()` goes to the JSON dump under `name`,
+    `prometheus_text()` is appended to the Prometheus page.
+    """
+    _sources[name] = (snapshot, prometheus_text)
+
+
+def remove_source(name: str) -> None:
+    _sources.pop(name, None)
+
+
+def collect_json() -> dict[str, Any]:
+    data = METRICS.snapshot()
+    for name, (snapshot, _) in _sources.items():
+        data[name] = snapshot()
+
+    return data
+
+
+def collect_prometheus() -> str:
+    return METRICS.prometheus_text() + "".join(text() for _, text in _sources.values() if text)
+
+
+def add_hook(hook: Callable[[RequestEvent], None]) -> None:
+    """
+    Register a callable that receives every RequestEvent (e.g. a tracer or another metrics backend).
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[RequestEvent], None]) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def emit(event: RequestEvent) -> None:
+    for hook in _hooks:
+        try:
+            hook(event)
+        except Exception:
+            pass
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).hostname or url
+
+
+def rpc_method_of(payload: Any) -> str | None:
+    """
+    Get the JSON-RPC method name from a request payload (a single call or a batch).
+    """
+    if isinstance(payload, dict):
+        return payload.get("method")
+
+    if isinstance(payload, list) and payload and isinstance(payload[0], dict):
+        methods = {call.get("method") for call in payload}
+        return methods.pop() if len(methods) == 1 else "batch"
+
+    return None
+
+
+class InstrumentedAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that reports every JSON-RPC call to the registered hooks.
+    """
+
+    def __init__(self, endpoint_uri: str | None = None, request_kwargs: Any | None = None, network_name: str | None = None) -> None:
+        super().__init__(endpoint_uri=endpoint_uri, request_kwargs=request_kwargs)
+        self.network_name = network_name or host_of(str(endpoint_uri))
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await super().make_request(method, params)
+            if isinstance(response, dict) and response.get("error"):
+                error = "RPCError"
+            return response
+
+        except Exception as err:
+            error = type(err).__name__
+            raise
+
+        finally:
+            emit(RequestEvent("rpc", self.network_name, str(method), time.perf_counter() - started, error))
+
+
+async def serve_prometheus(host: str = "127.0.0.1", port: int = 9464) -> asyncio.AbstractServer:
+    """
+    Start a minimal HTTP server that answers every request with METRICS and the registered sources
+    in the Prometheus text format.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+
+        body = collect_prometheus().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, host=host, port=port)
+
+
+async def dump_json_periodically(path: str, interval: float = 60) -> None:
+    """
+    Write METRICS.snapshot() and the registered sources to a JSON file every `interval` seconds until cancelled.
+    """
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(_write_json, path, collect_json())
+    finally:
+        _write_json(path, collect_json())
+
+
+def _write_json(path: str, data: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from functools import lru_cache
+
+from eth_utils import function_signature_to_4byte_selector
+
+SEED_FILE = os.path.join(os.path.dirname(__file__), "data", "signatures.txt")
+SEED_VERSION = 1
+
+FOUR_BYTE_URL = "https://www.4byte.directory/api/v1/signatures/"
+
+
+def normalize_selector(selector: str | bytes) -> str:
+    """
+    Convert a selector or calldata (hex or bytes) to a lowercase '0x' + 8 hex chars selector.
+    """
+    if isinstance(selector, (bytes, bytearray, memoryview)):
+        return "0x" + bytes(selector[:4]).hex()
+
+    selector = selector.lower()
+    if not selector.startswith("0x"):
+        selector = "0x" + selector
+
+    return selector[:10]
+
+
+def selector_of(text_signature: str) -> str:
+    return "0x" + function_signature_to_4byte_selector(text_signature).hex()
+
+
+def read_seed(path: str = SEED_FILE) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+class SelectorDB:
+    """
+    Local function selector -> text signature database.
+
+    Signatures live in an SQLite file seeded from the bundled `data/signatures.txt`, and can be extended
+    from ABIs, text signatures or 4byte.directory. Lookups go through an in-memory LRU, so decoding many
+    transactions reads each selector from disk once.
+    """
+
+    def __init__(self, path: str, cache_size: int = 4096) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS signatures ("
+                "selector TEXT NOT NULL, text_signature TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (selector, text_signature))"
+            )
+            self._conn = conn
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SEED_VERSION:
+                self._insert(read_seed(), created_at=0)
+                conn.execute(f"PRAGMA user_version = {SEED_VERSION}")
+                conn.commit()
+
+        return self._conn
+
+    def _lookup(self, selector: str) -> tuple[str, ...]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT text_signature FROM signatures WHERE selector = ? ORDER BY created_at, rowid", (selector,)
+            ).fetchall()
+        return tuple(row[0] for row in rows)
+
+    def get(self, selector: str | bytes) -> tuple[str, ...]:
+        """
+        Get the text signatures of a selector, the oldest first (the same order 4byte.directory uses).
+
+        :param str | bytes selector: the selector or calldata
+        :return tuple[str, ...]: the matches, empty if the selector is unknown
+        """
+        return self.lookup(normalize_selector(selector))
+
+    def _insert(self, text_signatures: Iterable[str], created_at: float | None = None) -> int:
+        created_at = time.time() if created_at is None else created_at
+        rows = [(selector_of(sig), sig, created_at) for sig in dict.fromkeys(sig.replace(" ", "") for sig in text_signatures)]
+        with self._lock:
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO signatures VALUES (?, ?, ?)", rows)
+            self.conn.commit()
+            added = self.conn.total_changes - before
+
+        if added:
+            self.lookup.cache_clear()
+        return added
+
+    def add(self, text_signatures: str | Iterable[str]) -> int:
+        """
+        Add text signatures, e.g. 'approve(address,uint256)'. Selectors are computed locally.
+
+        :return int: the number of new signatures
+        """
+        if isinstance(text_signatures, str):
+            text_signatures = [text_signatures]
+        return self._insert(text_signatures)
+
+    def add_abi(self, abi: list[dict]) -> int:
+        """
+        Add the functions of a contract ABI.
+
+        :return int: the number of new signatures
+        """
+
+        def collapse(param: dict) -> str:
+            type_ = param["type"]
+            if type_.startswith("tuple"):
+                return "(" + ",".join(collapse(c) for c in param.get("components", [])) + ")" + type_[5:]
+            return type_
+
+        return self._insert(
+            f"{item['name']}({','.join(collapse(i) for i in item.get('inputs', []))})" for item in abi if item.get("type") == "function"
+        )
+
+    async def fetch(self, selector: str | bytes) -> tuple[str, ...]:
+        """
+        Download the signatures of a selector from 4byte.directory and store them.
+
+        :return tuple[str, ...]: all known signatures of the selector
+        """
+        from .utils.web_requests import async_get
+
+        selector = normalize_selector(selector)
+        response = await async_get(FOUR_BYTE_URL, params={"hex_signature": selector})
+        results = sorted(response["results"], key=lambda result: result["created_at"])
+        self._insert(result["text_signature"] for result in results)
+        return self.lookup(selector)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self.lookup.cache_clear()
+
+
+_db: SelectorDB | None = None
+
+
+def get_selector_db() -> SelectorDB:
+    global _db
+
+    if _db is None:
+        from data.config import SELECTORS_DB
+
+        _db = SelectorDB(SELECTORS_DB)
+
+    return _db
+
+
+def set_selector_db(db: SelectorDB | None) -> None:
+    global _db
+    _db = db
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from eth_account import Account
+from eth_account.datastructures import SignedMessage, SignedTransaction
+from eth_account.messages import SignableMessage
+from eth_utils.crypto import keccak
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+def sign_transaction(tx_params: dict, private_key: Any) -> SignedTransaction:
+    return Account.sign_transaction(transaction_dict=tx_params, private_key=private_key)
+
+
+def sign_transactions(txs: list[dict], private_key: Any) -> list[SignedTransaction]:
+    return [Account.sign_transaction(transaction_dict=tx, private_key=private_key) for tx in txs]
+
+
+def sign_message(message: SignableMessage, private_key: Any) -> SignedMessage:
+    return Account.sign_message(signable_message=message, private_key=private_key)
+
+
+class SigningExecutor:
+    """
+    Runs secp256k1 signing off the event loop in a thread or process pool.
+
+    Signing is pure CPU work: inline, every signature stalls all other coroutines. A thread pool keeps the
+    loop responsive; a process pool also scales the throughput with the number of cores (private keys are
+    sent to the worker processes). Batches are split into one chunk per worker to amortize the dispatch cost.
+    """
+
+    def __init__(self, kind: str = "thread", workers: int | None = None):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Invalid signing executor: {kind}. Must be one of: {', '.join(EXECUTOR_KINDS)}")
+
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Executor | None = None
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="signer")
+
+        return self._pool
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def sign_transaction(self, tx_params: dict, private_key: Any) -> SignedTransaction:
+        return await self._run(sign_transaction, dict(tx_params), private_key)
+
+    async def sign_transactions(self, txs: list[dict], private_key: Any) -> list[SignedTransaction]:
+        """
+        Sign many transaction dicts with one key. The result keeps the order of `txs`.
+        """
+        if not txs:
+            return []
+
+        size = -(-len(txs) // self.workers)
+        chunks = [[dict(tx) for tx in txs[i : i + size]] for i in range(0, len(txs), size)]
+        results = await asyncio.gather(*(self._run(sign_transactions, chunk, private_key) for chunk in chunks))
+        return [signed for chunk in results for signed in chunk]
+
+    async def sign_message(self, message: SignableMessage, private_key: Any) -> SignedMessage:
+        return await self._run(sign_message, message, private_key)
+
+    async def keccak(self, data: bytes) -> bytes:
+        return await self._run(keccak, data)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_executor: SigningExecutor | None = None
+
+
+def get_signing_executor() -> SigningExecutor | None:
+    return _executor
+
+
+def set_signing_executor(executor: SigningExecutor | None) -> None:
+    """
+    Install the executor used by Transactions and Base for signing (None signs inline on the loop).
+    """
+    global _executor
+
+    if _executor is not None and _executor is not executor:
+        _executor.shutdown()
+
+    _executor = executor
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import random
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from eth_account.datastructures import SignedTransaction
@@ -13,9 +17,13 @@ from web3.types import TxParams, TxReceipt, _Hash32
 from libs.eth_async.utils.web_requests import async_post
 
 from . import exceptions
+from .blockscan_api import iter_pages
+from .calldata import DecodedCall, calldata_of, decode_calldata, decode_calldata_batch, fetch_missing_selectors
 from .classes import AutoRepr
 from .data import types
 from .data.models import CommonValues, TokenAmount, TxArgs
+from .gas_cache import get_gas_cache, invalidate_gas_estimate
+from .signing import get_signing_executor
 from .utils.utils import api_key_required
 
 if TYPE_CHECKING:
@@ -102,10 +110,28 @@ class Tx(AutoRepr):
         self.receipt = await client.transactions.wait_for_receipt(
             w3=client.w3, tx_hash=self.hash, timeout=timeout, poll_latency=poll_latency
         )
+        if self.params and self.receipt.get("status") != 1:
+            invalidate_gas_estimate(self.params)
+
         return self.receipt
 
-    async def decode_input_data(self):
-        pass
+    async def decode_input_data(self) -> DecodedCall | None:
+        """
+        Decode the transaction input data with the local selector database.
+
+        Returns:
+            Optional[DecodedCall]: the decoded call, None if the function is unknown.
+
+        """
+        if not self.params:
+            raise exceptions.TransactionException("Transaction parameters are unknown, call 'parse_params' first!")
+
+        decoded = decode_calldata(calldata_of(self.params))
+        if decoded:
+            self.function_identifier = decoded.text_signature
+            self.input_data = decoded.named_args()
+
+        return decoded
 
     async def cancel(self):
         pass
@@ -208,7 +234,14 @@ class Transactions:
             tx_params["maxFeePerGas"] = max(current_max, target_max_fee)
 
         if "gas" not in tx_params or not int(tx_params["gas"]):
-            tx_params["gas"] = (await self.estimate_gas(tx_params=tx_params)).Wei
+            gas_cache = get_gas_cache()
+            gas = gas_cache.get(tx_params) if gas_cache else None
+            if gas is None:
+                gas = (await self.estimate_gas(tx_params=tx_params)).Wei
+                if gas_cache:
+                    gas_cache.put(tx_params, gas)
+
+            tx_params["gas"] = gas
 
         return tx_params
 
@@ -223,8 +256,29 @@ class Transactions:
             SignedTransaction: the signed transaction.
 
         """
+        executor = get_signing_executor()
+        if executor:
+            return await executor.sign_transaction(tx_params, self.client.account.key)
+
         return self.client.w3.eth.account.sign_transaction(transaction_dict=tx_params, private_key=self.client.account.key)
 
+    async def sign_transactions(self, txs: list[TxParams]) -> list[SignedTransaction]:
+        """
+        Sign many transactions with the client account. The parameters must be complete (see 'auto_add_params').
+
+        Args:
+            txs (List[TxParams]): parameters of the transactions.
+
+        Returns:
+            List[SignedTransaction]: the signed transactions in the same order.
+
+        """
+        executor = get_signing_executor()
+        if executor:
+            return await executor.sign_transactions(txs, self.client.account.key)
+
+        return [self.client.w3.eth.account.sign_transaction(transaction_dict=tx, private_key=self.client.account.key) for tx in txs]
+
     async def sign_and_send(self, tx_params: TxParams) -> Tx:
         """
         Sign and send a transaction. Additionally, add 'chainId', 'nonce', 'from', 'gasPrice' or
@@ -241,7 +295,12 @@ class Transactions:
 
         signed_tx = await self.sign_transaction(tx_params)
 
-        tx_hash = await self.client.w3.eth.send_raw_transaction(transaction=signed_tx.rawTransaction)
+        try:
+            tx_hash = await self.client.w3.eth.send_raw_transaction(transaction=signed_tx.rawTransaction)
+
+        except Exception:
+            invalidate_gas_estimate(tx_params)
+            raise
 
         return Tx(tx_hash=tx_hash, params=tx_params)
 
@@ -310,6 +369,31 @@ class Transactions:
         Returns:
             Tx: the instance of the sent transaction.
 
+        """
+        tx_params = await self.approve_params(token=token, spender=spender, amount=amount, gas_limit=gas_limit, nonce=nonce)
+        return await self.sign_and_send(tx_params=tx_params)
+
+    async def approve_params(
+        self,
+        token: types.Contract,
+        spender: types.Address,
+        amount: types.Amount | None = None,
+        gas_limit: types.GasLimit | None = None,
+        nonce: int | None = None,
+    ) -> TxParams:
+        """
+        Build the parameters of an approve transaction without sending it.
+
+        Args:
+            token (Contract): the contract address or instance of token to approve.
+            spender (Address): the spender address, contract address or instance.
+            amount (Optional[TokenAmount]): an amount to approve. (infinity)
+            gas_limit (Optional[GasLimit]): the gas limit in Wei. (parsed from the network)
+            nonce (Optional[int]): a nonce of the sender address. (get it using the 'nonce' function)
+
+        Returns:
+            TxParams: parameters of the transaction.
+
         """
         spender = AsyncWeb3.to_checksum_address(spender)
         contract_address, abi = await self.client.contracts.get_contract_attributes(token)
@@ -337,7 +421,7 @@ class Transactions:
                 gas_limit = TokenAmount(amount=gas_limit, wei=True)
             tx_params["gas"] = gas_limit.Wei
 
-        return await self.sign_and_send(tx_params=tx_params)
+        return tx_params
 
     async def get_decimals(self, contract: types.Contract) -> int:
         contract_address, abi = await self.client.contracts.get_contract_attributes(contract)
@@ -348,8 +432,32 @@ class Transactions:
         pass
 
     @staticmethod
-    async def decode_input_data():
-        pass
+    async def decode_input_data(
+        txs: dict[str, dict] | list[dict | str | bytes], fetch_missing: bool = False
+    ) -> dict[str, DecodedCall | None] | list[DecodedCall | None]:
+        """
+        Decode the input data of many transactions, e.g. the result of 'find_txs', with the local selector database.
+
+        Args:
+            txs (Union[Dict[str, dict], List[Union[dict, str, bytes]]]): transactions by hash, or a list of
+                transaction dicts ('input' or 'data') or calldata values.
+            fetch_missing (bool): look up the selectors unknown locally on 4byte.directory first,
+                otherwise no network requests are made. (False)
+
+        Returns:
+            Union[Dict[str, Optional[DecodedCall]], List[Optional[DecodedCall]]]: the decoded calls in the same
+                shape as 'txs', None for unknown functions.
+
+        """
+        items = list(txs.values()) if isinstance(txs, dict) else txs
+        if fetch_missing:
+            await fetch_missing_selectors(items)
+
+        decoded = await asyncio.to_thread(decode_calldata_batch, items)
+        if isinstance(txs, dict):
+            return dict(zip(txs, decoded))
+
+        return decoded
 
     @api_key_required
     async def find_txs(
@@ -413,61 +521,113 @@ class Transactions:
                 txs[tx.get("hash")] = tx
         return txs
 
-    async def get_transactions_by_address(self, address: str) -> list:
-        next_page_params = None
-        transactions = []
-        while True:
-            response = await self.client.network.api.functions.address.transactions(str(address), next_page_params)
-            next_page_params = response["next_page_params"]
-            transactions.append(response["items"])
-            if next_page_params is None:
-                return transactions
-
-    async def get_nft_ids_by_contract(self, owner: str, nft_address: str) -> list:
-        next_page_params = None
-        nfts = []
-        while True:
-            response = await self.client.network.api.functions.tokens.nft_instances(
-                address=str(nft_address), next_page_params=next_page_params
-            )
-            next_page_params = response["next_page_params"]
-            for item in response["items"]:
-                if item.get("owner"):
-                    if item["owner"].get("hash") == str(owner):
-                        print(item["id"])
-                        nfts.append(item["id"])
-            if next_page_params is None:
-                return nfts
-
-    async def get_nft_ids_by_owner(self, owner: str, nft_address: str) -> list:
-        next_page_params = None
-        nfts = []
-        while True:
-            response = await self.client.network.api.functions.address.nft(address=str(owner), next_page_params=next_page_params)
-            next_page_params = response["next_page_params"]
-            for item in response["items"]:
-                if item.get("token"):
-                    if item["token"].get("address") == str(nft_address):
-                        nfts.append(item["id"])
-            if next_page_params is None:
-                return nfts
-
-    async def get_my_nfts(self) -> dict:
-        next_page_params = None
+    async def iter_transactions_by_address(self, address: str, limit: int | None = None, max_pages: int | None = None) -> AsyncIterator:
+        """
+        Yield the transactions of an address from a Blockscout v2 API while the pages are downloaded.
+
+        At most two pages are held in memory, whatever the length of the history.
+
+        Args:
+            address (str): the address.
+            limit (Optional[int]): stop after this many transactions. (all)
+            max_pages (Optional[int]): the maximum number of pages to request. (all)
+
+        Returns:
+            AsyncIterator: the transactions, newest first.
+
+        """
+        found = 0
+        fetch = partial(self.client.network.api.functions.address.transactions, str(address))
+        async with aclosing(iter_pages(fetch, max_pages=max_pages)) as pages:
+            async for items in pages:
+                for item in items:
+                    yield item
+                    found += 1
+                    if limit and found >= limit:
+                        return
+
+    async def get_transactions_by_address(self, address: str, max_pages: int | None = None) -> list:
+        """
+        Get the transactions of an address from a Blockscout v2 API, page by page.
+        Every page is kept in memory: use iter_transactions_by_address for long histories.
+
+        Args:
+            address (str): the address.
+            max_pages (Optional[int]): the maximum number of pages to request. (all)
+
+        Returns:
+            List[List[Dict[str, Any]]]: the items of every page.
+
+        """
+        fetch = partial(self.client.network.api.functions.address.transactions, str(address))
+        async with aclosing(iter_pages(fetch, max_pages=max_pages)) as pages:
+            return [items async for items in pages]
+
+    async def iter_nft_ids_by_contract(self, owner: str, nft_address: str, limit: int | None = None) -> AsyncIterator:
+        """
+        Yield the ids of the 'nft_address' collection instances owned by 'owner' while the pages are downloaded.
+
+        Args:
+            owner (str): the owner address.
+            nft_address (str): the collection address.
+            limit (Optional[int]): stop after this many ids. (all)
+
+        Returns:
+            AsyncIterator: the token ids.
+
+        """
+        found = 0
+        fetch = partial(self.client.network.api.functions.tokens.nft_instances, str(nft_address))
+        async with aclosing(iter_pages(fetch)) as pages:
+            async for items in pages:
+                for item in items:
+                    if item.get("owner") and item["owner"].get("hash") == str(owner):
+                        yield item["id"]
+                        found += 1
+                        if limit and found >= limit:
+                            return
+
+    async def get_nft_ids_by_contract(self, owner: str, nft_address: str, limit: int | None = None) -> list:
+        return [nft_id async for nft_id in self.iter_nft_ids_by_contract(owner, nft_address, limit=limit)]
+
+    async def iter_nft_ids_by_owner(self, owner: str, nft_address: str, limit: int | None = None) -> AsyncIterator:
+        """
+        Yield the ids of the 'nft_address' tokens in the 'owner' NFT list while the pages are downloaded.
+
+        Args:
+            owner (str): the owner address.
+            nft_address (str): the collection address.
+            limit (Optional[int]): stop after this many ids. (all)
+
+        Returns:
+            AsyncIterator: the token ids.
+
+        """
+        found = 0
+        fetch = partial(self.client.network.api.functions.address.nft, str(owner))
+        async with aclosing(iter_pages(fetch)) as pages:
+            async for items in pages:
+                for item in items:
+                    if item.get("token") and item["token"].get("address") == str(nft_address):
+                        yield item["id"]
+                        found += 1
+                        if limit and found >= limit:
+                            return
+
+    async def get_nft_ids_by_owner(self, owner: str, nft_address: str, limit: int | None = None) -> list:
+        return [nft_id async for nft_id in self.iter_nft_ids_by_owner(owner, nft_address, limit=limit)]
+
+    async def get_my_nfts(self, max_pages: int | None = None) -> dict:
+        """
+        Get the NFTs of the client account by collection: {'contract1': [id1, id2], 'contract2': [id1]}.
+        """
         nfts = {}
-        # nfts = {'contract1': [id1, id2], 'contract2': [id1]}
-        while True:
-            response = await self.client.network.api.functions.address.nft_collections(
-                address=str(self.client.account.address), next_page_params=next_page_params
-            )
-            next_page_params = response["next_page_params"]
-            for item in response["items"]:
-                ids = []
-                if item.get("token") and item.get("amount"):
-                    if contract := item["token"].get("address"):
-                        if type(instances := item.get("token_instances")) == list:
-                            for instance in instances:
-                                ids.append(instance["id"])
-                nfts[contract] = ids
-            if next_page_params is None:
-                return nfts
+        fetch = partial(self.client.network.api.functions.address.nft_collections, str(self.client.account.address))
+        async with aclosing(iter_pages(fetch, max_pages=max_pages)) as pages:
+            async for items in pages:
+                for item in items:
+                    if item.get("token") and item.get("amount") and (contract := item["token"].get("address")):
+                        instances = item.get("token_instances")
+                        nfts[contract] = [instance["id"] for instance in instances] if isinstance(instances, list) else []
+
+        return nfts
@@ -1,6 +1,51 @@
+import time
+from functools import lru_cache, wraps
+
 from curl_cffi.requests import AsyncSession
+from fake_useragent import UserAgent
 
 from libs.eth_async import exceptions
+from libs.eth_async.instrumentation import RequestEvent, emit, host_of, rpc_method_of
+
+
+@lru_cache(maxsize=1)
+def _user_agent_source() -> UserAgent:
+    return UserAgent()
+
+
+def chrome_user_agent() -> str:
+    """
+    Get a random Chrome user agent. The UserAgent database is loaded once per process.
+
+    Returns:
+        str: the user agent.
+
+    """
+    return _user_agent_source().chrome
+
+
+def instrumented(verb: str):
+    """Report the request to the instrumentation hooks (the JSON-RPC method is used as the method name if present)."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(url: str, *args, **kwargs):
+            started = time.perf_counter()
+            error = None
+            try:
+                return await func(url, *args, **kwargs)
+
+            except Exception as err:
+                error = type(err).__name__
+                raise
+
+            finally:
+                method = rpc_method_of(kwargs.get("json")) or verb
+                emit(RequestEvent("http", host_of(url), method, time.perf_counter() - started, error))
+
+        return wrapper
+
+    return decorator
 
 
 def request_params(params: dict[str, ...] | None) -> dict[str, str | int | float] | None:
@@ -59,6 +104,7 @@ def aiohttp_params(params: dict[str, ...] | None) -> dict[str, str | int | float
     return new_params
 
 
+@instrumented("GET")
 async def async_get(url: str, headers: dict | None = None, **kwargs) -> dict | None:
     """
     Make a GET request and check if it was successful.
@@ -93,6 +139,7 @@ async def async_get(url: str, headers: dict | None = None, **kwargs) -> dict | N
         raise exceptions.HTTPException(response=response, status_code=status_code)
 
 
+@instrumented("PUT")
 async def async_put(url: str, headers: dict | None = None, **kwargs) -> dict | None:
     """
     Make a GET request and check if it was successful.
@@ -122,6 +169,7 @@ async def async_put(url: str, headers: dict | None = None, **kwargs) -> dict | N
         raise exceptions.HTTPException(response=response, status_code=status_code)
 
 
+@instrumented("POST")
 async def async_post(url: str, headers: dict | None = None, cookies_return=False, **kwargs) -> dict | None:
     """
     Make a POST request and check if it was successful.
@@ -12,15 +12,17 @@ from inquirer import themes
 from rich.console import Console
 
 from check_python import check_python_version
+from data.config import RPC_METRICS_FILE
 from data.constants import PROJECT_NAME
-from functions.activity import activity
+from data.settings import Settings
 from utils.create_files import create_files, reset_folder
-from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import db
-from utils.db_import_export_sync import Export, Import, Sync
-from utils.git_version import check_for_updates
+from utils.db_api.wallet_api import init_db
+from utils.diagnostics import LoopDiagnostics, diagnostics_enabled
+from utils.git_version import check_for_updates, check_for_updates_in_background, pop_available_update
 from utils.output import show_channel_info
 
+# Heavy subsystems (web3, task modules) are imported on first use to keep time-to-menu low.
+
 console = Console()
 
 
@@ -38,10 +40,31 @@ PROJECT_ACTIONS = [
     "Back",
 ]
 
-UTILS_ACTIONS = ["1. Reset files Folder", "Back"]
+UTILS_ACTIONS = [
+    "1. Reset files Folder",
+    "2. Rotate Encryption Password",
+    "3. Snapshot Database",
+    "4. Database Maintenance",
+    "5. Update Program",
+    "Back",
+]
+
+
+def show_available_update() -> None:
+    update = pop_available_update()
+    if not update:
+        return
+
+    console.print(
+        f"[bold yellow]Update available![/bold yellow] {update['date']} (commit {update['hash']})\n"
+        f"Commit message: {update['message']}\n"
+        + ("Use 'Utils -> 5. Update Program' to update" if update["is_git_repo"] else f"Download update: {update['url']}")
+    )
 
 
 async def choose_action():
+    show_available_update()
+
     cat_question = [
         inquirer.List(
             "category",
@@ -50,7 +73,8 @@ async def choose_action():
         )
     ]
 
-    answers = inquirer.prompt(cat_question, theme=themes.Default())
+    # prompts run in a worker thread so background tasks keep running while the menu is shown
+    answers = await asyncio.to_thread(inquirer.prompt, cat_question, theme=themes.Default())
     category = answers.get("category")
 
     if category == "Exit":
@@ -74,9 +98,15 @@ async def choose_action():
         )
     ]
 
-    act_answer = inquirer.prompt(act_question, theme=themes.Default())
+    act_answer = await asyncio.to_thread(inquirer.prompt, act_question, theme=themes.Default())
     action = act_answer["action"]
 
+    if category == "DB Actions" and action != "Back":
+        from utils.db_import_export_sync import Export, Import, Sync
+
+    if category == PROJECT_NAME and action != "Back":
+        from functions.activity import activity
+
     if action == "Import wallets to Database":
         console.print(f"[bold blue]Starting Import Wallets to DB[/bold blue]")
         await Import.wallets()
@@ -124,6 +154,28 @@ async def choose_action():
             reset_folder()
             console.print("Files folder success reset")
 
+    elif action == "2. Rotate Encryption Password":
+        console.print("This action will re-encrypt all private keys in the database with a new password.")
+        console.print("To generate a new salt as well, run: python -m utils.key_rotation --new-salt")
+        from utils.key_rotation import rotate_encryption_password
+
+        await rotate_encryption_password()
+
+    elif action == "3. Snapshot Database":
+        from utils.db_maintenance import snapshot
+
+        await snapshot(keep=Settings().db_snapshot_keep)
+
+    elif action == "4. Database Maintenance":
+        from utils.db_maintenance import enable_incremental, maintain
+
+        # nothing else writes the database while the menu action runs, so the one-time full VACUUM is safe here
+        await enable_incremental()
+        await maintain()
+
+    elif action == "5. Update Program":
+        await check_for_updates(repo_name=PROJECT_NAME, min_interval=0, force=True)
+
     elif action == "Exit":
         console.print(f"[bold red]Exiting {PROJECT_NAME}...[/bold red]")
         raise SystemExit(0)
@@ -134,12 +186,71 @@ async def choose_action():
 async def main():
     check_python_version()
     create_files()
+    init_db()
 
-    await check_for_updates(repo_name=PROJECT_NAME)
+    diagnostics = None
+    if diagnostics_enabled():
+        diagnostics = LoopDiagnostics.from_settings()
+        diagnostics.start()
 
-    db.ensure_model_columns(Wallet)
+    settings = Settings()
+    metrics_server = None
+    metrics_dump = None
+    if settings.rpc_metrics_port or settings.rpc_metrics_json_interval:
+        from libs.eth_async.instrumentation import add_source, dump_json_periodically, serve_prometheus
+        from utils.retry import get_retry_metrics, retry_prometheus_text
 
-    await choose_action()
+        add_source("retry", get_retry_metrics, retry_prometheus_text)
+
+        if settings.rpc_metrics_port:
+            metrics_server = await serve_prometheus(port=settings.rpc_metrics_port)
+
+        if settings.rpc_metrics_json_interval:
+            metrics_dump = asyncio.create_task(dump_json_periodically(RPC_METRICS_FILE, interval=settings.rpc_metrics_json_interval))
+
+    # the setting can be hot-reloaded mid-run, so shutdown checks what was started rather than re-reading it
+    executor_started = bool(settings.signing_executor)
+    if executor_started:
+        from libs.eth_async.signing import SigningExecutor, set_signing_executor
+
+        set_signing_executor(SigningExecutor(kind=settings.signing_executor, workers=settings.signing_workers or None))
+
+    if settings.gas_estimate_cache:
+        from libs.eth_async.gas_cache import GasEstimateCache, set_gas_cache
+
+        set_gas_cache(GasEstimateCache(multiplier=settings.gas_estimate_multiplier))
+
+    db_maintenance = None
+    if settings.db_maintenance_interval:
+        from utils.db_maintenance import enable_incremental, maintain_periodically
+
+        # the one-time full VACUUM, before any task writes the database
+        await enable_incremental()
+        db_maintenance = asyncio.create_task(maintain_periodically(settings.db_maintenance_interval, snapshot_keep=settings.db_snapshot_keep))
+
+    update_check = check_for_updates_in_background(repo_name=PROJECT_NAME)
+
+    try:
+        await choose_action()
+
+    finally:
+        update_check.cancel()
+        if metrics_dump:
+            metrics_dump.cancel()
+        if db_maintenance:
+            db_maintenance.cancel()
+        if metrics_server:
+            metrics_server.close()
+        if diagnostics:
+            diagnostics.stop()
+        if executor_started:
+            set_signing_executor(None)
+
+        from utils.db_api.async_wallet_api import adb
+        from utils.tg_sender import close_tg_dispatcher
+
+        await close_tg_dispatcher()
+        await adb.dispose()
 
 
 if __name__ == "__main__":
@@ -47,7 +47,8 @@ class PiClicker:
         self._session_id: Optional[str] = None
         self._STOP = object()
 
-    @async_retry()
+    # per wallet: one wallet's dead proxy or expired token must not block the others
+    @async_retry(breaker=lambda self: f"pi2-game:{self.wallet.id}")
     async def start_game_session(self):
         url = f"{self.BASE}/game-sessions/start"
         r = await self.session.post(url=url, headers=self.base_headers, timeout=20, close_session=False)
@@ -59,7 +60,7 @@ class PiClicker:
         except Exception as e:
             raise Exception(f"Start Session | {e} | {r.status_code} | {r.text}")
 
-    @async_retry()
+    @async_retry(breaker=lambda self: f"pi2-game:{self.wallet.id}")
     async def click(
         self,
         game_session_id: str,
@@ -9,7 +9,7 @@ from faker import Faker
 from libs.baseAsyncSession import FINGERPRINT_DEFAULT
 from utils.browser import Browser
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import set_fs_form_status
+from utils.db_api.async_wallet_api import set_fs_form_status
 from utils.retry import async_retry
 
 
@@ -79,7 +79,7 @@ class HSForm:
         email = fake_mail if fake_mail else mail_login
 
         if not await self.is_valid_email(email):
-            set_fs_form_status(self.wallet.id, HSFormStatus.BAD)
+            await set_fs_form_status(self.wallet.id, HSFormStatus.BAD)
             return f"Failed | fill_form | invalid email for HS Form: {email}"
 
         url = "https://forms-eu1.hsforms.com/submissions/v3/public/submit/formsnext/multipart/145965351/984a6e3c-89ca-4136-8085-c69a38b419fa/json?hs_static_app=forms-embed&hs_static_app_version=1.9861&X-HubSpot-Static-App-Info=forms-embed-1.9861"
@@ -148,10 +148,10 @@ class HSForm:
         try:
             data = r.json()
             if data["accepted"]:
-                set_fs_form_status(self.wallet.id, HSFormStatus.GOOD)
+                await set_fs_form_status(self.wallet.id, HSFormStatus.GOOD)
                 return f"Success | fill_form | HS Form filled successfully"
 
-            set_fs_form_status(self.wallet.id, HSFormStatus.BAD)
+            await set_fs_form_status(self.wallet.id, HSFormStatus.BAD)
             return f"Failed | fill_form | HS Form not filled, response: {data}"
         except Exception:
             return json.loads(r.text or "{}")
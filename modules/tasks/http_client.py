@@ -10,7 +10,7 @@ from data.settings import Settings
 from libs.fastset_async.client import FastSetClient
 from utils.browser import Browser
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import get_wallet_by_id, save_bearer_token, save_refresh_token
+from utils.db_api.async_wallet_api import get_wallet_by_id, save_bearer_token, save_refresh_token
 from utils.resource_manager import ResourceManager
 
 
@@ -74,7 +74,7 @@ class BaseHttpClient:
         retries: int = 5,
         allow_redirects: bool = True,
         use_refresh_token: bool = True,
-        close_session: bool = True,
+        close_session: bool = False,
     ) -> Tuple[bool, Union[Dict, str]]:
         """
         Perform HTTP request with automatic captcha and proxy error handling
@@ -89,6 +89,7 @@ class BaseHttpClient:
             timeout: Request timeout in seconds
             retries: Number of retry attempts
             allow_redirects: Follow redirects
+            close_session: Close the browser session after the request (it is reused by default)
 
         Returns:
             (bool, data): Success status and response data
@@ -135,11 +136,11 @@ class BaseHttpClient:
                 if resp.headers and "x-access-token" in resp.headers:
                     logger.debug(f"Get x-access-token {resp.headers['x-access-token']}")
                     self.base_headers["Authorization"] = resp.headers["x-access-token"]
-                    save_bearer_token(id=self.user.id, bearer_token=resp.headers["x-access-token"])
+                    await save_bearer_token(id=self.user.id, bearer_token=resp.headers["x-access-token"])
                 if resp.headers and "x-refresh-token" in resp.headers:
                     logger.debug(f"Get x-access-token {resp.headers['x-refresh-token']}")
                     self.base_headers["X-Refresh-Token"] = resp.headers["x-refresh-token"]
-                    save_refresh_token(id=self.user.id, refresh_token=resp.headers["x-refresh-token"])
+                    await save_refresh_token(id=self.user.id, refresh_token=resp.headers["x-refresh-token"])
 
                 if resp.status_code == 304:
                     json_resp = resp.json()
@@ -231,12 +232,13 @@ class BaseHttpClient:
                             if success:
                                 logger.info(f"{self.user} | {self.__module__} | proxy automatically replaced: {message}")
                                 # Update proxy for current client
-                                updated_user = get_wallet_by_id(id=self.user.id)
+                                updated_user = await get_wallet_by_id(id=self.user.id)
                                 if updated_user:
                                     self.user.proxy = updated_user.proxy
                                     # Reset error counter
                                     self.proxy_errors = 0
                                     # Update browser with new proxy
+                                    await self.browser.close()
                                     self.browser = Browser(self.user)
                             else:
                                 logger.error(f"{self.user} | {self.__module__} | failed to replace proxy: {message}")
@@ -0,0 +1,75 @@
+"""
+Encoders for OmniSet payloads.
+
+The withdraw intent is the ABI encoding of `(bytes32,(uint256,bytes,uint256)[])`:
+(transfer_hash, [(1, abi.encode(address token, address recipient), 0)]). Its layout is fixed,
+so the constant words are precomputed once and the result is a single join of them with the three
+variable words.
+"""
+
+WORD = 32
+
+# word index -> constant value, the rest are zeros
+_INTENT_CONSTANTS = {0: 0x20, 2: 0x40, 3: 1, 4: 0x20, 5: 1, 6: 0x60, 8: 0x40}
+# the transfer hash is word 1, the token and the recipient are the last two words (9 and 10)
+_HASH_WORD, _TOKEN_WORD = 1, 9
+
+WITHDRAW_INTENT_SIZE = 11 * WORD
+WITHDRAW_INTENT_TYPE = "(bytes32,(uint256,bytes,uint256)[])"
+
+_INTENT_WORDS = [_INTENT_CONSTANTS.get(i, 0).to_bytes(WORD, "big") for i in range(WITHDRAW_INTENT_SIZE // WORD)]
+# the words before the hash and between the hash and the token; addresses are left-padded with 12 zero bytes
+_INTENT_HEAD = b"".join(_INTENT_WORDS[:_HASH_WORD])
+_INTENT_MIDDLE = b"".join(_INTENT_WORDS[_HASH_WORD + 1 : _TOKEN_WORD])
+_ADDRESS_PAD = bytes(WORD - 20)
+
+
+def _hex_to_bytes(value: str | bytes, size: int) -> bytes:
+    if isinstance(value, str):
+        raw = bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+    else:
+        raw = bytes(value)
+
+    if len(raw) != size:
+        raise ValueError(f"Expected {size} bytes, got {len(raw)}")
+
+    return raw
+
+
+def encode_withdraw_intent(token: str | bytes, recipient: str | bytes, transfer_hash: str | bytes) -> bytes:
+    """
+    Encodes the withdraw intent claim data.
+
+    :param token: the EVM token address (hex or 20 bytes)
+    :param recipient: the EVM recipient address (hex or 20 bytes)
+    :param transfer_hash: the hash of the FastSet transfer claim (hex or 32 bytes)
+    :return bytes: the encoded claim data
+    """
+    return b"".join(
+        (
+            _INTENT_HEAD,
+            _hex_to_bytes(transfer_hash, 32),
+            _INTENT_MIDDLE,
+            _ADDRESS_PAD,
+            _hex_to_bytes(token, 20),
+            _ADDRESS_PAD,
+            _hex_to_bytes(recipient, 20),
+        )
+    )
+
+
+def certificate_signatures(certificate) -> list[tuple[bytes, bytes]]:
+    """
+    Gets the (r, s) signature pairs from the result of FastSet `transactions.submit`.
+
+    The signatures come as [r, s] pairs of byte lists; anything that is not a pair is skipped.
+    """
+    raw = getattr(certificate, "raw", None)
+    success = raw.get("Success", {}) if isinstance(raw, dict) else {}
+
+    signatures = []
+    for pair in success.get("signatures", []):
+        if isinstance(pair, list) and len(pair) == 2:
+            r_lst, s_lst = pair
+            signatures.append((bytes(r_lst), bytes(s_lst)))
+    return signatures
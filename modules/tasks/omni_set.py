@@ -8,15 +8,18 @@ from loguru import logger
 from web3.types import TxParams
 
 from libs.eth_async.client import Client
-from libs.eth_async.data.models import Network, Networks, RawContract, TokenAmount
+from libs.eth_async.data.models import Networks, RawContract, TokenAmount, chains
+from libs.eth_async.signing import get_signing_executor
 from libs.fastset_async.client import FastSetClient
 from libs.fastset_async.utils.account import set_to_bytes
 from utils.browser import Browser
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import db
-from utils.retry import async_retry
+from utils.db_api.async_wallet_api import update_wallet
+from utils.retry import FATAL_EXCEPTIONS, RetryPolicy, async_retry
+from utils.tx_journal import StepUnresolved, TxJournal
 
 from .http_client import BaseHttpClient
+from .omni_codec import certificate_signatures, encode_withdraw_intent
 
 bridge_abi = [
     {
@@ -42,7 +45,8 @@ class OmniClient(BaseHttpClient):
         self.browser = Browser(wallet=user)
         self.wallet = user
 
-    @async_retry()
+    # an unresolved transfer fails the same way on every attempt until it is resolved by hand
+    @async_retry(policy=RetryPolicy(fatal=(*FATAL_EXCEPTIONS, StepUnresolved)))
     async def bridge_to_evm(self, token_withdraw: str = "SET"):
         if token_withdraw == "SET":
             token_id = "0xfa575e7000000000000000000000000000000000000000000000000000000000"
@@ -51,202 +55,225 @@ class OmniClient(BaseHttpClient):
             token_id = "0x5ba616623179bd55a7733141255032f8e1328760021be96166d3bc145f21e63a"
             evm_token_address = "0xfff9976782d46cc05630d1f6ebab18b2324d6b14"
 
-        id_arr = list(bytes.fromhex(token_id.removeprefix("0x")))
-        balance = await self.fastset_client.wallet.get_balance(token_balances_filter=[id_arr])
-        set_balance = await self.fastset_client.wallet.get_balance(
-            token_balances_filter=[
-                list(bytes.fromhex("0xfa575e7000000000000000000000000000000000000000000000000000000000".removeprefix("0x")))
-            ]
-        )
-        if set_balance < 2:
-            await self.fastset_client.wallet.faucet_drip(recipient_set=self.fastset_client.account.address, amount=1000)
-            logger.success(f"{self.user} success get faucet drip 1000 SET")
-            await asyncio.sleep(random.randint(10, 30))
-            balance = await self.fastset_client.wallet.get_balance(token_balances_filter=[id_arr])
-            cooldown_until = datetime.now() + timedelta(minutes=1440)
-            self.user.next_faucet_time = cooldown_until
-            db.commit()
-            if not balance:
-                raise Exception(f"{self.user} No {token_withdraw} balance on FastSet after faucet drip")
-
-        if float(TokenAmount(balance, wei=True).Ether) < 0.001 and token_withdraw == "ETH":
-            await self.bridge_to_fastet(token_deposit="ETH")
-            await asyncio.sleep(random.randint(10, 30))
+        # FastSet transfer, intent claim and relay are journaled, so a retry or a restart continues the same run
+        journal = await TxJournal.open(wallet=self.wallet, flow=f"bridge_to_evm:{token_withdraw}")
+        state = journal.state
+
+        if not state:
+            id_arr = list(bytes.fromhex(token_id.removeprefix("0x")))
             balance = await self.fastset_client.wallet.get_balance(token_balances_filter=[id_arr])
-            if not balance:
-                raise Exception(f"{self.user} No {token_withdraw} balance on FastSet after try deposit")
+            set_balance = await self.fastset_client.wallet.get_balance(
+                token_balances_filter=[
+                    list(bytes.fromhex("0xfa575e7000000000000000000000000000000000000000000000000000000000".removeprefix("0x")))
+                ]
+            )
+            if set_balance < 2:
+                await self.fastset_client.wallet.faucet_drip(recipient_set=self.fastset_client.account.address, amount=1000)
+                logger.success(f"{self.user} success get faucet drip 1000 SET")
+                await asyncio.sleep(random.randint(10, 30))
+                balance = await self.fastset_client.wallet.get_balance(token_balances_filter=[id_arr])
+                cooldown_until = datetime.now() + timedelta(minutes=1440)
+                await update_wallet(self.user.id, next_faucet_time=cooldown_until)
+                if not balance:
+                    raise Exception(f"{self.user} No {token_withdraw} balance on FastSet after faucet drip")
 
-        if token_withdraw == "SET":
-            balance = int(TokenAmount(amount=balance, wei=False).Ether)
-            withdraw_amount = str(random.randint(1, int(int(balance) / 2) if int(balance) < 1000 else 500))
-            withdraw_for_log = withdraw_amount
-        else:
-            balance = float(TokenAmount(amount=balance, wei=True).Ether)
-            withdraw_amount = round(random.uniform(0.0001, balance if balance < 0.001 else 0.001), 5)
-            withdraw_for_log = withdraw_amount
-            withdraw_amount = TokenAmount(amount=withdraw_amount).Wei
-            withdraw_amount = hex(withdraw_amount)
+            if float(TokenAmount(balance, wei=True).Ether) < 0.001 and token_withdraw == "ETH":
+                await self.bridge_to_fastet(token_deposit="ETH")
+                await asyncio.sleep(random.randint(10, 30))
+                balance = await self.fastset_client.wallet.get_balance(token_balances_filter=[id_arr])
+                if not balance:
+                    raise Exception(f"{self.user} No {token_withdraw} balance on FastSet after try deposit")
+
+            if token_withdraw == "SET":
+                balance = int(TokenAmount(amount=balance, wei=False).Ether)
+                withdraw_amount = str(random.randint(1, int(int(balance) / 2) if int(balance) < 1000 else 500))
+                withdraw_for_log = withdraw_amount
+            else:
+                balance = float(TokenAmount(amount=balance, wei=True).Ether)
+                withdraw_amount = round(random.uniform(0.0001, balance if balance < 0.001 else 0.001), 5)
+                withdraw_for_log = withdraw_amount
+                withdraw_amount = TokenAmount(amount=withdraw_amount).Wei
+                withdraw_amount = hex(withdraw_amount)
+
+            state = await journal.save_state(withdraw_amount=withdraw_amount, withdraw_for_log=withdraw_for_log)
+
+        withdraw_amount = state["withdraw_amount"]
+        withdraw_for_log = state["withdraw_for_log"]
 
         logger.info(f"{self.user} | Start Bridge {withdraw_for_log} {token_withdraw} from FastSet to Sepolia")
 
-        recipient = "set1la44katfwdhv9tqvskjrjc5cmy7ufjwvufwz4suuvazua5dtf4js08rgrz"
-        tx_transfer = await self.fastset_client.transactions.build_token_transfer(
-            recipient_address_set=recipient,
-            amount_hex=withdraw_amount,
-            token_id=bytes.fromhex(token_id.removeprefix("0x")),
-        )
-        signed_transfer = await self.fastset_client.transactions.sign(tx_transfer)
-        transfer_cert = await self.fastset_client.transactions.submit(signed_transfer)
-        raw_result = transfer_cert.raw if isinstance(transfer_cert, object) else {}
-        success_obj = raw_result.get("Success", {}) if isinstance(raw_result, dict) else {}
-        sig_pairs_lists = success_obj.get("signatures", [])
-        signatures_transfer = []
-        for pair in sig_pairs_lists:
-            if isinstance(pair, list) and len(pair) == 2:
-                r_lst, s_lst = pair
-                r_bytes = bytes(r_lst)
-                s_bytes = bytes(s_lst)
-                signatures_transfer.append((r_bytes, s_bytes))
-        resp_transfer = await self.fastset_client.transactions.evm_sign_certificate(
-            signed_transfer,
-            signatures=signatures_transfer,
-        )
-        transfer_hash = self.ethereum_signed_message_hash(transaction=bytes(resp_transfer["transaction"]))
-        encoded_transfer_claim = bytes(resp_transfer.get("transaction", []))
-        transfer_proof = resp_transfer.get("signature", "")
-        transfer_claim_id = self.fastset_client.transactions.compute_claim_id(encoded_transfer_claim)
+        async def transfer():
+            recipient = "set1la44katfwdhv9tqvskjrjc5cmy7ufjwvufwz4suuvazua5dtf4js08rgrz"
+            tx_transfer = await self.fastset_client.transactions.build_token_transfer(
+                recipient_address_set=recipient,
+                amount_hex=withdraw_amount,
+                token_id=bytes.fromhex(token_id.removeprefix("0x")),
+            )
+            signed_transfer = await self.fastset_client.transactions.sign(tx_transfer)
+            transfer_cert = await self.fastset_client.transactions.submit(signed_transfer)
+            resp_transfer = await self.fastset_client.transactions.evm_sign_certificate(
+                signed_transfer,
+                signatures=certificate_signatures(transfer_cert),
+            )
+            encoded_transfer_claim = bytes(resp_transfer.get("transaction", []))
+            return {
+                "transfer_hash": await self.ethereum_signed_message_hash(transaction=bytes(resp_transfer["transaction"])),
+                "encoded_transfer_claim": encoded_transfer_claim,
+                "transfer_proof": resp_transfer.get("signature", ""),
+                "transfer_claim_id": self.fastset_client.transactions.compute_claim_id(encoded_transfer_claim),
+            }
+
+        async def token_balance():
+            return int(await self.fastset_client.wallet.get_balance(token_balances_filter=[list(bytes.fromhex(token_id.removeprefix("0x")))]))
+
+        async def transferred(balance_before):
+            if balance_before is None:
+                raise ValueError("no balance was recorded before the transfer")
+
+            # only the exact outcomes are trusted: a deposit or another spend in between makes the balance ambiguous
+            balance = await token_balance()
+            if balance == balance_before:
+                return False
+            if balance == balance_before - int(withdraw_amount, 16):
+                return True
+            raise ValueError(f"balance changed from {balance_before} to {balance}, not by the transfer amount")
+
+        # re-sending a transfer that already went through would spend the amount twice
+        transfer_result = await journal.run_step("transfer", transfer, checkpoint=token_balance, executed=transferred)
 
         external_address = self.evm_client.account.address
 
-        claim_data_hex = self.build_withdraw_intent_varvar(
-            token=evm_token_address, addr=self.evm_client.account.address, transfer_hash=transfer_hash
-        )
+        async def intent():
+            claim_data = encode_withdraw_intent(
+                token=evm_token_address, recipient=self.evm_client.account.address, transfer_hash=transfer_result["transfer_hash"]
+            )
 
-        tx_claim = await self.fastset_client.transactions.build_external_claim(
-            claim_data=bytes.fromhex(claim_data_hex[2:]),
-            verifier_committee=[],
-            verifier_quorum=0,
-            signatures=[],
-        )
-        signed_claim = await self.fastset_client.transactions.sign(tx_claim)
-        claim_cert = await self.fastset_client.transactions.submit(signed_claim)
-        raw_intent = claim_cert.raw if isinstance(claim_cert, object) else {}
-        success_intent = raw_intent.get("Success", {}) if isinstance(raw_intent, dict) else {}
-        sig_pairs_intent = success_intent.get("signatures", [])
-        signatures_intent: list[tuple[bytes, bytes]] = []
-        for pair in sig_pairs_intent:
-            if isinstance(pair, list) and len(pair) == 2:
-                r_lst, s_lst = pair
-                r_bytes = bytes(r_lst)
-                s_bytes = bytes(s_lst)
-                signatures_intent.append((r_bytes, s_bytes))
-        resp_intent = await self.fastset_client.transactions.evm_sign_certificate(
-            signed_claim,
-            signatures=signatures_intent,
-        )
-        encoded_intent_claim = bytes(resp_intent.get("transaction", []))
-        intent_proof = resp_intent.get("signature", "")
-        intent_claim_id = self.fastset_client.transactions.compute_claim_id(encoded_intent_claim)
-
-        relay_url = "https://omniset.fastset.xyz/ethereum-sepolia-relayer/relay"
-        relay_resp = await self.fastset_client.transactions.relay_transfer(
-            encoded_transfer_claim=encoded_transfer_claim,
-            transfer_proof_hex=transfer_proof,
-            transfer_claim_id_hex=transfer_claim_id,
-            fastset_address_set=self.fastset_client.account.address,
-            external_address_hex=external_address,
-            encoded_intent_claim=encoded_intent_claim,
-            intent_proof_hex=intent_proof,
-            intent_claim_id_hex=intent_claim_id,
-            external_token_address_hex=evm_token_address,
-            relay_url=relay_url,
-        )
-        if isinstance(relay_resp, dict) and relay_resp.get("success"):
-            logger.success(f"{self.user} bridge {withdraw_for_log} {token_withdraw} from FastSet to Sepolia confirmed")
-            return relay_resp
-        logger.error(f"{self.user} relay failed: {relay_resp}")
-        raise Exception(f"{self.user} Relay Bridge failed")
+            tx_claim = await self.fastset_client.transactions.build_external_claim(
+                claim_data=claim_data,
+                verifier_committee=[],
+                verifier_quorum=0,
+                signatures=[],
+            )
+            signed_claim = await self.fastset_client.transactions.sign(tx_claim)
+            claim_cert = await self.fastset_client.transactions.submit(signed_claim)
+            resp_intent = await self.fastset_client.transactions.evm_sign_certificate(
+                signed_claim,
+                signatures=certificate_signatures(claim_cert),
+            )
+            encoded_intent_claim = bytes(resp_intent.get("transaction", []))
+            return {
+                "encoded_intent_claim": encoded_intent_claim,
+                "intent_proof": resp_intent.get("signature", ""),
+                "intent_claim_id": self.fastset_client.transactions.compute_claim_id(encoded_intent_claim),
+            }
+
+        intent_result = await journal.run_step("intent", intent, idempotent=True)
+
+        async def relay():
+            relay_url = "https://omniset.fastset.xyz/ethereum-sepolia-relayer/relay"
+            relay_resp = await self.fastset_client.transactions.relay_transfer(
+                encoded_transfer_claim=transfer_result["encoded_transfer_claim"],
+                transfer_proof_hex=transfer_result["transfer_proof"],
+                transfer_claim_id_hex=transfer_result["transfer_claim_id"],
+                fastset_address_set=self.fastset_client.account.address,
+                external_address_hex=external_address,
+                encoded_intent_claim=intent_result["encoded_intent_claim"],
+                intent_proof_hex=intent_result["intent_proof"],
+                intent_claim_id_hex=intent_result["intent_claim_id"],
+                external_token_address_hex=evm_token_address,
+                relay_url=relay_url,
+            )
+            if isinstance(relay_resp, dict) and relay_resp.get("success"):
+                return relay_resp
+            logger.error(f"{self.user} relay failed: {relay_resp}")
+            raise Exception(f"{self.user} Relay Bridge failed")
+
+        relay_resp = await journal.run_step("relay", relay, idempotent=True)
+        await journal.complete()
+        logger.success(f"{self.user} bridge {withdraw_for_log} {token_withdraw} from FastSet to Sepolia confirmed")
+        return relay_resp
 
-    def ethereum_signed_message_hash(self, transaction: bytes) -> str:
+    async def ethereum_signed_message_hash(self, transaction: bytes) -> str:
         prefix = b"\x19Ethereum Signed Message:\n" + str(len(transaction)).encode()
         message = prefix + transaction
+        executor = get_signing_executor()
+        if executor:
+            return "0x" + (await executor.keccak(message)).hex()
         return "0x" + keccak(message).hex()
 
     def build_withdraw_intent_varvar(self, token, addr, transfer_hash):
-        template = (
-            "0000000000000000000000000000000000000000000000000000000000000020"
-            "{type_hash}"
-            "0000000000000000000000000000000000000000000000000000000000000040"
-            "0000000000000000000000000000000000000000000000000000000000000001"
-            "0000000000000000000000000000000000000000000000000000000000000020"
-            "0000000000000000000000000000000000000000000000000000000000000001"
-            "0000000000000000000000000000000000000000000000000000000000000060"
-            "0000000000000000000000000000000000000000000000000000000000000000"
-            "0000000000000000000000000000000000000000000000000000000000000040"
-            "000000000000000000000000{token}"
-            "000000000000000000000000{addr}"
-        )
-
-        token_clean = token.lower().replace("0x", "").rjust(40, "0")
-        addr_clean = addr.lower().replace("0x", "").rjust(40, "0")
-        type_hash_clean = transfer_hash.lower().replace("0x", "").rjust(64, "0")
-
-        final = template.format(type_hash=type_hash_clean, token=token_clean, addr=addr_clean)
-        return "0x" + final
+        return "0x" + encode_withdraw_intent(token=token, recipient=addr, transfer_hash=transfer_hash).hex()
 
     @async_retry()
     async def bridge_to_fastet(self, token_deposit: str = "ETH"):
-        balance = await self.evm_client.wallet.balance()
-        if balance.Ether < 0.001:
-            bridge = await self.gas_zip_bridge()
-            if not bridge:
-                logger.warning(f"Failed {self.user} Balance Sepolia < 0.001 ETH and can't bridge to Sepolia Network!")
-                return False
+        # approve and deposit are journaled, so a retry or a restart continues the same run instead of sending them again
+        journal = await TxJournal.open(wallet=self.wallet, flow=f"bridge_to_fastet:{token_deposit}")
+        state = journal.state
+
+        if not state:
             balance = await self.evm_client.wallet.balance()
-        if token_deposit == "ETH":
-            token = self.evm_client.w3.to_checksum_address("0x0000000000000000000000000000000000000000")
-            balance = float(balance.Ether)
-            amount = round(random.uniform(0.0001, balance / 2 if balance > 0.001 else 0.001), 3)
-            amount = TokenAmount(amount=amount)
-            data_amount = amount.Wei
-        else:
-            token = self.evm_client.w3.to_checksum_address("0xC6d2Bd6437655FBc6689Bfc987E09846aC4367Ed")
-            balance = await self.evm_client.wallet.balance(token=token)
-            if balance.Ether < 2:
-                await self.bridge_to_evm(token_withdraw="SET")
-                await asyncio.sleep(10, 30)
+            if balance.Ether < 0.001:
+                bridge = await self.gas_zip_bridge()
+                if not bridge:
+                    logger.warning(f"Failed {self.user} Balance Sepolia < 0.001 ETH and can't bridge to Sepolia Network!")
+                    return False
+                balance = await self.evm_client.wallet.balance()
+            if token_deposit == "ETH":
+                token = self.evm_client.w3.to_checksum_address("0x0000000000000000000000000000000000000000")
+                balance = float(balance.Ether)
+                amount = round(random.uniform(0.0001, balance / 2 if balance > 0.001 else 0.001), 3)
+                amount = TokenAmount(amount=amount)
+                data_amount = amount.Wei
+            else:
+                token = self.evm_client.w3.to_checksum_address("0xC6d2Bd6437655FBc6689Bfc987E09846aC4367Ed")
                 balance = await self.evm_client.wallet.balance(token=token)
-                if not balance:
-                    raise Exception(f"{self.user} No {token_deposit} balance on Sepolia after withdraw from Fastet")
-            balance = int(balance.Ether)
-            amount = random.randint(int(balance / 2), balance)
-            amount = TokenAmount(amount=amount)
-            data_amount = int(amount.Ether)
-            approve = await self.evm_client.transactions.approve(token=token, spender=BRIDGE_CONTRACT.address, amount=amount)
-            receipt = await approve.wait_for_receipt(client=self.evm_client, timeout=300)
+                if balance.Ether < 2:
+                    await self.bridge_to_evm(token_withdraw="SET")
+                    await asyncio.sleep(10, 30)
+                    balance = await self.evm_client.wallet.balance(token=token)
+                    if not balance:
+                        raise Exception(f"{self.user} No {token_deposit} balance on Sepolia after withdraw from Fastet")
+                balance = int(balance.Ether)
+                amount = random.randint(int(balance / 2), balance)
+                amount = TokenAmount(amount=amount)
+                data_amount = int(amount.Ether)
+
+            state = await journal.save_state(token=token, amount_wei=amount.Wei, data_amount=data_amount)
+
+        token = state["token"]
+        amount = TokenAmount(amount=state["amount_wei"], wei=True)
+        data_amount = state["data_amount"]
+
+        if token_deposit != "ETH":
+
+            async def approve_params():
+                return await self.evm_client.transactions.approve_params(token=token, spender=BRIDGE_CONTRACT.address, amount=amount)
+
+            await journal.send("approve", self.evm_client, approve_params)
 
         logger.info(f"{self.user} | Start Bridge {amount.Ether} {token_deposit} from Sepolia to FastSet")
         c = await self.evm_client.contracts.get(contract_address=BRIDGE_CONTRACT)
         data = c.encode_abi("deposit", args=[token, data_amount, set_to_bytes(addr=self.fastset_client.account.address)])
 
-        tx = await self.evm_client.transactions.sign_and_send(
+        receipt = await journal.send(
+            "deposit",
+            self.evm_client,
             TxParams(
                 to=c.address,
                 data=data,
                 value=amount.Wei if token_deposit == "ETH" else 0,
-            )
+            ),
         )
 
-        await asyncio.sleep(random.randint(2, 4))
-        receipt = await tx.wait_for_receipt(client=self.evm_client, timeout=300)
-
         if receipt and receipt["status"] == 1:
+            await journal.complete()
             logger.success(f"{self.user} success Bridge {amount.Ether} {token_deposit} from Sepolia to FastSet")
             return f"Success Bridge {amount.Ether} {token_deposit} from Sepolia to FastSet"
 
         return Exception(f"Failed to Bridge {amount.Ether} {token_deposit} from Sepolia to FastSet Network")
 
-    @async_retry()
+    # per wallet: an empty balance or a dead proxy of one wallet must not block the others
+    @async_retry(breaker=lambda self: f"gas.zip:{self.wallet.id}")
     async def gas_zip_bridge(self):
         logger.info(f"{self.user} start Gas Zip bridge to Sepolia ETH")
         client = await self.choose_available_client()
@@ -276,15 +303,14 @@ class OmniClient(BaseHttpClient):
         return await self.wait_deposit(start_balance=balance)
 
     async def choose_available_client(self):
-        network_values = [value for key, value in Networks.__dict__.items() if isinstance(value, Network)]
-        skip_network = [Networks.Ethereum, Networks.Sepolia]
+        network_values = chains.filter(coin_symbol="ETH", exclude=(Networks.Ethereum, Networks.Sepolia))
         random.shuffle(network_values)
         for network in network_values:
             try:
-                if network in skip_network or network.coin_symbol != "ETH":
-                    continue
                 logger.debug(network.name)
-                client = Client(private_key=self.evm_client.account._private_key.hex(), network=network, proxy=self.evm_client.proxy)
+                client = await Client.create(
+                    private_key=self.evm_client.account._private_key.hex(), network=network, proxy=self.evm_client.proxy
+                )
                 balance = await client.wallet.balance()
                 if float(balance.Ether) > 0.00001:
                     return client
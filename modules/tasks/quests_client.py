@@ -6,7 +6,7 @@ from uuid import uuid4
 from loguru import logger
 
 from data.settings import Settings
-from utils.db_api.wallet_api import mark_discord_as_bad, update_discord_connect, update_points_and_top
+from utils.db_api.async_wallet_api import mark_discord_as_bad, update_discord_connect, update_points_and_top
 from utils.discord.discord import DiscordOAuth
 from utils.resource_manager import ResourceManager
 from utils.twitter.twitter_client import TwitterClient, TwitterStatuses
@@ -182,7 +182,7 @@ class QuestsClient(BaseHttpClient):
             points = int(float(data["totalPoints"]))
             rank = data["rank"]
             logger.success(f"{self.user} user have {points} points and {rank} Rank")
-            return update_points_and_top(id=self.user.id, points=int(points), top=int(rank))
+            return await update_points_and_top(id=self.user.id, points=int(points), top=int(rank))
         return False
 
     async def do_task_request(self, task_guid: str, extra_arguments: list = []):
@@ -355,7 +355,7 @@ class QuestsClient(BaseHttpClient):
         check_connect = await self.check_media_connect(media="discord")
         if check_connect:
             logger.debug(f"{self.user} already have connected discord")
-            update_discord_connect(id=self.user.id)
+            await update_discord_connect(id=self.user.id)
             return True
         if not self.user.discord_token or self.user.discord_status != "OK":
             logger.debug(f"{self.user} can't connect discord. Not discord token or discord status not OK")
@@ -368,13 +368,13 @@ class QuestsClient(BaseHttpClient):
         try:
             oauth_url, _ = await discord.start_oauth2(oauth_url=str(link))
         except Exception:
-            mark_discord_as_bad(id=self.user.id)
+            await mark_discord_as_bad(id=self.user.id)
             return False
         _ = await self.browser.get(url=oauth_url)
         check_connect = await self.check_media_connect(media="discord")
         if check_connect:
             logger.success(f"{self.user} success connect discord to site")
-            update_discord_connect(id=self.user.id)
+            await update_discord_connect(id=self.user.id)
             await asyncio.sleep(5)
             return True
         else:
@@ -7,7 +7,7 @@ from loguru import logger
 
 from libs.fastset_async.client import FastSetClient
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import db
+from utils.db_api.async_wallet_api import update_wallet
 from utils.logs_decorator import controller_log
 
 from .authorization import AuthClient
@@ -31,8 +31,7 @@ class WalletClient:
     @controller_log("Connect Wallet")
     async def connect_wallet(self):
         if not self.wallet.private_key:
-            self.wallet.private_key = self.fastset_client.account.private_key_hex()
-            db.commit()
+            await update_wallet(self.wallet.id, private_key=self.fastset_client.account.private_key_hex())
 
         await self.auth_client.login()
 
@@ -64,7 +63,7 @@ class WalletClient:
             await self.fastset_client.wallet.faucet_drip(recipient_set=self.fastset_client.account.address, amount=1000)
 
             cooldown_until = datetime.now() + timedelta(minutes=1440)
-            self.wallet.next_faucet_time = cooldown_until
+            await update_wallet(self.wallet.id, next_faucet_time=cooldown_until)
 
             return f"Success Faucet 1000 SET"
 
@@ -75,8 +74,7 @@ class WalletClient:
             if match:
                 minutes = int(match.group(1))
                 cooldown_until = datetime.now() + timedelta(minutes=minutes)
-                self.wallet.next_faucet_time = cooldown_until
-                db.commit()
+                await update_wallet(self.wallet.id, next_faucet_time=cooldown_until)
 
                 return f"Failed, faucet availible on {cooldown_until}"
             else:
@@ -0,0 +1,62 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from eth_abi import decode, encode
+from eth_utils import to_checksum_address
+
+from modules.tasks.omni_codec import WITHDRAW_INTENT_SIZE, WITHDRAW_INTENT_TYPE, certificate_signatures, encode_withdraw_intent
+
+# the Sepolia SET token used by bridge_to_evm
+TOKEN = "0xC6d2Bd6437655FBc6689Bfc987E09846aC4367Ed"
+
+
+def eth_abi_intent(token: str, recipient: str, transfer_hash: bytes) -> bytes:
+    payload = encode(["address", "address"], [token, recipient])
+    return encode([WITHDRAW_INTENT_TYPE], [(transfer_hash, [(1, payload, 0)])])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_withdraw_intent_matches_eth_abi(seed):
+    recipient = to_checksum_address(os.urandom(20))
+    transfer_hash = os.urandom(32)
+
+    expected = eth_abi_intent(TOKEN, recipient, transfer_hash)
+    assert len(expected) == WITHDRAW_INTENT_SIZE
+
+    assert encode_withdraw_intent(TOKEN, recipient, "0x" + transfer_hash.hex()) == expected
+    assert encode_withdraw_intent(TOKEN.lower(), recipient.lower(), transfer_hash.hex()) == expected
+    assert encode_withdraw_intent(bytes.fromhex(TOKEN[2:]), bytes.fromhex(recipient[2:]), transfer_hash) == expected
+
+
+def test_withdraw_intent_decodes_back():
+    recipient = to_checksum_address(os.urandom(20))
+    transfer_hash = os.urandom(32)
+
+    ((decoded_hash, [(kind, payload, value)]),) = decode([WITHDRAW_INTENT_TYPE], encode_withdraw_intent(TOKEN, recipient, transfer_hash))
+
+    assert (decoded_hash, kind, value) == (transfer_hash, 1, 0)
+    assert decode(["address", "address"], payload) == (TOKEN.lower(), recipient.lower())
+
+
+@pytest.mark.parametrize(("token", "recipient", "transfer_hash"), [(TOKEN[:-2], TOKEN, bytes(32)), (TOKEN, TOKEN, bytes(31))])
+def test_withdraw_intent_rejects_wrong_sizes(token, recipient, transfer_hash):
+    with pytest.raises(ValueError):
+        encode_withdraw_intent(token, recipient, transfer_hash)
+
+
+def test_certificate_signatures_match_eth_abi():
+    # FastSet returns each signature as a pair of byte lists
+    pairs = [(os.urandom(32), os.urandom(32)) for _ in range(4)]
+    certificate = SimpleNamespace(raw={"Success": {"signatures": [[list(r), list(s)] for r, s in pairs] + [[list(os.urandom(32))], "bad"]}})
+
+    signatures = certificate_signatures(certificate)
+
+    assert signatures == pairs
+    (decoded,) = decode(["(bytes32,bytes32)[]"], encode(["(bytes32,bytes32)[]"], [signatures]))
+    assert list(decoded) == pairs
+
+
+@pytest.mark.parametrize("raw", [None, {}, {"Failure": "x"}, {"Success": {}}])
+def test_certificate_signatures_without_success(raw):
+    assert certificate_signatures(SimpleNamespace(raw=raw)) == []
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from typing import Optional
 
 from libs.baseAsyncSession import BaseAsyncSession
@@ -5,50 +7,79 @@ from utils.db_api.models import Wallet
 
 
 class Browser:
+    """
+    HTTP client bound to a wallet proxy.
+
+    The session is created on the first request and reused by the following ones, so connections and
+    TLS sessions are kept. It is closed on `__aexit__`/`close()`, after `idle_timeout` seconds without
+    requests, or after a request made with `close_session=True`. At most `max_concurrency` requests run at once.
+    """
+
     __module__ = "Browser"
 
-    def __init__(self, wallet: Optional[Wallet] = None):
+    def __init__(self, wallet: Optional[Wallet] = None, idle_timeout: float = 60, max_concurrency: int = 10):
         self.wallet: Optional[Wallet] = wallet
         self.async_session: Optional[BaseAsyncSession] = None
+        self.idle_timeout = idle_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._last_used = 0.0
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
     async def _ensure_session(self):
         if self.async_session is None:
             proxy = self.wallet.proxy if self.wallet else None
             self.async_session = BaseAsyncSession(proxy=proxy)
 
+        if self.idle_timeout and (self._reaper is None or self._reaper.done()):
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _reap_idle(self):
+        while self.async_session is not None:
+            idle_for = time.monotonic() - self._last_used
+            if self._in_flight == 0 and idle_for >= self.idle_timeout:
+                await self._close_session()
+                return
+
+            await asyncio.sleep(max(self.idle_timeout - idle_for, 1))
+
     async def _close_session(self):
         if self.async_session:
-            await self.async_session.close()
-            self.async_session = None
-
-    async def get(self, close_session: bool = True, **kwargs):
-        await self._ensure_session()
-        try:
-            return await self.async_session.get(**kwargs)
-        finally:
-            if close_session:
-                await self._close_session()
+            session, self.async_session = self.async_session, None
+            await session.close()
 
-    async def post(self, close_session: bool = True, **kwargs):
-        await self._ensure_session()
-        try:
-            return await self.async_session.post(**kwargs)
-        finally:
-            if close_session:
-                await self._close_session()
+    async def close(self):
+        if self._reaper and self._reaper is not asyncio.current_task():
+            self._reaper.cancel()
+        self._reaper = None
+        await self._close_session()
 
-    async def put(self, close_session: bool = True, **kwargs):
-        await self._ensure_session()
-        try:
-            return await self.async_session.put(**kwargs)
-        finally:
-            if close_session:
-                await self._close_session()
+    async def _request(self, method: str, close_session: bool, **kwargs):
+        async with self._semaphore:
+            await self._ensure_session()
+            self._in_flight += 1
+            try:
+                return await getattr(self.async_session, method)(**kwargs)
+            finally:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+                if close_session and self._in_flight == 0:
+                    await self.close()
 
-    async def delete(self, close_session: bool = True, **kwargs):
-        await self._ensure_session()
-        try:
-            return await self.async_session.delete(**kwargs)
-        finally:
-            if close_session:
-                await self._close_session()
+    async def get(self, close_session: bool = False, **kwargs):
+        return await self._request("get", close_session, **kwargs)
+
+    async def post(self, close_session: bool = False, **kwargs):
+        return await self._request("post", close_session, **kwargs)
+
+    async def put(self, close_session: bool = False, **kwargs):
+        return await self._request("put", close_session, **kwargs)
+
+    async def delete(self, close_session: bool = False, **kwargs):
+        return await self._request("delete", close_session, **kwargs)
@@ -95,4 +95,5 @@ def reset_folder():
     create_files()
 
 
-create_files()
+if __name__ == "__main__":
+    create_files()
@@ -0,0 +1,105 @@
+"""
+Async equivalents of the wallet_api helpers for code running on the event loop.
+
+Queries and writes go through an aiosqlite engine, so SQLite locks and fsyncs never block the loop.
+Writes are single UPDATE statements by id. The new values are also set on the Wallet loaded in the
+sync session (without marking it dirty), so objects shared with the sync facade stay current.
+The sync wallet_api remains for the CLI import/export paths.
+"""
+
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from data.config import DB_BUSY_TIMEOUT, WALLETS_DB
+from utils.db_api.db import AsyncDB
+from utils.db_api.models import Wallet
+from utils.db_api.wallet_api import db
+
+
+def _loaded_wallet(id: int) -> Wallet | None:
+    return db.s.identity_map.get(identity_key(Wallet, id))
+
+
+async def update_wallet(id: int, **values) -> bool:
+    if not await adb.update_by_id(Wallet, id, **values):
+        return False
+
+    wallet = _loaded_wallet(id)
+    if wallet is not None:
+        for key, value in values.items():
+            set_committed_value(wallet, key, value)
+
+    return True
+
+
+async def get_wallets() -> list[Wallet]:
+    return await adb.all(Wallet)
+
+
+async def get_wallet_by_id(id: int) -> Wallet | None:
+    """
+    Returns the Wallet loaded in the sync session if there is one, otherwise a detached copy (change it with update_wallet).
+    """
+    return _loaded_wallet(id) or await adb.get_by_id(Wallet, id)
+
+
+async def get_wallet_by_email_data(email_data: str) -> Wallet | None:
+    return await adb.one(Wallet, Wallet.email_data == email_data)
+
+
+async def save_bearer_token(id: int, bearer_token: str) -> bool:
+    return await update_wallet(id, bearer_token=bearer_token)
+
+
+async def save_refresh_token(id: int, refresh_token: str) -> bool:
+    return await update_wallet(id, refresh_token=refresh_token)
+
+
+async def update_points_and_top(id: int, points: int, top: int) -> bool:
+    return await update_wallet(id, points=points, top=top)
+
+
+async def update_discord_connect(id: int) -> bool:
+    return await update_wallet(id, discord_connected=True)
+
+
+async def update_twitter_token(id: int, updated_token: str | None) -> bool:
+    if not updated_token:
+        return False
+
+    return await update_wallet(id, twitter_token=updated_token)
+
+
+async def replace_bad_proxy(id: int, new_proxy: str) -> bool:
+    return await update_wallet(id, proxy=new_proxy, proxy_status="OK")
+
+
+async def replace_bad_twitter(id: int, new_token: str) -> bool:
+    return await update_wallet(id, twitter_token=new_token, twitter_status="OK")
+
+
+async def mark_proxy_as_bad(id: int) -> bool:
+    return await update_wallet(id, proxy_status="BAD")
+
+
+async def mark_discord_as_bad(id: int) -> bool:
+    return await update_wallet(id, discord_status="BAD")
+
+
+async def mark_twitter_as_bad(id: int) -> bool:
+    return await update_wallet(id, twitter_status="BAD")
+
+
+async def set_fs_form_status(id: int, status: str) -> bool:
+    return await update_wallet(id, hs_form_status=status)
+
+
+async def get_wallets_with_bad_proxy() -> list:
+    return await adb.all(Wallet, Wallet.proxy_status == "BAD")
+
+
+async def get_wallets_with_bad_twitter() -> list:
+    return await adb.all(Wallet, Wallet.twitter_status == "BAD")
+
+
+adb = AsyncDB(f"sqlite+aiosqlite:///{WALLETS_DB}", echo=False, connect_args={"timeout": DB_BUSY_TIMEOUT})
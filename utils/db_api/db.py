@@ -1,6 +1,6 @@
 from loguru import logger
-from sqlalchemy import create_engine, inspect, text
-from sqlalchemy.exc import DatabaseError
+from sqlalchemy import create_engine, inspect, select, text, update
+from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm import Session
 
 
@@ -14,8 +14,19 @@ class DB:
         self.db_url = db_url
         self.engine = create_engine(self.db_url, **kwargs)
         self.Base = None
-        self.s: Session = Session(bind=self.engine)
-        self.conn = self.engine.connect()
+        # loaded objects stay valid after commit: this session is the only writer, so reloading them would only cost SELECTs
+        self.s: Session = Session(bind=self.engine, expire_on_commit=False)
+        self._conn = None
+
+    @property
+    def conn(self):
+        """
+        A raw connection for `execute`, opened on first use.
+        """
+        if self._conn is None:
+            self._conn = self.engine.connect()
+
+        return self._conn
 
     def create_tables(self, base):
         """
@@ -51,26 +62,38 @@ class DB:
 
     def one(self, entities=None, *criterion, stmt=None, from_the_end: bool = False):
         """
-        Fetches one row.
+        Fetches one row with LIMIT 1.
 
         :param entities: an ORM entity
         :param stmt: stmt
         :param criterion: criterion for rows filtering
-        :param from_the_end: get the row from the end
+        :param from_the_end: get the last row (by primary key for entities, by the statement order for stmt)
         :return list: found row or None
         """
-        if entities and criterion:
-            rows = self.all(entities, *criterion)
-        else:
-            rows = self.all(stmt=stmt)
+        if stmt is None:
+            if entities is None:
+                return None
 
-        if rows:
+            stmt = select(entities).where(*criterion)
             if from_the_end:
-                return rows[-1]
+                stmt = stmt.order_by(*(column.desc() for column in inspect(entities).primary_key))
+                from_the_end = False
+
+        if from_the_end:
+            rows = self.all(stmt=stmt)
+            return rows[-1] if rows else None
 
-            return rows[0]
+        return self.s.scalars(stmt.limit(1)).first()
 
-        return None
+    def get_by_id(self, entities, id):
+        """
+        Fetches a row by its primary key. Objects already loaded in the session are returned without a query.
+
+        :param entities: an ORM entity
+        :param id: the primary key value
+        :return: found row or None
+        """
+        return self.s.get(entities, id)
 
     def execute(self, query, *args):
         """
@@ -86,6 +109,9 @@ class DB:
     def commit(self):
         """
         Commits changes.
+
+        A lock held by another writer for longer than the busy timeout is re-raised after the rollback,
+        so the caller (or its retry) knows the changes were not saved.
         """
         try:
             self.s.commit()
@@ -93,6 +119,8 @@ class DB:
         except DatabaseError as e:
             logger.error(e)
             self.s.rollback()
+            if isinstance(e, OperationalError) and "database is locked" in str(e):
+                raise
 
     def insert(self, row: object | list[object]):
         """
@@ -179,3 +207,120 @@ class DB:
                 logger.warning(f"[schema] '{table_name}.{col.name}' NOT NULL without DEFAULT → adding as NULLABLE")
 
             self.add_column_to_table(table_name=table_name, column_name=col.name, column_type=col_type_sql, default_value=default_val)
+
+
+class AsyncDB:
+    def __init__(self, db_url: str, **kwargs):
+        """
+        Initializes a class. The engine connects on first use.
+
+        Statements run in autocommit mode: every write is committed by SQLite as it executes, in the aiosqlite
+        thread, so the write lock is never held across an event-loop yield (a sync writer blocked on the loop
+        thread could otherwise wait for a commit that can not run).
+
+        :param str db_url: an async driver URL, e.g. sqlite+aiosqlite:///files/wallets.db
+        """
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        kwargs.setdefault("isolation_level", "AUTOCOMMIT")
+        self.db_url = db_url
+        self.engine = create_async_engine(self.db_url, **kwargs)
+        self.session = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    async def all(self, entities=None, *criterion, stmt=None, order_by=None) -> list:
+        """
+        Fetches all rows.
+
+        :param entities: an ORM entity
+        :param stmt: stmt
+        :param criterion: criterion for rows filtering
+        :return list: the list of rows
+        """
+        if stmt is None:
+            if entities is None:
+                return []
+
+            stmt = select(entities).where(*criterion)
+            if order_by is not None:
+                stmt = stmt.order_by(order_by)
+
+        async with self.session() as session:
+            return list((await session.scalars(stmt)).all())
+
+    async def one(self, entities=None, *criterion, stmt=None, from_the_end: bool = False):
+        """
+        Fetches one row with LIMIT 1.
+
+        :param entities: an ORM entity
+        :param stmt: stmt
+        :param criterion: criterion for rows filtering
+        :param from_the_end: get the last row by primary key (entities only)
+        :return: found row or None
+        """
+        if stmt is None:
+            if entities is None:
+                return None
+
+            stmt = select(entities).where(*criterion)
+            if from_the_end:
+                stmt = stmt.order_by(*(column.desc() for column in inspect(entities).primary_key))
+
+        async with self.session() as session:
+            return (await session.scalars(stmt.limit(1))).first()
+
+    async def get_by_id(self, entities, id):
+        """
+        Fetches a row by its primary key.
+
+        :param entities: an ORM entity
+        :param id: the primary key value
+        :return: found row or None
+        """
+        async with self.session() as session:
+            return await session.get(entities, id)
+
+    async def update_by_id(self, entities, id, **values) -> bool:
+        """
+        Updates columns of one row in a single UPDATE statement.
+
+        :param entities: an ORM entity
+        :param id: the primary key value
+        :param values: column values
+        :return bool: True if the row exists
+        """
+        primary_key = inspect(entities).primary_key[0]
+        async with self.engine.connect() as conn:
+            result = await conn.execute(update(entities).where(primary_key == id).values(**values))
+
+        return bool(result.rowcount)
+
+    async def insert(self, row: object) -> object:
+        """
+        Inserts a row in one INSERT statement.
+
+        :param row: an ORM entity, its primary key is set after the insert
+        :return: the row
+        """
+        async with self.session() as session:
+            session.add(row)
+            await session.commit()
+
+        return row
+
+    async def execute(self, query, *args):
+        """
+        Executes SQL query.
+
+        :param query: the query
+        :param args: any additional arguments
+        """
+        async with self.session() as session:
+            result = await session.execute(text(query), *args)
+            await session.commit()
+            return result
+
+    async def dispose(self):
+        """
+        Closes pooled connections. aiosqlite keeps a thread per connection, so call it before the loop stops.
+        """
+        await self.engine.dispose()
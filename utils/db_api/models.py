@@ -35,3 +35,27 @@ class Wallet(Base):
 
     def __repr__(self):
         return f"[{PROJECT_SHORT_NAME} | {self.id}]"
+
+
+class TxJournalEntry(Base):
+    """
+    One step of a multi-step on-chain flow (see utils.tx_journal). The row with step 'flow' is the run header.
+    """
+
+    __tablename__ = "tx_journal"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    wallet_id: Mapped[int] = mapped_column(index=True)
+    flow: Mapped[str] = mapped_column(index=True)
+    run_id: Mapped[str] = mapped_column(index=True)
+    step: Mapped[str]
+    status: Mapped[str]
+    tx_hash: Mapped[str] = mapped_column(default=None, nullable=True)
+    raw_tx: Mapped[str] = mapped_column(default=None, nullable=True)
+    nonce: Mapped[int] = mapped_column(default=None, nullable=True)
+    data: Mapped[str] = mapped_column(default=None, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.now, onupdate=datetime.now)
+
+    def __repr__(self):
+        return f"[{self.flow} | {self.run_id[:8]} | {self.step} | {self.status}]"
@@ -1,4 +1,4 @@
-from data.config import WALLETS_DB
+from data.config import DB_BUSY_TIMEOUT, WALLETS_DB
 from utils.db_api.db import DB
 from utils.db_api.models import Base, Wallet
 
@@ -11,7 +11,7 @@ def get_wallets(sqlite_query: bool = False) -> list[Wallet]:
 
 
 def get_wallet_by_id(id: int, sqlite_query: bool = False) -> Wallet | None:
-    return db.one(Wallet, Wallet.id == id)
+    return db.get_by_id(Wallet, id)
 
 
 def get_wallet_by_email_data(email_data: str) -> Wallet | None:
@@ -19,7 +19,7 @@ def get_wallet_by_email_data(email_data: str) -> Wallet | None:
 
 
 def save_bearer_token(id: int, bearer_token: str) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.bearer_token = bearer_token
@@ -28,7 +28,7 @@ def save_bearer_token(id: int, bearer_token: str) -> bool:
 
 
 def save_refresh_token(id: int, refresh_token: str) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.refresh_token = refresh_token
@@ -37,7 +37,7 @@ def save_refresh_token(id: int, refresh_token: str) -> bool:
 
 
 def update_points_and_top(id: int, points: int, top: int) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.points = points
@@ -47,7 +47,7 @@ def update_points_and_top(id: int, points: int, top: int) -> bool:
 
 
 def update_discord_connect(id: int) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.discord_connected = True
@@ -69,7 +69,7 @@ def update_twitter_token(id: int, updated_token: str | None) -> bool:
     if not updated_token:
         return False
 
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
 
@@ -79,7 +79,7 @@ def update_twitter_token(id: int, updated_token: str | None) -> bool:
 
 
 def replace_bad_proxy(id: int, new_proxy: str) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.proxy = new_proxy
@@ -89,7 +89,7 @@ def replace_bad_proxy(id: int, new_proxy: str) -> bool:
 
 
 def replace_bad_twitter(id: int, new_token: str) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.twitter_token = new_token
@@ -99,7 +99,7 @@ def replace_bad_twitter(id: int, new_token: str) -> bool:
 
 
 def mark_proxy_as_bad(id: int) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.proxy_status = "BAD"
@@ -108,7 +108,7 @@ def mark_proxy_as_bad(id: int) -> bool:
 
 
 def mark_discord_as_bad(id: int) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.discord_status = "BAD"
@@ -117,7 +117,7 @@ def mark_discord_as_bad(id: int) -> bool:
 
 
 def mark_twitter_as_bad(id: int) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.twitter_status = "BAD"
@@ -126,7 +126,7 @@ def mark_twitter_as_bad(id: int) -> bool:
 
 
 def set_fs_form_status(id: int, status: str) -> bool:
-    wallet = db.one(Wallet, Wallet.id == id)
+    wallet = db.get_by_id(Wallet, id)
     if not wallet:
         return False
     wallet.hs_form_status = status
@@ -142,5 +142,14 @@ def get_wallets_with_bad_twitter() -> list:
     return db.all(Wallet, Wallet.twitter_status == "BAD")
 
 
-db = DB(f"sqlite:///{WALLETS_DB}", echo=False, pool_recycle=3600, connect_args={"check_same_thread": False})
-db.create_tables(Base)
+def init_db() -> None:
+    """
+    Creates missing tables and columns. Must be called once at startup before the database is used.
+    """
+    db.create_tables(Base)
+    db.ensure_model_columns(Wallet)
+    # readers never block the writer and the writer never blocks readers; the mode is stored in the file
+    db.execute("PRAGMA journal_mode=WAL")
+
+
+db = DB(f"sqlite:///{WALLETS_DB}", echo=False, pool_recycle=3600, connect_args={"check_same_thread": False, "timeout": DB_BUSY_TIMEOUT})
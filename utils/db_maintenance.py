@@ -0,0 +1,237 @@
+"""
+Online snapshots and maintenance of files/wallets.db.
+
+Both work on their own sqlite3 connection in a worker thread, so the event loop keeps running and the
+application connections are only locked out for short steps:
+
+- `snapshot_db` copies the database with SQLite's online backup API in one step under a read lock
+  (a stepped copy is restarted by every commit of another connection, so it may never finish);
+- `maintain_db` frees unused pages with incremental VACUUM in small batches, refreshes the planner
+  statistics with ANALYZE and reports the file size and the query plans of the hot lookups.
+
+Incremental VACUUM needs auto_vacuum=INCREMENTAL, and switching to it rewrites the whole file with a full
+VACUUM under an exclusive lock. That is done only by `enable_incremental_vacuum`, called at startup before
+any task runs or from the Utils menu, never from the periodic maintenance.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from loguru import logger
+
+from data.config import BACKUPS_DIR, WALLETS_DB
+
+SNAPSHOT_PREFIX = "wallets_"
+
+# the lookups made on every wallet run; a full table SCAN in their plans means a missing index
+HOT_QUERIES = {
+    "wallet by id": "SELECT * FROM wallets WHERE id = 1",
+    "wallet by email_data": "SELECT * FROM wallets WHERE email_data = 'x'",
+    "tx_journal step": "SELECT * FROM tx_journal WHERE run_id = 'x' AND step = 'x' ORDER BY id DESC LIMIT 1",
+    "tx_journal open flow": "SELECT * FROM tx_journal WHERE wallet_id = 1 AND flow = 'x' AND step = 'flow' ORDER BY id DESC LIMIT 1",
+}
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # autocommit: PRAGMAs and VACUUM can not run inside a transaction
+    return sqlite3.connect(path, timeout=30, isolation_level=None)
+
+
+class SnapshotRestarted(Exception):
+    pass
+
+
+def snapshot_db(
+    path: str = WALLETS_DB,
+    dest_dir: str = BACKUPS_DIR,
+    pages: int = -1,
+    pause: float = 0.01,
+    keep: int = 10,
+    max_restarts: int = 3,
+    max_seconds: float = 300,
+) -> str:
+    """
+    Copies a live database with the SQLite backup API. Blocking: run it in a worker thread (see `snapshot`).
+
+    By default the whole file is copied in one step: the source is read-locked for the duration of the copy
+    (writers wait on their busy timeout), but the backup can not be restarted by their commits. With
+    `pages` > 0 the copy is stepped, and SQLite starts over every time another connection writes the source
+    in between; it is aborted after `max_restarts` restarts or `max_seconds`.
+
+    :param str path: the database to copy
+    :param str dest_dir: the snapshots folder
+    :param int pages: pages copied per step (-1 - all in one step)
+    :param float pause: seconds to wait between steps
+    :param int keep: how many snapshots to keep (0 - all)
+    :param int max_restarts: restarts allowed for a stepped copy
+    :param float max_seconds: time allowed for a stepped copy
+    :return str: the snapshot path
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    dest = os.path.join(dest_dir, f"{SNAPSHOT_PREFIX}{datetime.now():%Y%m%d_%H%M%S}.db")
+    partial = dest + ".part"
+    started = time.monotonic()
+    state = {"remaining": None, "restarts": 0}
+
+    def progress(status, remaining, total):
+        # a restart copies from the first page again, so the number of remaining pages does not go down
+        if state["remaining"] is not None and remaining >= state["remaining"]:
+            state["restarts"] += 1
+        state["remaining"] = remaining
+
+        if state["restarts"] > max_restarts:
+            raise SnapshotRestarted(f"the copy was restarted {state['restarts']} times by concurrent writes")
+        if time.monotonic() - started > max_seconds:
+            raise SnapshotRestarted(f"the copy did not finish in {max_seconds}s")
+        if remaining:
+            time.sleep(pause)
+
+    source = _connect(path)
+    target = sqlite3.connect(partial)
+    try:
+        source.backup(target, pages=pages, progress=progress if pages > 0 else None)
+
+    except Exception:
+        # closing twice is a no-op; the partial file has to be closed before it is removed on Windows
+        target.close()
+        os.remove(partial)
+        raise
+
+    finally:
+        target.close()
+        source.close()
+
+    os.replace(partial, dest)
+
+    if keep:
+        snapshots = sorted(f for f in os.listdir(dest_dir) if f.startswith(SNAPSHOT_PREFIX) and f.endswith(".db"))
+        for old in snapshots[:-keep]:
+            os.remove(os.path.join(dest_dir, old))
+
+    return dest
+
+
+async def snapshot(**kwargs) -> str:
+    started = time.perf_counter()
+    dest = await asyncio.to_thread(snapshot_db, **kwargs)
+    logger.success(f"Database snapshot saved to {dest} ({os.path.getsize(dest) / 1024:.0f} KB, {time.perf_counter() - started:.1f}s)")
+    return dest
+
+
+def _file_stats(conn: sqlite3.Connection, path: str) -> dict:
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return {
+        "file_size": os.path.getsize(path),
+        "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+        "page_size": page_size,
+    }
+
+
+def query_plans(conn: sqlite3.Connection) -> dict[str, dict]:
+    """
+    EXPLAIN QUERY PLAN of the hot lookups. 'scan' is True if any of them reads a whole table.
+    """
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    plans = {}
+    for name, query in HOT_QUERIES.items():
+        if query.split(" FROM ", 1)[1].split()[0] not in tables:
+            continue
+
+        details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")]
+        plans[name] = {"plan": details, "scan": any(d.startswith("SCAN") for d in details)}
+
+    return plans
+
+
+def enable_incremental_vacuum(path: str = WALLETS_DB) -> bool:
+    """
+    Switches the database to auto_vacuum=INCREMENTAL. The switch needs one full VACUUM, which rewrites the file
+    under an exclusive lock: call it only when nothing else writes the database (at startup or from the menu).
+
+    :param str path: the database
+    :return bool: True if the database was converted, False if it already was incremental
+    """
+    conn = _connect(path)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+    finally:
+        conn.close()
+
+
+def maintain_db(path: str = WALLETS_DB, batch_pages: int = 128, pause: float = 0.01) -> dict:
+    """
+    Incremental VACUUM + ANALYZE. Blocking: run it in a worker thread (see `maintain`).
+
+    Free pages are released `batch_pages` at a time, each batch is a short write transaction. A database that
+    is not auto_vacuum=INCREMENTAL yet (see `enable_incremental_vacuum`) only gets ANALYZE.
+
+    :param str path: the database
+    :param int batch_pages: pages released per incremental_vacuum step
+    :param float pause: seconds to wait between steps
+    :return dict: the sizes before and after and the query plans of the hot lookups
+    """
+    started = time.perf_counter()
+    conn = _connect(path)
+    try:
+        before = _file_stats(conn, path)
+
+        incremental = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        while incremental and conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            conn.execute(f"PRAGMA incremental_vacuum({batch_pages})")
+            time.sleep(pause)
+
+        conn.execute("ANALYZE")
+        after = _file_stats(conn, path)
+        plans = query_plans(conn)
+    finally:
+        conn.close()
+
+    return {"before": before, "after": after, "incremental": incremental, "query_plans": plans, "duration": time.perf_counter() - started}
+
+
+async def enable_incremental(path: str = WALLETS_DB) -> bool:
+    started = time.perf_counter()
+    converted = await asyncio.to_thread(enable_incremental_vacuum, path)
+    if converted:
+        logger.info(f"Database switched to incremental vacuum in {time.perf_counter() - started:.1f}s")
+    return converted
+
+
+async def maintain(**kwargs) -> dict:
+    report = await asyncio.to_thread(maintain_db, **kwargs)
+    before, after = report["before"], report["after"]
+    logger.info(
+        f"Database maintenance: {before['file_size'] / 1024:.0f} KB -> {after['file_size'] / 1024:.0f} KB, "
+        f"free pages {before['freelist_count']} -> {after['freelist_count']}, {report['duration']:.1f}s"
+    )
+    if not report["incremental"] and after["freelist_count"]:
+        logger.warning("Database maintenance: free pages are not released, run 'Database Maintenance' from the Utils menu once")
+    for name, plan in report["query_plans"].items():
+        if plan["scan"]:
+            logger.warning(f"Database maintenance: '{name}' scans the whole table: {'; '.join(plan['plan'])}")
+
+    return report
+
+
+async def maintain_periodically(interval: float, snapshot_keep: int = 10) -> None:
+    """
+    Takes a snapshot and runs the maintenance every `interval` seconds until cancelled.
+    Never converts the database to incremental vacuum, see `enable_incremental_vacuum`.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await snapshot(keep=snapshot_keep)
+            await maintain()
+        except Exception as e:
+            logger.error(f"Database maintenance failed: {e}")
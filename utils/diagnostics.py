@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+from loguru import logger
+
+from data.config import LOGS_DIR
+from data.settings import Settings
+
+DIAGNOSTICS_ENV = "LOOP_DIAGNOSTICS"
+
+
+def diagnostics_enabled() -> bool:
+    env = os.getenv(DIAGNOSTICS_ENV, "").strip().lower()
+    if env:
+        return env in ("1", "true", "yes", "on")
+
+    return Settings().diagnostics
+
+
+class LoopDiagnostics:
+    """
+    Opt-in event-loop stall detector.
+
+    A heartbeat coroutine measures how late the loop wakes it up (event-loop lag). A watchdog thread
+    samples the loop thread's stack whenever the heartbeat is older than `threshold` seconds, so the code
+    that blocked the loop is caught in the act. Stalls are grouped by stack and written as a report of
+    the worst offenders to files/logs/diagnostics_<time>.json on stop().
+
+    Lag percentiles are computed over the last `lag_window` samples (10 minutes at the default interval),
+    so memory stays flat over multi-day runs; the sample count and the maximum cover the whole run.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05, stack_depth: int = 12, lag_window: int = 12_000):
+        self.threshold = threshold
+        self.interval = interval
+        self.stack_depth = stack_depth
+
+        self.lags: deque[float] = deque(maxlen=lag_window)
+        self.lag_samples = 0
+        self.max_lag = 0.0
+        self.offenders: dict[str, dict] = {}
+
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._stall_key: str | None = None
+        self._stop = threading.Event()
+        self._heartbeat: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._started_at = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "LoopDiagnostics":
+        return cls(threshold=Settings().diagnostics_stall_threshold)
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._started_at = time.time()
+        self._stop.clear()
+
+        self._heartbeat = asyncio.get_running_loop().create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-diagnostics", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Diagnostics | event-loop stall detector started (threshold {self.threshold * 1000:.0f} ms)")
+
+    def stop(self) -> str | None:
+        if not self._watchdog:
+            return None
+
+        self._stop.set()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+
+        path = self.write_report()
+        logger.info(f"Diagnostics | report saved to {path}")
+        return path
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - expected)
+            self.lags.append(lag)
+            self.lag_samples += 1
+            self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            stalled_for = time.monotonic() - self._last_beat - self.interval
+            if stalled_for < self.threshold:
+                self._stall_key = None
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            stack = traceback.extract_stack(frame)[-self.stack_depth :]
+            key = self._stall_key or "".join(traceback.format_list(stack))
+
+            offender = self.offenders.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0, "stack": traceback.format_list(stack)})
+            if self._stall_key is None:
+                # a new stall
+                offender["count"] += 1
+                offender["total"] += stalled_for
+            else:
+                offender["total"] += stalled_for - offender["_last"]
+            offender["_last"] = stalled_for
+            offender["max"] = max(offender["max"], stalled_for)
+            self._stall_key = key
+
+    def summary(self) -> dict:
+        lags = sorted(self.lags)
+
+        def percentile(p: float) -> float:
+            if not lags:
+                return 0.0
+            return lags[min(len(lags) - 1, int(len(lags) * p))]
+
+        offenders = sorted(self.offenders.values(), key=lambda o: o["total"], reverse=True)
+        return {
+            "started_at": datetime.fromtimestamp(self._started_at).isoformat(),
+            "duration": round(time.time() - self._started_at, 3),
+            "threshold": self.threshold,
+            "loop_lag": {
+                "samples": self.lag_samples,
+                "window": len(lags),
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": self.max_lag,
+            },
+            "stalls": sum(o["count"] for o in offenders),
+            "worst_offenders": [
+                {"count": o["count"], "total": round(o["total"], 4), "max": round(o["max"], 4), "stack": o["stack"]} for o in offenders[:20]
+            ],
+        }
+
+    def write_report(self) -> str:
+        os.makedirs(LOGS_DIR, exist_ok=True)
+        path = os.path.join(LOGS_DIR, f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+        return path
@@ -16,7 +16,7 @@ from libs.baseAsyncSession import BaseAsyncSession, FINGERPRINT_MAC136
 from utils.captcha.bestcapthca import create_bestcaptcha_task, get_bestcaptcha_task_result
 from utils.captcha.capthca24 import create_24captch_task, get_24captcha_task_result
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import db
+from utils.db_api.async_wallet_api import update_wallet
 from utils.discord.captcha import get_hcaptcha_solution
 from utils.query_json import json_to_query, query_to_json
 
@@ -356,8 +356,7 @@ class DiscordInviter:
 
             if "You need to verify your account" in r.text:
                 logger.error(f"{self.wallet} | {self.__module_name__} | Account needs verification (Email code etc).")
-                self.wallet.discord_status = DiscordStatus.bad_token
-                db.commit()
+                await update_wallet(self.wallet.id, discord_status=DiscordStatus.bad_token)
                 return "verification_failed", "", False
 
             location_guild_id = r.json()['guild_id']
@@ -439,8 +438,7 @@ class DiscordInviter:
         if ("You need to update your app to join this server." in (r.text or "")) or (
                 "captcha_rqdata" in (r.text or "")):
             need_captcha = True
-            self.wallet.discord_status = DiscordStatus.captcha
-            db.commit()
+            await update_wallet(self.wallet.id, discord_status=DiscordStatus.captcha)
             #todo captcha flow
             return False, f'{self.wallet} | {self.__module_name__} | {r.text}'
 
@@ -448,8 +446,7 @@ class DiscordInviter:
             if "Unauthorized" in (r.text or ""):
                 return False, f'{self.wallet} | {self.__module_name__} | Incorrect discord token or your account is blocked.'
             if "You need to verify your account in order to" in (r.text or ""):
-                self.wallet.discord_status = DiscordStatus.verify
-                db.commit()
+                await update_wallet(self.wallet.id, discord_status=DiscordStatus.verify)
                 return False, f'{self.wallet} | {self.__module_name__} | Account needs verification (Email code etc).'
             return False, f'{self.wallet} | {self.__module_name__} | Unknown error: {r.text}'
 
@@ -692,8 +689,7 @@ class DiscordInviter:
 
                 if ("Banned" in answer) or ("Incorrect discord token or your account is blocked" in answer):
                     logger.error(answer)
-                    self.wallet.discord_status = DiscordStatus.bad_token
-                    db.commit()
+                    await update_wallet(self.wallet.id, discord_status=DiscordStatus.bad_token)
                     await self.close()
                     continue
 
@@ -1,8 +1,12 @@
+import atexit
 import base64
 import getpass
 import hashlib
+import hmac
 import os
 import sys
+import threading
+import time
 
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.backends import default_backend
@@ -17,7 +21,100 @@ from utils.db_api.models import Wallet
 from utils.db_api.wallet_api import db
 
 
-def _derive_fernet_key(password: bytes, salt=None) -> bytes:
+class SecretCache:
+    """
+    In-process cache for secrets (derived keys and decrypted private keys).
+
+    Values are held in bytearrays so they can be overwritten in place on `clear()`. `get` and `set` return the
+    cached bytearray itself rather than a copy, so clearing the cache also wipes what callers were given: use the
+    value right away and do not keep it. Entries expire after `ttl` seconds (None - for the whole session).
+    """
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = ttl
+        self._items: dict[str, tuple[bytearray, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytearray | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+
+            value, created_at = item
+            if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+                self._zeroize(self._items.pop(key)[0])
+                return None
+
+            return value
+
+    def set(self, key: str, value: bytes) -> bytearray:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old:
+                self._zeroize(old[0])
+            stored = bytearray(value)
+            self._items[key] = (stored, time.monotonic())
+            return stored
+
+    def clear(self) -> None:
+        with self._lock:
+            for value, _ in self._items.values():
+                self._zeroize(value)
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _zeroize(value: bytearray) -> None:
+        for i in range(len(value)):
+            value[i] = 0
+
+
+DERIVED_KEYS = SecretCache()
+DECRYPTED_KEYS = SecretCache()
+
+# keys the caches by HMAC with a per-process secret: a plain hash of the password would be an offline oracle for it
+_CACHE_SECRET = os.urandom(32)
+
+_cipher_key_id: str | None = None
+_password_verified: bool = False
+
+
+def clear_secrets() -> None:
+    """
+    Zeroizes cached derived keys and decrypted private keys and drops the active cipher.
+    """
+    global _cipher_key_id, _password_verified
+
+    DERIVED_KEYS.clear()
+    DECRYPTED_KEYS.clear()
+    config.CIPHER_SUITE = None
+    _cipher_key_id = None
+    _password_verified = False
+
+
+atexit.register(clear_secrets)
+
+
+def _cache_id(*parts: bytes) -> str:
+    return hmac.new(_CACHE_SECRET, b"|".join(parts), hashlib.sha256).hexdigest()
+
+
+def _derive_fernet_key(password: bytes, salt=None) -> bytearray:
+    """
+    Returns the cached key buffer, which clear_secrets() zeroizes.
+    """
+    cache_key = _cache_id(password, salt or b"")
+    derived = DERIVED_KEYS.get(cache_key)
+    if derived is None:
+        derived = DERIVED_KEYS.set(cache_key, _compute_fernet_key(password, salt))
+
+    return derived
+
+
+def _compute_fernet_key(password: bytes, salt=None) -> bytes:
     try:
         if salt:
             kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000, backend=default_backend())
@@ -33,27 +130,37 @@ def _derive_fernet_key(password: bytes, salt=None) -> bytes:
 
 
 def set_cipher_suite(password) -> None:
-    if Settings().private_key_encryption:
-        cipher = Fernet(_derive_fernet_key(password))
+    global _cipher_key_id, _password_verified
 
+    if Settings().private_key_encryption:
         if not os.path.exists(SALT_PATH):
-            cipher = Fernet(_derive_fernet_key(password))
-
-            config.CIPHER_SUITE = cipher
+            key = _derive_fernet_key(password)
 
         else:
             with open(SALT_PATH, "rb") as f:
                 salt = f.read()
 
-            cipher = Fernet(_derive_fernet_key(password, salt))
-            config.CIPHER_SUITE = cipher
+            key = _derive_fernet_key(password, salt)
+
+        key_id = _cache_id(key)
+        if key_id != _cipher_key_id:
+            # plaintexts decrypted with another key must not validate a new password
+            DECRYPTED_KEYS.clear()
+            _cipher_key_id = key_id
+            _password_verified = False
+
+        config.CIPHER_SUITE = Fernet(key)
 
 
 def get_private_key(enc_value: str) -> str:
     try:
         if Settings().private_key_encryption:
             if "gAAAA" in enc_value:
-                return config.CIPHER_SUITE.decrypt(enc_value.encode()).decode()
+                decrypted = DECRYPTED_KEYS.get(enc_value)
+                if decrypted is None:
+                    decrypted = DECRYPTED_KEYS.set(enc_value, config.CIPHER_SUITE.decrypt(enc_value.encode()))
+
+                return decrypted.decode()
 
         return enc_value
     except Exception:
@@ -69,10 +176,30 @@ def prk_encrypt(value: str) -> str:
     return value
 
 
+def _verify_cipher(check_password: bool = True) -> bool:
+    global _password_verified
+
+    check_password_wallet = db.get_by_id(Wallet, 1)
+    if not check_password_wallet:
+        _password_verified = True
+        return True
+
+    # Should raise a specific error on wrong key
+    if check_password:
+        get_private_key(check_password_wallet.evm_private_key)
+        _password_verified = True
+
+    return True
+
+
 def check_encrypt_param(confirm: bool = False, check_password: bool = True, attempts: int = 3):
     if not Settings().private_key_encryption:
         return True
 
+    # the password was already verified in this session - no prompt and no key derivation
+    if config.CIPHER_SUITE is not None and (_password_verified or not check_password):
+        return True
+
     for try_num in range(1, attempts + 1):
         pwd1 = getpass.getpass("[DECRYPTOR] Enter password (input hidden): ").strip().encode()
 
@@ -88,17 +215,10 @@ def check_encrypt_param(confirm: bool = False, check_password: bool = True, atte
             continue
 
         set_cipher_suite(pwd1)
-        check_password_wallet = db.one(Wallet, Wallet.id == 1)
-        if check_password_wallet:
-            try:
-                # Should raise a specific error on wrong key
-                if check_password:
-                    get_private_key(check_password_wallet.evm_private_key)
-                return True
-            except Exception:
-                print(f"Invalid password (attempt {try_num}/{attempts})\n")
-                continue
-        else:
-            return True
+        try:
+            return _verify_cipher(check_password=check_password)
+        except Exception:
+            print(f"Invalid password (attempt {try_num}/{attempts})\n")
+            continue
 
     raise RuntimeError("Password confirmation failed – too many attempts.")
@@ -1,26 +1,47 @@
+import asyncio
 import json
 import os
 import platform
 import sys
+import time
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
-import git
 from loguru import logger
 
 from data.settings import Settings
-from utils.browser import Browser
 
+# GitPython and the HTTP client are imported inside the functions that use them: the check runs in the
+# background after the menu is shown and git calls run in a worker thread, so startup never waits on them.
 
-def get_local_commit(repo_path: str = ".") -> Tuple[Optional[str], Optional[str], Optional[str]]:
+UPDATE_CHECK_TIMEOUT = 15
+UPDATE_CHECK_INTERVAL = 6 * 60 * 60
+
+# the update found by the background check, shown by the menu on its next render
+_available_update: Optional[dict] = None
+
+
+def pop_available_update() -> Optional[dict]:
+    """
+    Returns the update found by the background check once, None if there is none or it was already shown.
+    """
+    global _available_update
+    update, _available_update = _available_update, None
+    return update
+
+
+def get_local_commit(repo_path: str = ".", quiet: bool = False) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Fetches the current HEAD commit information from the local Git repository.
     Args:
         repo_path: Path to the Git repository (default: current directory).
+        quiet: Log errors at debug level (default: False).
 
     Returns:
         Tuple containing (commit_hash, commit_date, commit_message) or (None, None, None) if not a Git repo.
     """
+    import git
+
     try:
         repo = git.Repo(repo_path)
         head_commit = repo.head.commit
@@ -30,25 +51,32 @@ def get_local_commit(repo_path: str = ".") -> Tuple[Optional[str], Optional[str]
         logger.debug(f"No valid Git repository at {repo_path}")
         return None, None, None
     except Exception as e:
-        logger.error(f"Error fetching local commit: {e}")
+        logger.log("DEBUG" if quiet else "ERROR", f"Error fetching local commit: {e}")
         return None, None, None
 
 
-def get_latest_commit_from_git(repo_path: str = ".", remote_name: str = "origin") -> Tuple[Optional[str], Optional[str], Optional[str]]:
+def get_latest_commit_from_git(
+    repo_path: str = ".", remote_name: str = "origin", timeout: float = UPDATE_CHECK_TIMEOUT, quiet: bool = False
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Fetches the latest commit information from a remote Git repository using gitpython.
+    Blocking: run it in a worker thread.
 
     Args:
         repo_path: Path to the Git repository (default: current directory).
         remote_name: Name of the remote (default: "origin").
+        timeout: Seconds after which the git fetch process is killed.
+        quiet: Log errors at debug level (default: False).
 
     Returns:
         Tuple containing (commit_hash, commit_date, commit_message) or (None, None, None) on error.
     """
+    import git
+
     try:
         repo = git.Repo(repo_path)
         remote = repo.remotes[remote_name]
-        remote.fetch()
+        remote.fetch(kill_after_timeout=timeout)
 
         remote_head = repo.refs[f"{remote_name}/{repo.active_branch.name}"]
         commit = repo.commit(remote_head)
@@ -59,42 +87,123 @@ def get_latest_commit_from_git(repo_path: str = ".", remote_name: str = "origin"
         logger.debug(f"No valid Git repository at {repo_path}")
         return None, None, None
     except Exception as e:
-        logger.error(f"Error fetching from Git: {e}. Ensure SSH/HTTPS credentials are configured for private repositories.")
+        logger.log("DEBUG" if quiet else "ERROR", f"Error fetching from Git: {e}. Ensure SSH/HTTPS credentials are configured for private repositories.")
         return None, None, None
 
 
-async def get_latest_commit_from_api(repo_owner: str, repo_name: str) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
+async def get_latest_commit_from_api(
+    repo_owner: str, repo_name: str, timeout: float = UPDATE_CHECK_TIMEOUT, quiet: bool = False
+) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
+    from utils.browser import Browser
+
+    error_level = "DEBUG" if quiet else "ERROR"
+
     headers = {"Accept": "application/vnd.github.v3+json"}
-    browser = Browser()
     try:
-        repo_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
-        response = await browser.get(url=repo_url, headers=headers)
-
-        if response.status_code == 404:
-            return None, None, None, True
-
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch repository info: HTTP {response.status_code}")
-            return None, None, None, False
-        data = response.json()
-        default_branch = data.get("default_branch", "main")
-        commit_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/commits/{default_branch}"
-        response = await browser.get(url=commit_url, headers=headers)
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch commit: HTTP {response.status_code}")
-            return None, None, None, False
-        data = response.json()
-        return (
-            data.get("sha", "")[:7],
-            data.get("commit", {}).get("author", {}).get("date"),
-            data.get("commit", {}).get("message", "").strip(),
-            False,
-        )
+        # both requests share one session
+        async with Browser() as browser:
+            repo_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}"
+            response = await browser.get(url=repo_url, headers=headers, timeout=timeout)
+
+            if response.status_code == 404:
+                return None, None, None, True
+
+            if response.status_code != 200:
+                logger.log(error_level, f"Failed to fetch repository info: HTTP {response.status_code}")
+                return None, None, None, False
+            data = response.json()
+            default_branch = data.get("default_branch", "main")
+            commit_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/commits/{default_branch}"
+            response = await browser.get(url=commit_url, headers=headers, timeout=timeout)
+            if response.status_code != 200:
+                logger.log(error_level, f"Failed to fetch commit: HTTP {response.status_code}")
+                return None, None, None, False
+            data = response.json()
+            return (
+                data.get("sha", "")[:7],
+                data.get("commit", {}).get("author", {}).get("date"),
+                data.get("commit", {}).get("message", "").strip(),
+                False,
+            )
     except Exception as e:
-        logger.error(f"Error fetching commit from API: {e}")
+        logger.log(error_level, f"Error fetching commit from API: {e}")
         return None, None, None, False
 
 
+async def fetch_latest_commit(
+    repo_owner: str,
+    repo_name: str,
+    is_git_repo: bool,
+    repo_path: str = ".",
+    remote_name: str = "origin",
+    timeout: float = UPDATE_CHECK_TIMEOUT,
+    quiet: bool = False,
+) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
+    """
+    Fetches the latest remote commit via the GitHub API, falling back to git fetch (in a worker thread) for private repositories.
+    With `quiet`, failures are logged at debug level.
+
+    Returns:
+        Tuple containing (commit_hash, commit_date, commit_message, is_private).
+    """
+    latest_hash, latest_date, latest_message, is_private = await get_latest_commit_from_api(repo_owner, repo_name, timeout=timeout, quiet=quiet)
+    if is_git_repo and is_private:
+        logger.debug("Fetching updates from remote...")
+        latest_hash, latest_date, latest_message = await asyncio.to_thread(get_latest_commit_from_git, repo_path, remote_name, timeout, quiet)
+        if not latest_hash:
+            logger.log("DEBUG" if quiet else "WARNING", "Warning: Failed to fetch updates via Git. Ensure SSH/HTTPS credentials are configured for private repositories.")
+
+    return latest_hash, latest_date, latest_message, is_private
+
+
+def read_version_data(version_file: str = "files/version.json") -> dict:
+    try:
+        if os.path.exists(version_file):
+            with open(version_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Error reading {version_file}: {e}")
+
+    return {}
+
+
+def write_version_data(data: dict, version_file: str = "files/version.json") -> None:
+    tmp_file = f"{version_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_file, version_file)
+
+
+def read_cached_check(
+    version_file: str = "files/version.json", min_interval: float = UPDATE_CHECK_INTERVAL
+) -> Optional[Tuple[Optional[str], Optional[str], Optional[str], bool]]:
+    """
+    Returns the last remote check result if it is younger than `min_interval` seconds, otherwise None.
+    """
+    data = read_version_data(version_file)
+    latest = data.get("latest")
+    last_checked = data.get("last_checked", 0)
+    if not latest or time.time() - last_checked >= min_interval:
+        return None
+
+    return latest.get("hash"), latest.get("date"), latest.get("message"), latest.get("is_private", False)
+
+
+def save_check_result(
+    latest_hash: str, latest_date: str, latest_message: Optional[str], is_private: bool, version_file: str = "files/version.json"
+) -> None:
+    """
+    Stores the remote check result with the time it was made.
+    """
+    try:
+        data = read_version_data(version_file)
+        data["last_checked"] = time.time()
+        data["latest"] = {"hash": latest_hash, "date": latest_date, "message": latest_message, "is_private": is_private}
+        write_version_data(data, version_file)
+    except Exception as e:
+        logger.error(f"Error saving update check result to {version_file}: {e}")
+
+
 def read_local_version(version_file: str = "files/version.json") -> Tuple[Optional[str], Optional[str]]:
     """
     Reads the local version information from a file.
@@ -105,16 +214,11 @@ def read_local_version(version_file: str = "files/version.json") -> Tuple[Option
     Returns:
         Tuple containing (commit_hash, commit_date) or (None, None) on error.
     """
-    try:
-        if os.path.exists(version_file):
-            with open(version_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("hash"), data.get("date")
+    data = read_version_data(version_file)
+    if not data:
         logger.debug(f"No version file found at {version_file}")
-        return None, None
-    except Exception as e:
-        logger.error(f"Error reading local version from {version_file}: {e}")
-        return None, None
+
+    return data.get("hash"), data.get("date")
 
 
 def save_local_version(commit_hash: str, commit_date: str, version_file: str = "files/version.json") -> None:
@@ -127,8 +231,9 @@ def save_local_version(commit_hash: str, commit_date: str, version_file: str = "
         version_file: Path to the version file (default: "version.json").
     """
     try:
-        with open(version_file, "w", encoding="utf-8") as f:
-            json.dump({"hash": commit_hash, "date": commit_date}, f, indent=2)
+        data = read_version_data(version_file)
+        data.update({"hash": commit_hash, "date": commit_date})
+        write_version_data(data, version_file)
         logger.debug(f"Saved version info to {version_file}: {commit_hash}")
     except Exception as e:
         logger.error(f"Error saving version to {version_file}: {e}")
@@ -145,6 +250,8 @@ def perform_git_pull(repo_path: str = ".", remote_name: str = "origin") -> bool:
     Returns:
         True if the pull was successful, False otherwise.
     """
+    import git
+
     try:
         repo = git.Repo(repo_path)
         remote = repo.remotes[remote_name]
@@ -175,11 +282,16 @@ async def check_for_updates(
     version_file: str = "files/version.json",
     repo_path: str = ".",
     remote_name: str = "origin",
+    interactive: bool = True,
+    timeout: float = UPDATE_CHECK_TIMEOUT,
+    min_interval: float = UPDATE_CHECK_INTERVAL,
+    force: bool = False,
 ) -> None:
     """
     Checks for updates using gitpython if a Git repo exists, otherwise falls back to GitHub API via Browser.
     Notifies the user if a newer version is available. On first run, saves local HEAD commit for Git repos.
-    For Git repos, prompts to perform git pull and restarts the program if user agrees.
+    For Git repos, prompts to perform git pull and restarts the program if user agrees (only when interactive).
+    The remote result is cached in the version file and reused for `min_interval` seconds.
 
     Args:
         repo_name: The name of the repository.
@@ -187,11 +299,18 @@ async def check_for_updates(
         version_file: Path to the version file (default: "files/version.json").
         repo_path: Path to the Git repository (default: current directory).
         remote_name: Name of the remote (default: "origin").
+        interactive: Ask to perform git pull and log at info level (default: True). Disable when running in the background:
+            everything is then logged at debug level and a found update is kept for pop_available_update.
+        timeout: Overall time limit of the remote check in seconds (default: UPDATE_CHECK_TIMEOUT).
+        min_interval: Minimum seconds between remote checks (default: UPDATE_CHECK_INTERVAL).
+        force: Check even if check_git_updates is disabled in the settings (default: False).
     """
-    if not Settings().check_git_updates:
+    if not force and not Settings().check_git_updates:
         return
 
     repo_name = repo_name.strip().lower().replace(" ", "_")
+    # in the background the menu prompt owns the terminal: log at debug level and keep the result for the menu
+    info_level, warning_level = ("INFO", "WARNING") if interactive else ("DEBUG", "DEBUG")
 
     logger.debug(f"Checking for updates in {repo_owner}/{repo_name}")
 
@@ -202,24 +321,34 @@ async def check_for_updates(
     local_hash = None
     local_date = None
 
-    latest_hash, latest_date, latest_message, is_private = await get_latest_commit_from_api(repo_owner, repo_name)
     if is_git_repo:
         logger.debug("Detected Git repository. Fetching local HEAD commit...")
-        local_hash, local_date, _ = get_local_commit(repo_path)
-        logger.debug("Fetching updates from remote...")
-        if is_private:
-            latest_hash, latest_date, latest_message = get_latest_commit_from_git(repo_path, remote_name)
-            if not latest_hash:
-                logger.warning(
-                    "Warning: Failed to fetch updates via Git. Ensure SSH/HTTPS credentials are configured for private repositories."
-                )
-            if local_hash == latest_hash:
-                latest_dt = datetime.fromisoformat(latest_date.replace("Z", "+00:00"))
-                formatted_date = latest_dt.strftime("%d.%m.%Y %H:%M UTC")
-                logger.info(f"You are using the latest version (commit from {formatted_date})")
-                return
+        local_hash, local_date, _ = await asyncio.to_thread(get_local_commit, repo_path, not interactive)
+
+    cached = read_cached_check(version_file, min_interval)
+    if cached:
+        logger.debug("Using the cached update check result")
+        latest_hash, latest_date, latest_message, is_private = cached
     else:
+        try:
+            latest_hash, latest_date, latest_message, is_private = await asyncio.wait_for(
+                fetch_latest_commit(repo_owner, repo_name, is_git_repo, repo_path, remote_name, timeout, quiet=not interactive),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.log(warning_level, f"Update check timed out after {timeout}s")
+            return
+
+        if latest_hash and latest_date:
+            save_check_result(latest_hash, latest_date, latest_message, is_private, version_file)
+
+    if not is_git_repo:
         logger.debug("No Git repository detected (possibly downloaded as ZIP). Using GitHub API for update check.")
+    elif is_private and latest_hash and local_hash == latest_hash:
+        latest_dt = datetime.fromisoformat(latest_date.replace("Z", "+00:00"))
+        formatted_date = latest_dt.strftime("%d.%m.%Y %H:%M UTC")
+        logger.log(info_level, f"You are using the latest version (commit from {formatted_date})")
+        return
 
     if not latest_hash or not latest_date:
         return
@@ -245,13 +374,28 @@ async def check_for_updates(
     if local_version_hash == latest_hash:
         latest_dt = datetime.fromisoformat(latest_date.replace("Z", "+00:00"))
         formatted_date = latest_dt.strftime("%d.%m.%Y %H:%M UTC")
-        logger.info(f"You are using the latest version (commit from {formatted_date})")
+        logger.log(info_level, f"You are using the latest version (commit from {formatted_date})")
         return
 
     # Update available
     latest_dt = datetime.fromisoformat(latest_date.replace("Z", "+00:00"))
     formatted_date = latest_dt.strftime("%d.%m.%Y %H:%M UTC")
     repo_url = f"https://github.com/{repo_owner}/{repo_name}"
+    logger.log(warning_level, f"Update available: {latest_hash} from {formatted_date}")
+
+    if not interactive:
+        global _available_update
+        _available_update = {
+            "hash": latest_hash,
+            "date": formatted_date,
+            "message": latest_message,
+            "url": repo_url,
+            "is_git_repo": is_git_repo,
+        }
+        if not is_git_repo:
+            save_local_version(latest_hash, latest_date, version_file)
+        return
+
     print(
         f"Update available!\n"
         f"Latest update: {formatted_date} (commit {latest_hash})\n"
@@ -259,17 +403,16 @@ async def check_for_updates(
         f"Use: git pull (if cloned via Git)\n"
         f"Or download update: {repo_url}"
     )
-    logger.warning(f"Update available: {latest_hash} from {formatted_date}")
 
     if is_git_repo:
         while True:
-            response = input("Perform update y/N? ").strip().lower()
+            response = (await asyncio.to_thread(input, "Perform update y/N? ")).strip().lower()
             if response in ("y", "n", ""):
                 break
             print("Please enter 'y' or 'n'.")
 
         if response == "y":
-            if perform_git_pull(repo_path, remote_name):
+            if await asyncio.to_thread(perform_git_pull, repo_path, remote_name):
                 save_local_version(latest_hash, latest_date, version_file)
                 print("Update successful. Restarting program...")
                 restart_program()
@@ -279,3 +422,22 @@ async def check_for_updates(
             print("Update skipped. Continuing with current version.")
     else:
         save_local_version(latest_hash, latest_date, version_file)
+
+
+def check_for_updates_in_background(repo_name: str, **kwargs) -> asyncio.Task:
+    """
+    Starts a non-interactive check_for_updates as a background task. Errors are never raised.
+    Everything is logged at debug level, a found update is kept for the menu (see pop_available_update).
+
+    Args:
+        repo_name: The name of the repository.
+        **kwargs: Other check_for_updates arguments.
+    """
+
+    async def run():
+        try:
+            await check_for_updates(repo_name=repo_name, interactive=False, **kwargs)
+        except Exception as e:
+            logger.debug(f"Update check failed: {e}")
+
+    return asyncio.create_task(run(), name="update-check")
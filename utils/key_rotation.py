@@ -0,0 +1,268 @@
+import argparse
+import asyncio
+import getpass
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.fernet import Fernet, InvalidToken
+from loguru import logger
+
+from data.config import FILES_DIR, SALT_PATH
+
+# Worker processes import this module, so database and settings imports stay inside the functions that need them.
+
+ROTATION_CHECKPOINT = os.path.join(FILES_DIR, "key_rotation.json")
+ENCRYPTED_COLUMNS = ("private_key", "evm_private_key")
+
+
+def _reencrypt_value(old: Fernet, new: Fernet, value: str | None) -> str | None:
+    if not value or "gAAAA" not in value:
+        return value
+
+    try:
+        plain = old.decrypt(value.encode())
+    except InvalidToken:
+        # already rotated before an interrupted run had a chance to checkpoint
+        new.decrypt(value.encode())
+        return value
+
+    return new.encrypt(plain).decode()
+
+
+def reencrypt_chunk(old_key: bytes, new_key: bytes, rows: list[tuple]) -> list[dict]:
+    """
+    Re-encrypts one chunk of wallet rows. Runs in a worker process.
+
+    :param bytes old_key: the current Fernet key
+    :param bytes new_key: the new Fernet key
+    :param list[tuple] rows: (id, private_key, evm_private_key) tuples
+    :return list[dict]: update mappings for the changed rows
+    """
+    old, new = Fernet(old_key), Fernet(new_key)
+    updates = []
+    for wallet_id, *values in rows:
+        new_values = [_reencrypt_value(old, new, value) for value in values]
+        if new_values != values:
+            updates.append({"id": wallet_id, **dict(zip(ENCRYPTED_COLUMNS, new_values))})
+
+    return updates
+
+
+def read_checkpoint() -> dict | None:
+    if not os.path.exists(ROTATION_CHECKPOINT):
+        return None
+
+    with open(ROTATION_CHECKPOINT, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_checkpoint(data: dict) -> None:
+    tmp_path = f"{ROTATION_CHECKPOINT}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, ROTATION_CHECKPOINT)
+
+
+def _read_salt() -> bytes | None:
+    if not os.path.exists(SALT_PATH):
+        return None
+
+    with open(SALT_PATH, "rb") as f:
+        return f.read()
+
+
+def _write_salt(salt: bytes) -> None:
+    tmp_path = f"{SALT_PATH}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(salt)
+
+    os.replace(tmp_path, SALT_PATH)
+
+
+def _key_id(key: bytes) -> str:
+    return hashlib.sha256(key).hexdigest()
+
+
+def _ask_password(prompt: str, confirm: bool = False) -> bytes:
+    while True:
+        pwd1 = getpass.getpass(f"[ROTATOR] {prompt} (input hidden): ").strip().encode()
+        if not pwd1:
+            print("Password cannot be empty.\n")
+            continue
+
+        if confirm:
+            pwd2 = getpass.getpass("[ROTATOR] Repeat password: ").strip().encode()
+            if pwd1 != pwd2:
+                print("Passwords do not match\n")
+                continue
+
+        return pwd1
+
+
+def _decrypts(fernet: Fernet, value: str) -> bool:
+    try:
+        fernet.decrypt(value.encode())
+        return True
+    except InvalidToken:
+        return False
+
+
+def _current_key_matches(db, wallet_model, old_key: bytes, after_id: int = 0, new_key: bytes | None = None, batch: int = 500) -> bool:
+    """
+    Checks the current key against the first value that still has to be rotated (wallet id > `after_id`).
+
+    On resume the rows right after the checkpoint may already carry the new key (committed before the
+    checkpoint was written): those are skipped. If no value needs the current key, any key matches.
+    """
+    from sqlalchemy import select
+
+    old, new = Fernet(old_key), Fernet(new_key) if new_key else None
+    last_id = after_id
+    while True:
+        stmt = (
+            select(wallet_model.id, wallet_model.private_key, wallet_model.evm_private_key)
+            .where(wallet_model.id > last_id)
+            .order_by(wallet_model.id)
+            .limit(batch)
+        )
+        rows = db.s.execute(stmt).all()
+        if not rows:
+            return True
+
+        for wallet_id, *values in rows:
+            for value in values:
+                if not value or "gAAAA" not in value:
+                    continue
+
+                if _decrypts(old, value):
+                    return True
+
+                if new is None or not _decrypts(new, value):
+                    return False
+
+        last_id = rows[-1][0]
+
+
+async def rotate_encryption_password(chunk_size: int = 500, workers: int | None = None, new_salt: bool = False) -> bool:
+    """
+    Re-encrypts every private_key and evm_private_key in the database with a new password (and optionally a new salt).
+
+    Wallets are read in chunks ordered by id, re-encrypted on a process pool and written back with one
+    transaction per chunk. Progress is checkpointed to files/key_rotation.json, so an interrupted run
+    resumes from the last committed chunk when started again with the same passwords.
+
+    :param int chunk_size: rows per chunk / per transaction
+    :param int | None workers: process pool size (CPU count by default)
+    :param bool new_salt: generate a new salt file for the new password
+    :return bool: True if the rotation finished
+    """
+    from sqlalchemy import select, update
+
+    from data.settings import Settings
+    from utils.db_api.models import Wallet
+    from utils.db_api.wallet_api import db
+    from utils.encryption import _derive_fernet_key, clear_secrets, set_cipher_suite
+
+    if not Settings().private_key_encryption:
+        logger.warning("Key rotation | private_key_encryption is disabled in settings, nothing to rotate")
+        return False
+
+    checkpoint = read_checkpoint()
+    old_salt = _read_salt()
+
+    # prompts run in a worker thread, so the event loop is not blocked while waiting for input
+    old_password = await asyncio.to_thread(_ask_password, "Enter CURRENT password")
+    old_key = _derive_fernet_key(old_password, old_salt)
+
+    if not checkpoint and not _current_key_matches(db, Wallet, old_key):
+        logger.error("Key rotation | Wrong current password")
+        return False
+
+    new_password = await asyncio.to_thread(_ask_password, "Enter NEW password", True)
+
+    if checkpoint:
+        salt = bytes.fromhex(checkpoint["salt"]) if checkpoint.get("salt") else None
+    else:
+        salt = os.urandom(16) if new_salt else old_salt
+
+    new_key = _derive_fernet_key(new_password, salt)
+
+    if checkpoint:
+        if checkpoint.get("new_key_id") != _key_id(new_key):
+            logger.error("Key rotation | Unfinished rotation found, enter the same NEW password to resume it")
+            return False
+
+        # a wrong current password would re-encrypt the remaining rows with a key derived from it
+        if not _current_key_matches(db, Wallet, old_key, after_id=checkpoint["last_id"], new_key=new_key):
+            logger.error("Key rotation | Wrong current password")
+            return False
+
+        logger.info(f"Key rotation | Resuming after wallet id {checkpoint['last_id']}")
+    else:
+        checkpoint = {"new_key_id": _key_id(new_key), "salt": salt.hex() if salt else None, "last_id": 0, "rotated": 0}
+        write_checkpoint(checkpoint)
+
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            stmt = (
+                select(Wallet.id, Wallet.private_key, Wallet.evm_private_key)
+                .where(Wallet.id > checkpoint["last_id"])
+                .order_by(Wallet.id)
+                .limit(chunk_size * workers)
+            )
+            rows = [tuple(row) for row in db.s.execute(stmt).all()]
+            if not rows:
+                break
+
+            chunks = [rows[i : i + chunk_size] for i in range(0, len(rows), chunk_size)]
+            try:
+                results = await asyncio.gather(*(loop.run_in_executor(pool, reencrypt_chunk, old_key, new_key, chunk) for chunk in chunks))
+            except InvalidToken:
+                logger.error("Key rotation | Value encrypted with an unknown key, stopping. Progress is saved")
+                return False
+
+            for chunk, updates in zip(chunks, results):
+                if updates:
+                    db.s.execute(update(Wallet), updates)
+                db.s.commit()
+
+                checkpoint["last_id"] = chunk[-1][0]
+                checkpoint["rotated"] += len(updates)
+                write_checkpoint(checkpoint)
+
+            logger.info(f"Key rotation | Processed up to wallet id {checkpoint['last_id']} | rotated {checkpoint['rotated']}")
+
+    if salt and salt != old_salt:
+        _write_salt(salt)
+
+    os.remove(ROTATION_CHECKPOINT)
+
+    # loaded Wallet objects still hold the old ciphertexts
+    db.s.expire_all()
+    clear_secrets()
+    set_cipher_suite(new_password)
+
+    logger.success(f"Key rotation | Done | rotated values in {checkpoint['rotated']} wallets")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-encrypt the private keys in wallets.db with a new password")
+    parser.add_argument("--new-salt", action="store_true", help="generate a new salt file for the new password")
+    parser.add_argument("--chunk-size", type=int, default=500, help="rows per chunk / per transaction")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (CPU count by default)")
+    args = parser.parse_args()
+
+    finished = asyncio.run(rotate_encryption_password(chunk_size=args.chunk_size, workers=args.workers, new_salt=args.new_salt))
+    raise SystemExit(0 if finished else 1)
+
+
+if __name__ == "__main__":
+    main()
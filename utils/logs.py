@@ -0,0 +1,115 @@
+import json
+import sys
+import threading
+import time
+
+from loguru import logger
+
+from data.config import LOG_FILE, LOG_JSON_FILE
+
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+class RateLimiter:
+    """
+    Drops repeats of the same (level, message) pair seen within `window` seconds.
+
+    The decision is made once per record in the logger patcher, so every sink agrees on it.
+    The first record after a quiet period carries the number of suppressed repeats.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._seen: dict[tuple[str, str], tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record) -> None:
+        key = (record["level"].name, record["message"])
+        now = time.monotonic()
+
+        with self._lock:
+            last, suppressed = self._seen.get(key, (0.0, 0))
+            if now - last < self.window:
+                self._seen[key] = (last, suppressed + 1)
+                record["extra"]["_suppressed"] = True
+                return
+
+            self._seen[key] = (now, 0)
+            if len(self._seen) > 10_000:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+
+        if suppressed:
+            record["message"] = f"{record['message']} (repeated {suppressed} more times)"
+
+
+def _structured_patcher(record) -> None:
+    extra = record["extra"]
+    extra.setdefault("wallet", None)
+    extra.setdefault("module", record["name"])
+    extra.setdefault("action", record["function"])
+
+
+def _json_line(record) -> str:
+    extra = record["extra"]
+    wallet = extra["wallet"]
+    record["extra"]["_json"] = json.dumps(
+        {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "wallet": getattr(wallet, "id", wallet),
+            "module": str(extra["module"]),
+            "action": str(extra["action"]),
+            "message": record["message"],
+            "exception": repr(record["exception"].value) if record["exception"] else None,
+        },
+        ensure_ascii=False,
+        default=str,
+    )
+    return "{extra[_json]}\n"
+
+
+def _not_suppressed(record) -> bool:
+    return not record["extra"].get("_suppressed")
+
+
+def configure_logger(settings) -> None:
+    """
+    (Re)configures loguru sinks from a SettingsSnapshot.
+
+    With `log_enqueue` the file sinks write from a background thread, so logging calls made on the
+    event loop never block on disk I/O. `log_json` adds a JSON-lines sink with wallet/module/action fields
+    (bind them with `logger.bind(wallet=..., module=..., action=...)`), and `log_rate_limit` drops repeats of
+    the same message within that many seconds.
+    """
+    if settings.log_level not in LOG_LEVELS:
+        raise ValueError(f"Invalid log level: {settings.log_level}. Must be one of: {', '.join(LOG_LEVELS)}")
+
+    patchers = [_structured_patcher]
+    if settings.log_rate_limit:
+        patchers.append(RateLimiter(window=settings.log_rate_limit))
+
+    def patcher(record):
+        for patch in patchers:
+            patch(record)
+
+    logger.remove()  # Remove the default logger
+    logger.configure(patcher=patcher)
+
+    logger.add(sys.stderr, level=settings.log_level, filter=_not_suppressed)
+    logger.add(LOG_FILE, retention="10 days", level=settings.log_level, filter=_not_suppressed, enqueue=settings.log_enqueue)
+
+    if settings.log_json:
+        logger.add(
+            LOG_JSON_FILE,
+            format=_json_line,
+            retention="10 days",
+            level=settings.log_level,
+            filter=_not_suppressed,
+            enqueue=settings.log_enqueue,
+        )
+
+
+def reconfigure_on_change(old, new) -> None:
+    fields = ("log_level", "log_enqueue", "log_json", "log_rate_limit")
+    if old is not None and any(getattr(old, f) != getattr(new, f) for f in fields):
+        configure_logger(new)
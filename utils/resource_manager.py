@@ -5,7 +5,7 @@ from typing import List, Optional, Tuple
 from loguru import logger
 
 from data import config
-from utils.db_api.wallet_api import (
+from utils.db_api.async_wallet_api import (
     get_wallets_with_bad_proxy,
     get_wallets_with_bad_twitter,
     mark_proxy_as_bad,
@@ -127,7 +127,7 @@ class ResourceManager:
         if not new_proxy:
             return False, "No available reserve proxies"
 
-        success = replace_bad_proxy(id, new_proxy)
+        success = await replace_bad_proxy(id, new_proxy)
 
         if success:
             return True, f"Proxy successfully replaced with {new_proxy}"
@@ -148,7 +148,7 @@ class ResourceManager:
         if not new_token:
             return False, "No available reserve Twitter tokens"
 
-        success = replace_bad_twitter(id, new_token)
+        success = await replace_bad_twitter(id, new_token)
 
         if success:
             logger.success("Twitter token successfully replaced in database")
@@ -168,7 +168,7 @@ class ResourceManager:
         Returns:
             Success status
         """
-        return mark_proxy_as_bad(id)
+        return await mark_proxy_as_bad(id)
 
     async def mark_twitter_as_bad(self, id: int) -> bool:
         """
@@ -180,7 +180,7 @@ class ResourceManager:
         Returns:
             Success status
         """
-        return mark_twitter_as_bad(id)
+        return await mark_twitter_as_bad(id)
 
     async def get_bad_proxies(self) -> List:
         """
@@ -189,7 +189,7 @@ class ResourceManager:
         Returns:
             List of wallets
         """
-        return get_wallets_with_bad_proxy()
+        return await get_wallets_with_bad_proxy()
 
     async def get_bad_twitter(self) -> List:
         """
@@ -198,7 +198,7 @@ class ResourceManager:
         Returns:
             List of wallets
         """
-        return get_wallets_with_bad_twitter()
+        return await get_wallets_with_bad_twitter()
 
     async def replace_all_bad_proxies(self) -> Tuple[int, int]:
         """
@@ -1,18 +1,223 @@
 import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
 from functools import wraps
-from typing import Tuple, Type
+from typing import Callable, Tuple, Type
 
+from cryptography.fernet import InvalidToken
 from loguru import logger
+from web3.exceptions import ContractLogicError
 
 from data.settings import Settings
+from libs.eth_async.exceptions import HTTPException
+
+# Errors that will fail the same way on every attempt: bad password, reverted calls, programming errors.
+FATAL_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    InvalidToken,
+    ContractLogicError,
+    TypeError,
+    AttributeError,
+    NameError,
+    NotImplementedError,
+)
+
+RETRYABLE_HTTP_CODES = (408, 425, 429)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the function while the breaker of its endpoint is open."""
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with jitter: delay = min(max_delay, base_delay * multiplier ** (attempt - 1)) +/- jitter share.
+
+    `retries=None` reads Settings().retry on every call, so settings reloads are picked up.
+    """
+
+    retries: int | None = None
+    base_delay: float = 3
+    max_delay: float = 60
+    multiplier: float = 2
+    jitter: float = 0.5
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    fatal: Tuple[Type[BaseException], ...] = FATAL_EXCEPTIONS
+
+    def max_attempts(self) -> int:
+        return self.retries if self.retries is not None else Settings().retry
+
+    def delay_for(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        return max(0.0, delay)
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        if isinstance(exc, (CircuitOpenError, *self.fatal)):
+            return False
+
+        if isinstance(exc, HTTPException) and exc.status_code and 400 <= exc.status_code < 500:
+            return exc.status_code in RETRYABLE_HTTP_CODES
+
+        return isinstance(exc, self.retry_on)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed attempts and rejects calls for `reset_timeout` seconds.
+    After that a single trial call is let through (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 10, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_running):
+            raise CircuitOpenError(f"Circuit '{self.name}' is open after {self.failures} consecutive failures")
+
+        if state == "half-open":
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def release_trial(self) -> None:
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            if self.opened_at is None or self._trial_running:
+                logger.warning(f"Circuit '{self.name}' opened for {self.reset_timeout}s after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+
+        self._trial_running = False
+
+
+@dataclass
+class RetryStats:
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    successes: int = 0
+    failures: int = 0
+    fatal: int = 0
+    fast_fails: int = 0
+    time_spent: float = 0.0
+    sleep_time: float = 0.0
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_stats: dict[str, RetryStats] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, failure_threshold: int = 10, reset_timeout: float = 60) -> CircuitBreaker:
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name=name, failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+
+        return _breakers[name]
+
+
+def _get_stats(name: str) -> RetryStats:
+    with _registry_lock:
+        return _stats.setdefault(name, RetryStats())
+
+
+def get_retry_metrics() -> dict[str, dict]:
+    """
+    Returns retry counters and time spent per decorated function, plus the state of every circuit breaker.
+    """
+    with _registry_lock:
+        return {
+            "functions": {name: {**vars(stats), "errors": dict(stats.errors)} for name, stats in _stats.items()},
+            "breakers": {name: {"state": b.state, "failures": b.failures} for name, b in _breakers.items()},
+        }
+
+
+BREAKER_STATES = ("closed", "half-open", "open")
+
+
+def retry_prometheus_text() -> str:
+    """
+    get_retry_metrics() in the Prometheus text format.
+    """
+    metrics = get_retry_metrics()
+    counters = {
+        "calls": "Calls of the decorated function.",
+        "attempts": "Attempts, including the first one.",
+        "retries": "Attempts made after a failure.",
+        "failures": "Calls that failed after all attempts.",
+        "fatal": "Calls stopped by a non-retryable error.",
+        "fast_fails": "Calls rejected by an open circuit breaker.",
+    }
+
+    lines = []
+    for counter, help_text in counters.items():
+        lines += [f"# HELP retry_{counter}_total {help_text}", f"# TYPE retry_{counter}_total counter"]
+        lines += [f'retry_{counter}_total{{function="{name}"}} {stats[counter]}' for name, stats in metrics["functions"].items()]
+
+    lines += ["# HELP retry_seconds_total Time spent in the decorated function, sleeps included.", "# TYPE retry_seconds_total counter"]
+    lines += [f'retry_seconds_total{{function="{name}"}} {stats["time_spent"]}' for name, stats in metrics["functions"].items()]
+
+    lines += ["# HELP retry_errors_total Failed attempts by exception type.", "# TYPE retry_errors_total counter"]
+    for name, stats in metrics["functions"].items():
+        lines += [f'retry_errors_total{{function="{name}",error="{error}"}} {n}' for error, n in stats["errors"].items()]
+
+    lines += ["# HELP circuit_breaker_state Current breaker state (1 for the active one).", "# TYPE circuit_breaker_state gauge"]
+    for name, breaker in metrics["breakers"].items():
+        lines += [f'circuit_breaker_state{{name="{name}",state="{state}"}} {int(breaker["state"] == state)}' for state in BREAKER_STATES]
+
+    lines += ["# HELP circuit_breaker_failures Consecutive failures counted by the breaker.", "# TYPE circuit_breaker_failures gauge"]
+    lines += [f'circuit_breaker_failures{{name="{name}"}} {breaker["failures"]}' for name, breaker in metrics["breakers"].items()]
+
+    return "\n".join(lines) + "\n"
 
 
 def async_retry(
-    retries: int = Settings().retry,
-    delay: int = 3,
+    retries: int | None = None,
+    delay: float = 3,
     to_raise: bool = True,
     exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    policy: RetryPolicy | None = None,
+    breaker: str | Callable[[object], str] | None = None,
 ):
+    """
+    Retries an async method according to a RetryPolicy.
+
+    :param retries: attempts count (Settings().retry at call time by default)
+    :param delay: base delay of the exponential backoff
+    :param to_raise: re-raise the last exception instead of a generic one
+    :param exceptions: exceptions to retry on
+    :param policy: a full RetryPolicy, overrides retries/delay/exceptions
+    :param breaker: circuit breaker name (or a callable building it from self) shared by calls to the same endpoint
+    """
+    policy = policy or RetryPolicy(retries=retries, base_delay=delay, retry_on=exceptions)
+
     def decorator(func):
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
@@ -22,24 +227,77 @@ def async_retry(
             wallet_name = getattr(self, "wallet", None)
             # chain = getattr(getattr(getattr(self, "client", None), "network", None), "name", "unknown").capitalize()
             module = getattr(self, "__module_name__", self.__class__.__name__)
+            log = logger.bind(wallet=wallet_name, module=module, action=func.__name__)
 
+            circuit = None
+            if breaker:
+                circuit = get_breaker(breaker(self) if callable(breaker) else breaker)
+
+            stats = _get_stats(f"{module}.{func.__name__}")
+            stats.calls += 1
+            started = time.monotonic()
+
+            retries_total = policy.max_attempts()
             last_msg = None
 
-            while attempt < retries:
-                try:
-                    return await func(self, *args, **kwargs)
-
-                except asyncio.CancelledError:
-                    raise
-
-                except exceptions as e:
-                    last_exc = e
-                    attempt += 1
-                    msg = f"{wallet_name} | {module} | {func.__name__} | Failed | attempt {attempt}/{retries}: {e}"
-                    last_msg = f"{func.__name__} | attempt {attempt}/{retries}: {e}"
-                    logger.warning(msg)
-                    if attempt < retries:
-                        await asyncio.sleep(delay)
+            try:
+                while attempt < retries_total:
+                    if circuit:
+                        try:
+                            circuit.before_call()
+                        except CircuitOpenError as e:
+                            stats.fast_fails += 1
+                            last_exc = e
+                            last_msg = f"{func.__name__} | {e}"
+                            log.warning(f"{wallet_name} | {module} | {func.__name__} | Failed fast | {e}")
+                            break
+
+                    stats.attempts += 1
+                    try:
+                        result = await func(self, *args, **kwargs)
+
+                    except asyncio.CancelledError:
+                        if circuit:
+                            circuit.release_trial()
+                        raise
+
+                    except policy.retry_on as e:
+                        last_exc = e
+                        attempt += 1
+                        stats.errors[type(e).__name__] = stats.errors.get(type(e).__name__, 0) + 1
+                        retryable = policy.is_retryable(e)
+                        if circuit:
+                            # bad arguments and reverts say nothing about the endpoint's health
+                            if retryable:
+                                circuit.record_failure()
+                            else:
+                                circuit.release_trial()
+
+                        msg = f"{wallet_name} | {module} | {func.__name__} | Failed | attempt {attempt}/{retries_total}: {e}"
+                        last_msg = f"{func.__name__} | attempt {attempt}/{retries_total}: {e}"
+
+                        if not retryable:
+                            stats.fatal += 1
+                            log.warning(f"{msg} | not retryable")
+                            break
+
+                        log.warning(msg)
+                        if attempt < retries_total:
+                            stats.retries += 1
+                            sleep_for = policy.delay_for(attempt)
+                            stats.sleep_time += sleep_for
+                            await asyncio.sleep(sleep_for)
+
+                    else:
+                        if circuit:
+                            circuit.record_success()
+                        stats.successes += 1
+                        return result
+
+                stats.failures += 1
+
+            finally:
+                stats.time_spent += time.monotonic() - started
 
             if to_raise and last_exc is not None:
                 raise last_exc
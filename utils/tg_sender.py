@@ -1,22 +1,183 @@
+import asyncio
+import time
+
 from curl_cffi.requests import AsyncSession
 from loguru import logger
 
 from data.settings import Settings
 
+MAX_MESSAGE_LENGTH = 4096
+MARKDOWN_V2_ESCAPE = str.maketrans({char: f"\\{char}" for char in "_*[]()~`>#+-=|{}.!\\"})
 
-async def tg_sender(msg=None):
-    special_chars = ["_", "*", "[", "]", "(", ")", "~", "`", ">", "#", "+", "-", "=", "|", "{", "}", ".", "!"]
-    for char in special_chars:
-        msg = msg.replace(char, f"\\{char}")
 
-    try:
-        json_data = {"parse_mode": "MarkdownV2", "chat_id": Settings().tg_user_id, "text": msg}
-        url = f"https://api.telegram.org/bot{Settings().tg_bot_id}/sendMessage"
+def escape_markdown(text: str) -> str:
+    """
+    Escapes the MarkdownV2 special characters in one pass.
+    """
+    return text.translate(MARKDOWN_V2_ESCAPE)
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    Splits an escaped message into parts of at most `limit` characters without breaking an escape sequence.
+    """
+    parts = []
+    while len(text) > limit:
+        cut = limit
+        # an odd number of trailing backslashes means the last one escapes the next character
+        trailing = len(text[:cut]) - len(text[:cut].rstrip("\\"))
+        if trailing % 2:
+            cut -= 1
+        parts.append(text[:cut])
+        text = text[cut:]
+
+    parts.append(text)
+    return parts
+
+
+class TgDispatcher:
+    """
+    Background Telegram notifier.
+
+    Messages are queued and sent by one task through a persistent session. Messages arriving within
+    `batch_window` seconds of each other are merged into one (up to the Telegram length limit), so a burst
+    of notifications costs a few requests instead of hitting the per-chat rate limit. On 429 the task waits
+    for the `retry_after` Telegram returns, other errors are retried with exponential backoff.
+    """
+
+    def __init__(self, bot_token: str, chat_id: str | int, batch_window: float = 2.0, max_queue: int = 1000, retries: int = 5):
+        self.url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.chat_id = chat_id
+        self.batch_window = batch_window
+        self.retries = retries
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+        self._session: AsyncSession | None = None
+        self._task: asyncio.Task | None = None
+        self._carry: str | None = None
+
+    def send(self, msg: str) -> None:
+        """
+        Queues a message (plain text, it is escaped here). Never waits: if the queue is full the message is dropped.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        try:
+            self._queue.put_nowait(escape_markdown(msg))
+        except asyncio.QueueFull:
+            logger.warning(f"Telegram queue is full, message dropped | {msg}")
+
+    async def _next_batch(self) -> list[str]:
+        batch = [self._carry if self._carry is not None else await self._queue.get()]
+        self._carry = None
+        size = len(batch[0])
+        deadline = time.monotonic() + self.batch_window
+
+        while size < MAX_MESSAGE_LENGTH and (timeout := deadline - time.monotonic()) > 0:
+            try:
+                msg = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+
+            if size + len(msg) + 2 > MAX_MESSAGE_LENGTH:
+                # does not fit: it starts the next batch
+                self._carry = msg
+                break
+
+            batch.append(msg)
+            size += len(msg) + 2
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                for part in split_message("\n\n".join(batch)):
+                    await self._post(part)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _post(self, text: str) -> None:
+        if self._session is None:
+            self._session = AsyncSession()
+
+        json_data = {"parse_mode": "MarkdownV2", "chat_id": self.chat_id, "text": text}
+        for attempt in range(1, self.retries + 1):
+            try:
+                r = await self._session.post(url=self.url, json=json_data)
+                if r.status_code == 429:
+                    delay = r.json().get("parameters", {}).get("retry_after", 2**attempt)
+                    logger.debug(f"Telegram rate limit, retry in {delay}s")
+                    await asyncio.sleep(delay)
+                    continue
 
-        async with AsyncSession() as session:
-            r = await session.post(url=url, json=json_data)
+                if r.status_code < 500:
+                    if r.status_code != 200:
+                        logger.error(f"Send Telegram message error | {r.status_code} {r.text} | {text}")
+                    return
 
-            return r.json()
+                error = f"{r.status_code} {r.text}"
+
+            except Exception as err:
+                error = err
+
+            await asyncio.sleep(min(2**attempt, 30))
+
+        logger.error(f"Send Telegram message error | {error} | {text}")
+
+    async def close(self, timeout: float = 10) -> None:
+        """
+        Sends the queued messages (waiting at most `timeout` seconds) and closes the session.
+        """
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Telegram messages not sent in {timeout}s: {self._queue.qsize()}")
+
+            self._task.cancel()
+            self._task = None
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_dispatcher: TgDispatcher | None = None
+
+
+def get_tg_dispatcher() -> TgDispatcher | None:
+    """
+    The process-wide dispatcher, None if tg_bot_id or tg_user_id are not set.
+    """
+    global _dispatcher
+
+    if _dispatcher is None:
+        settings = Settings()
+        if not settings.tg_bot_id or not settings.tg_user_id:
+            return None
+
+        _dispatcher = TgDispatcher(bot_token=settings.tg_bot_id, chat_id=settings.tg_user_id, batch_window=settings.tg_batch_window)
+
+    return _dispatcher
+
+
+async def close_tg_dispatcher() -> None:
+    global _dispatcher
+
+    if _dispatcher is not None:
+        await _dispatcher.close()
+        _dispatcher = None
+
+
+async def tg_sender(msg=None):
+    """
+    Queues a Telegram notification. Returns immediately, the message is sent in the background.
+    """
+    dispatcher = get_tg_dispatcher()
+    if dispatcher is None or not msg:
+        return
 
-    except Exception as err:
-        logger.error(f"Send Telegram message error |{err} | {msg}")
+    dispatcher.send(msg)
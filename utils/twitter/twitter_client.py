@@ -11,7 +11,7 @@ from libs.twitter.errors import AccountLocked, AccountNotFound, AccountSuspended
 from libs.twitter.utils import remove_at_sign
 from utils.browser import Browser
 from utils.db_api.models import Wallet
-from utils.db_api.wallet_api import db, update_twitter_token
+from utils.db_api.async_wallet_api import update_twitter_token, update_wallet
 
 
 # TODO Move to Exception file
@@ -109,6 +109,7 @@ class TwitterClient:
         )
 
         # Establish connection
+        status = None
         try:
             await self.twitter_client.__aenter__()
 
@@ -117,33 +118,34 @@ class TwitterClient:
 
             if self.twitter_account.status == twitter.AccountStatus.GOOD:
                 logger.success(f"{self.user} Twitter client initialized")
-                update_twitter_token(id=self.user.id, updated_token=self.twitter_account.auth_token)
+                await update_twitter_token(id=self.user.id, updated_token=self.twitter_account.auth_token)
 
-                self.user.twitter_status = TwitterStatuses.ok
+                status = TwitterStatuses.ok
                 return True
 
         except AccountSuspended:
-            self.user.twitter_status = TwitterStatuses.suspended
+            status = TwitterStatuses.suspended
             logger.error(f"{self.user} | Twitter Suspended, try to reauth manually")
             return False
 
         except BadAccountToken:
-            self.user.twitter_status = TwitterStatuses.relogin
+            status = TwitterStatuses.relogin
             logger.error(f"{self.user} | Twitter BadToken, try to reauth manually")
             return False
 
         except AccountLocked:
-            self.user.twitter_status = TwitterStatuses.locked
+            status = TwitterStatuses.locked
             logger.error(f"{self.user} | Twitter Locked, replace twitter token")
             return False
 
         except AccountNotFound:
-            self.user.twitter_status = TwitterStatuses.not_found
+            status = TwitterStatuses.not_found
             logger.error(f"{self.user} | Twitter Not Found, replace twitter token")
             return False
 
         finally:
-            db.commit()
+            if status:
+                await update_wallet(self.user.id, twitter_status=status)
 
     async def close(self):
         """Closes the Twitter connection"""
@@ -436,6 +438,7 @@ class TwitterClient:
             url=redirect_url,
             headers=callback_headers,
             timeout=30,
+            close_session=True,
         )
 
         return TwitterOauthData(
@@ -509,5 +512,6 @@ class TwitterClient:
         resp = await browser.get(
             url=callback_url,
             headers=callback_headers,
+            close_session=True,
         )
         return TwitterOauthData(auth_token=auth_code, state_verifier_token=state, callback_url=callback_url, callback_response=resp)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from web3.types import TxParams
+
+from libs.eth_async.gas_cache import invalidate_gas_estimate
+from utils.db_api.models import TxJournalEntry, Wallet
+from utils.db_api.async_wallet_api import adb
+
+if TYPE_CHECKING:
+    from libs.eth_async.client import Client
+
+FLOW_STEP = "flow"
+
+OPEN = "open"
+COMPLETED = "completed"
+PENDING = "pending"
+SIGNED = "signed"
+SENT = "sent"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+DROPPED = "dropped"
+
+
+class TxFailed(Exception):
+    """Raised when a journaled transaction is mined with status 0."""
+
+
+class StepUnresolved(Exception):
+    """Raised when an interrupted off-chain step may have taken effect and can not be run again safely."""
+
+
+def _dumps(value: Any) -> str:
+    def default(obj):
+        if isinstance(obj, (bytes, bytearray)):
+            return {"__bytes__": bytes(obj).hex()}
+        return str(obj)
+
+    return json.dumps(value, default=default)
+
+
+def _loads(value: str | None) -> Any:
+    if not value:
+        return None
+
+    return json.loads(value, object_hook=lambda d: bytes.fromhex(d["__bytes__"]) if set(d) == {"__bytes__"} else d)
+
+
+class TxJournal:
+    """
+    Persistent journal of a multi-step on-chain flow, stored in the tx_journal table.
+
+    A run is opened per (wallet, flow) and stays open until complete() is called, so when async_retry
+    or a restart calls the flow again it continues the same run: random parameters saved with
+    save_state() are reused, finished steps are skipped and sent transactions are awaited instead of
+    being sent again.
+
+    EVM transactions are recorded before broadcast (hash, nonce and the signed raw transaction). A
+    transaction the node no longer knows is rebroadcast as is, so it can never be sent twice with
+    different nonces. Off-chain steps (run_step) are recorded as pending before they start and as
+    confirmed after they return; a step left pending is run again only if it is idempotent or proven
+    not to have taken effect.
+    """
+
+    def __init__(self, wallet: Wallet, flow: str, header: TxJournalEntry):
+        self.wallet = wallet
+        self.flow = flow
+        self.header = header
+        self.run_id = header.run_id
+
+    @classmethod
+    async def open(cls, wallet: Wallet, flow: str, max_age: timedelta = timedelta(days=1)) -> TxJournal:
+        """
+        Resumes the open run of the flow, or starts a new one if there is none or it is older than `max_age`.
+        """
+        header = await adb.one(
+            TxJournalEntry,
+            TxJournalEntry.wallet_id == wallet.id,
+            TxJournalEntry.flow == flow,
+            TxJournalEntry.step == FLOW_STEP,
+            TxJournalEntry.status == OPEN,
+            from_the_end=True,
+        )
+        if header and header.created_at > datetime.now() - max_age:
+            logger.info(f"{wallet} | {flow} | resuming run {header.run_id[:8]}")
+            return cls(wallet, flow, header)
+
+        if header:
+            await adb.update_by_id(TxJournalEntry, header.id, status=DROPPED)
+
+        header = await adb.insert(TxJournalEntry(wallet_id=wallet.id, flow=flow, run_id=uuid.uuid4().hex, step=FLOW_STEP, status=OPEN))
+        return cls(wallet, flow, header)
+
+    @property
+    def state(self) -> dict:
+        """
+        Parameters saved for this run (empty for a new run).
+        """
+        return _loads(self.header.data) or {}
+
+    async def save_state(self, **values) -> dict:
+        state = {**self.state, **values}
+        await self._update(self.header, data=_dumps(state))
+        return state
+
+    async def get(self, step: str) -> TxJournalEntry | None:
+        return await adb.one(TxJournalEntry, TxJournalEntry.run_id == self.run_id, TxJournalEntry.step == step, from_the_end=True)
+
+    async def record(self, step: str, status: str, **fields) -> TxJournalEntry:
+        entry = await self.get(step)
+        if entry is None:
+            entry = TxJournalEntry(wallet_id=self.wallet.id, flow=self.flow, run_id=self.run_id, step=step, status=status, **fields)
+            return await adb.insert(entry)
+
+        await self._update(entry, status=status, **fields)
+        return entry
+
+    async def complete(self) -> None:
+        await self._update(self.header, status=COMPLETED)
+
+    @staticmethod
+    async def _update(entry: TxJournalEntry, **values) -> None:
+        # one autocommit UPDATE through the async engine; the detached entry is kept in sync by hand
+        await adb.update_by_id(TxJournalEntry, entry.id, **values)
+        for key, value in values.items():
+            setattr(entry, key, value)
+
+    async def run_step(
+        self,
+        step: str,
+        action: Callable[[], Awaitable[Any]],
+        idempotent: bool = False,
+        checkpoint: Callable[[], Awaitable[Any]] | None = None,
+        executed: Callable[[Any], Awaitable[bool]] | None = None,
+    ) -> Any:
+        """
+        Runs an off-chain step once per run and returns its JSON-serializable result (bytes are kept as bytes).
+
+        A step interrupted after `action` started is left pending. On the next call it is run again only if it is
+        `idempotent` or if `executed` proves it did not take effect: `checkpoint` is awaited before `action` and its
+        result is stored with the pending step, `executed(checkpoint_result)` compares it with the current state
+        and returns False if the step has to be run again. Otherwise StepUnresolved is raised and the step has to
+        be resolved manually (the pending journal entry is kept).
+
+        :param str step: the step name, unique within the flow
+        :param action: the coroutine function performing the step
+        :param bool idempotent: running the step twice has the same effect as running it once
+        :param checkpoint: the coroutine function recording the state before the step (a balance, a nonce)
+        :param executed: the coroutine function telling from the checkpoint whether the step took effect
+        :return: the result of `action`
+        """
+        entry = await self.get(step)
+        if entry and entry.status == CONFIRMED:
+            logger.debug(f"{self.wallet} | {self.flow} | step '{step}' already done")
+            return _loads(entry.data)
+
+        if entry and entry.status == PENDING and not idempotent:
+            await self._resolve_pending(entry, executed)
+
+        if entry and entry.status == PENDING:
+            logger.warning(f"{self.wallet} | {self.flow} | step '{step}' was interrupted, running it again")
+
+        before = await checkpoint() if checkpoint else None
+        await self.record(step, PENDING, data=_dumps(before))
+        result = await action()
+        await self.record(step, CONFIRMED, data=_dumps(result))
+        return result
+
+    async def _resolve_pending(self, entry: TxJournalEntry, executed: Callable[[Any], Awaitable[bool]] | None) -> None:
+        # resolving means fixing the tx_journal rows of this run_id by hand, or waiting until the run expires
+        message = f"{self.flow} | step '{entry.step}' of run {self.run_id} was interrupted and"
+        if executed is None:
+            raise StepUnresolved(f"{message} may have taken effect, check it and resolve the journal entry manually")
+
+        try:
+            done = await executed(_loads(entry.data))
+
+        except Exception as err:
+            raise StepUnresolved(f"{message} its effect can not be checked ({err}), resolve the journal entry manually") from err
+
+        if done:
+            raise StepUnresolved(f"{message} has taken effect but its result is lost, finish the flow manually")
+
+    async def send(
+        self, step: str, client: Client, tx_params: TxParams | Callable[[], Awaitable[TxParams]], timeout: int = 300
+    ) -> dict:
+        """
+        Sends a transaction once per run and waits for its receipt.
+
+        A confirmed step returns its stored receipt summary, a sent one is awaited (and rebroadcast
+        if the node dropped it), a failed or dropped one is built and sent again. Pass a coroutine
+        function as `tx_params` to skip building the parameters when the step is already done.
+        """
+        entry = await self.get(step)
+        if entry and entry.status == CONFIRMED:
+            logger.debug(f"{self.wallet} | {self.flow} | step '{step}' already confirmed: {entry.tx_hash}")
+            return _loads(entry.data)
+
+        if entry and entry.status in (SIGNED, SENT):
+            receipt = await self._resume(entry, client, timeout)
+            if receipt is not None:
+                return receipt
+
+        if callable(tx_params):
+            tx_params = await tx_params()
+
+        await client.transactions.auto_add_params(tx_params=tx_params)
+        signed_tx = await client.transactions.sign_transaction(tx_params)
+        entry = await self.record(
+            step,
+            SIGNED,
+            tx_hash=Web3.to_hex(signed_tx.hash),
+            raw_tx=Web3.to_hex(signed_tx.rawTransaction),
+            nonce=int(tx_params["nonce"]),
+            data=_dumps(dict(tx_params)),
+        )
+
+        try:
+            await client.w3.eth.send_raw_transaction(transaction=signed_tx.rawTransaction)
+
+        except Exception:
+            invalidate_gas_estimate(tx_params)
+            raise
+
+        await self.record(step, SENT)
+        return await self._wait(entry, client, timeout)
+
+    async def _resume(self, entry: TxJournalEntry, client: Client, timeout: int) -> dict | None:
+        try:
+            await client.w3.eth.get_transaction(entry.tx_hash)
+        except TransactionNotFound:
+            if await client.wallet.nonce() > entry.nonce:
+                # the nonce is used by another transaction, this one can never be mined
+                logger.warning(f"{self.wallet} | {self.flow} | step '{entry.step}' tx {entry.tx_hash} was replaced, sending a new one")
+                await self.record(entry.step, DROPPED)
+                return None
+
+            logger.info(f"{self.wallet} | {self.flow} | rebroadcasting step '{entry.step}' tx {entry.tx_hash}")
+            await client.w3.eth.send_raw_transaction(transaction=HexBytes(entry.raw_tx))
+            await self.record(entry.step, SENT)
+
+        logger.info(f"{self.wallet} | {self.flow} | waiting for step '{entry.step}' tx {entry.tx_hash}")
+        try:
+            return await self._wait(entry, client, timeout)
+        except TxFailed:
+            return None
+
+    async def _wait(self, entry: TxJournalEntry, client: Client, timeout: int) -> dict:
+        receipt = await client.transactions.wait_for_receipt(w3=client.w3, tx_hash=entry.tx_hash, timeout=timeout)
+        summary = {"transactionHash": entry.tx_hash, "status": receipt["status"], "blockNumber": receipt["blockNumber"]}
+
+        if receipt["status"] != 1:
+            invalidate_gas_estimate(_loads(entry.data) or {})
+            await self.record(entry.step, FAILED, data=_dumps(summary))
+            raise TxFailed(f"{self.flow} | step '{entry.step}' tx {entry.tx_hash} reverted")
+
+        await self.record(entry.step, CONFIRMED, data=_dumps(summary))
+        return summary